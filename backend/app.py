@@ -1,12 +1,41 @@
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, stream_with_context, g
 from flask_sqlalchemy import SQLAlchemy
 from flask_cors import CORS
 from flask_migrate import Migrate
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.exc import IntegrityError
 import os
+import atexit
+import io
+import csv
+import base64
+import json
+import time
+import threading
 from datetime import datetime
 from dotenv import load_dotenv
 from apscheduler.schedulers.background import BackgroundScheduler
 import logging
+try:
+    import orjson
+except ImportError:
+    orjson = None
+from search import init_search, apply_search
+from facets import (
+    init_facets, facets_maintained, summary_facets, grouped_facets, DEFAULT_FACET_LIMIT, MAX_FACET_LIMIT
+)
+from scrape_worker import ScrapeWorker
+from leader import LeaderLease, LEASE_HEARTBEAT_SECONDS
+from cache import ResponseCache
+from bulk import apply_bulk, field_type_error, MAX_BULK_ITEMS
+from enrich import enrich_jobs, ENRICH_INTERVAL_MINUTES
+from dedup import fingerprint_default, simhash_default, fingerprint_fields
+from metrics import registry, CONTENT_TYPE as METRICS_CONTENT_TYPE
+from suggest import SuggestIndex, SUGGEST_FIELDS, DEFAULT_SUGGESTIONS, MAX_SUGGESTIONS
+from changes import (
+    init_changes, prune_changes, change_window, read_changes, ChangeFeed, DEFAULT_CHANGES_LIMIT,
+    MAX_CHANGES_LIMIT, MAX_CHANGES_WAIT_SECONDS, CHANGES_STREAM_SECONDS, CHANGES_HEARTBEAT_SECONDS
+)
 
 
 load_dotenv()
@@ -43,6 +72,11 @@ class Job(db.Model):
     salary = db.Column(db.String(100))
     posted_date = db.Column(db.DateTime, default=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
+    # Normalized title/company/location identity and its SimHash, filled in on insert
+    fingerprint = db.Column(db.String(40), default=fingerprint_default)
+    simhash = db.Column(db.BigInteger, default=simhash_default)
+    # When a scrape last found the posting listed, NULL for jobs that didn't come from the scraper
+    last_seen_at = db.Column(db.DateTime)
 
     def to_dict(self):
         return {
@@ -57,38 +91,558 @@ class Job(db.Model):
             'is_active': self.is_active
         }
 
+# Job indexes, kept in step with the migrations in migrations/versions.
+# The list is sorted and paged on (posted_date, id) newest first
+db.Index('ix_job_posted_date_id', Job.posted_date.desc(), Job.id.desc())
+# The same order restricted to active rows, for listings that hide inactive jobs
+db.Index(
+    'ix_job_active_posted_date_id', Job.posted_date.desc(), Job.id.desc(),
+    sqlite_where=Job.is_active.is_(True), postgresql_where=Job.is_active.is_(True)
+)
+# Unique keys the scraper's dedup lookups and bulk insert rely on
+db.Index('ux_job_url', Job.url, unique=True)
+db.Index('ux_job_title_company_location', Job.title, Job.company, Job.location, unique=True)
+# Active scraped jobs by when they were last listed, for the staleness sweep
+db.Index(
+    'ix_job_active_last_seen_at', Job.last_seen_at,
+    sqlite_where=Job.is_active.is_(True), postgresql_where=Job.is_active.is_(True)
+)
+# Catches variants of the same job that differ only in case, punctuation, abbreviations or location detail
+db.Index('ux_job_fingerprint', Job.fingerprint, unique=True)
+
+class ScrapeRun(db.Model):
+    id = db.Column(db.Integer, primary_key=True)
+    trigger = db.Column(db.String(20), nullable=False)
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)
+    queued_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    # Refreshed by the worker while the run executes, so a long run isn't taken for an abandoned one
+    heartbeat_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    terms_done = db.Column(db.Integer, default=0)
+    terms_total = db.Column(db.Integer)
+    jobs_scraped = db.Column(db.Integer, default=0)
+    jobs_added = db.Column(db.Integer, default=0)
+    jobs_skipped = db.Column(db.Integer, default=0)
+    jobs_deactivated = db.Column(db.Integer, default=0)
+    timings = db.Column(db.JSON)
+    error = db.Column(db.Text)
+
+    def to_dict(self):
+        def format_date(value):
+            return value.strftime('%Y-%m-%d %H:%M:%S') if value else None
+
+        duration = None
+        if self.started_at:
+            duration = ((self.finished_at or datetime.utcnow()) - self.started_at).total_seconds()
+
+        return {
+            'id': self.id,
+            'trigger': self.trigger,
+            'status': self.status,
+            'queued_at': format_date(self.queued_at),
+            'started_at': format_date(self.started_at),
+            'finished_at': format_date(self.finished_at),
+            'duration_seconds': duration,
+            'terms_done': self.terms_done,
+            'terms_total': self.terms_total,
+            'jobs_scraped': self.jobs_scraped,
+            'jobs_added': self.jobs_added,
+            'jobs_skipped': self.jobs_skipped,
+            'jobs_deactivated': self.jobs_deactivated,
+            'timings': self.timings or {},
+            'error': self.error
+        }
+
+class SchedulerLease(db.Model):
+    name = db.Column(db.String(100), primary_key=True)
+    holder = db.Column(db.String(200), nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False)
+
+class ScrapeWatermark(db.Model):
+    search = db.Column(db.String(200), primary_key=True)
+    location = db.Column(db.String(100), primary_key=True)
+    newest_url = db.Column(db.String(500), nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Last run that read the term to its full depth instead of stopping at known jobs
+    full_scan_at = db.Column(db.DateTime)
+
+class JobDetail(db.Model):
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id', ondelete='CASCADE'), primary_key=True)
+    etag = db.Column(db.String(200))
+    last_modified = db.Column(db.String(100))
+    content_hash = db.Column(db.String(40))
+    fetched_at = db.Column(db.DateTime, index=True)
+    error = db.Column(db.Text)
+
+class JobFacetCount(db.Model):
+    """Active jobs per company and location, kept current by the triggers init_facets installs"""
+    company = db.Column(db.String(100), primary_key=True)
+    location = db.Column(db.String(100), primary_key=True, default='')
+    job_count = db.Column(db.Integer, nullable=False, default=0)
+
+class JobChange(db.Model):
+    """Job inserts, updates and deletes, logged by the triggers init_changes installs.
+
+    The id is the change feed cursor. AUTOINCREMENT keeps SQLite from reusing
+    ids once old changes are pruned.
+    """
+    __table_args__ = {'sqlite_autoincrement': True}
+    id = db.Column(db.Integer, primary_key=True)
+    # No foreign key, a deleted job's changes are how clients learn it is gone
+    job_id = db.Column(db.Integer, nullable=False)
+    changed_at = db.Column(db.DateTime, nullable=False, index=True)
+
+# Serialized GET responses, invalidated by any committed write to the job table
+response_cache = ResponseCache()
+response_cache.track_writes(Job.__tablename__)
+
+# Company and location completions, reloaded in the background after job writes
+suggest_index = SuggestIndex(app, db, Job, JobFacetCount)
+response_cache.add_write_listener(suggest_index.request_refresh)
+
+# Wakes change feed requests when a job write commits, including each scrape_and_save batch
+change_feed = ChangeFeed(db, JobChange)
+response_cache.add_write_listener(change_feed.notify)
+
+def init_database_objects():
+    """Install the full-text index and the facet and change log triggers on the tables that exist.
+
+    Runs whenever the app is imported, so every process serving it (flask run,
+    each WSGI worker) sets them up, not only main.py. Each step does nothing
+    once installed. Tables that don't exist yet, e.g. while flask db upgrade
+    builds a new database, are skipped.
+    """
+    try:
+        tables = set(sa_inspect(db.engine).get_table_names())
+    except Exception as e:
+        logger.error(f"Could not inspect the database: {e}")
+        return
+    if Job.__tablename__ not in tables:
+        return
+    init_search(db)
+    if JobFacetCount.__tablename__ in tables:
+        init_facets(db)
+    if JobChange.__tablename__ in tables:
+        init_changes(db)
+
+with app.app_context():
+    init_database_objects()
+
+# Latency of every API request, labelled by route pattern rather than path so ids don't multiply the series
+request_duration_seconds = registry.histogram(
+    'http_request_duration_seconds',
+    'Time to handle API requests, up to the first byte for streamed responses',
+    ('endpoint', 'method', 'status')
+)
+
+@app.before_request
+def start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def observe_request_duration(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        request_duration_seconds.observe(
+            time.perf_counter() - started,
+            endpoint=request.url_rule.rule if request.url_rule else 'unmatched',
+            method=request.method,
+            status=response.status_code
+        )
+    return response
+
+# Page size limits for GET /api/jobs
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# Fields a client can ask for with ?fields=, in the order they are serialized
+JOB_FIELDS = ['id', 'title', 'company', 'location', 'description', 'url', 'salary', 'posted_date', 'is_active']
+
+# The unbounded description column is only read when a client asks for it
+DEFAULT_LIST_FIELDS = [name for name in JOB_FIELDS if name != 'description']
+
+def parse_fields(fields_param, default=DEFAULT_LIST_FIELDS):
+    """Parse a comma separated ?fields= value, raising ValueError on unknown fields"""
+    if not fields_param:
+        return default
+    fields = [name.strip() for name in fields_param.split(',') if name.strip()]
+    unknown = [name for name in fields if name not in JOB_FIELDS]
+    if unknown or not fields:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}. Available fields: {', '.join(JOB_FIELDS)}")
+    return list(dict.fromkeys(fields))
+
+def serialize_rows(columns, rows, fields, lazy=False):
+    """Turn projected rows into job dicts holding only the requested fields.
+
+    Returns a list, or with lazy=True a generator that consumes rows one at a time.
+    """
+    positions = [(name, columns.index(name)) for name in fields]
+    date_position = columns.index('posted_date') if 'posted_date' in fields else None
+    
+    def serialize():
+        for row in rows:
+            job = {name: row[position] for name, position in positions}
+            if date_position is not None:
+                posted_date = row[date_position]
+                # str() of a datetime is already '%Y-%m-%d %H:%M:%S' plus microseconds, and much cheaper than strftime
+                job['posted_date'] = str(posted_date)[:19] if posted_date else None
+            yield job
+    
+    return serialize() if lazy else list(serialize())
+
+def parse_active(active_param):
+    """Parse the active query parameter: active jobs by default, 'false' for inactive ones, 'all' for both"""
+    if active_param is None or active_param == 'true':
+        return True
+    if active_param == 'false':
+        return False
+    if active_param == 'all':
+        return None
+    raise ValueError("active must be true, false or all")
+
+def filter_jobs(query, company=None, location=None, search=None, active=True):
+    """Apply the company/location/search/active filters shared by the list and export endpoints.
+
+    Returns the filtered query and the search relevance score expression, which
+    is None unless a ranked full-text search was applied.
+    """
+    # Same predicate as ix_job_active_posted_date_id, so the partial index serves active listings
+    if active is not None:
+        query = query.filter(Job.is_active.is_(active))
+    if company:
+        query = query.filter(Job.company.ilike(f'%{company}%'))
+    if location:
+        query = query.filter(Job.location.ilike(f'%{location}%'))
+    score = None
+    if search:
+        query, score = apply_search(query, db, Job, search)
+    return query, score
+
+def json_response(payload):
+    """Serialize a payload with the fastest available encoder"""
+    return app.response_class(encode_json(payload), mimetype='application/json')
+
+
+def encode_json(payload):
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':')).encode()
+
+def encode_cursor(sort_key, job_id):
+    """Encode the keyset position of the last row on a page as an opaque cursor"""
+    raw = json.dumps([sort_key, job_id])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+def decode_cursor(cursor):
+    """Decode a cursor produced by encode_cursor, raising ValueError if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        sort_key, job_id = json.loads(raw)
+        return sort_key, int(job_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
 @app.route('/api/jobs', methods=['GET'])
+@response_cache.cached_json
 def get_jobs():
     # Get query parameters for filtering
     company = request.args.get('company')
     location = request.args.get('location')
     search = request.args.get('search')
+    cursor = request.args.get('cursor')
     
-    # Base query
-    query = Job.query
+    try:
+        limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    
+    try:
+        fields = parse_fields(request.args.get('fields'))
+        active = parse_active(request.args.get('active'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    # Base query, selecting only the columns needed instead of hydrating Job objects.
+    # id and posted_date are always read because the cursor is built from them
+    columns = list(dict.fromkeys(fields + ['id', 'posted_date']))
+    query = db.session.query(*[getattr(Job, name) for name in columns])
     
     # Apply filters if provided
-    if company:
-        query = query.filter(Job.company.ilike(f'%{company}%'))
-    if location:
-        query = query.filter(Job.location.ilike(f'%{location}%'))
-    if search:
-        query = query.filter(
-            db.or_(
-                Job.title.ilike(f'%{search}%'),
-                Job.description.ilike(f'%{search}%'),
-                Job.company.ilike(f'%{search}%')
-            )
-        )
+    query, score = filter_jobs(query, company, location, search, active)
+    
+    # Searches are ranked by relevance when a full-text index is available,
+    # everything else is listed newest first
+    if score is not None:
+        query = query.add_columns(score)
+        order_by = (score, Job.id)
+    else:
+        order_by = (Job.posted_date.desc(), Job.id.desc())
+    
+    # Seek past the last row of the previous page instead of using OFFSET,
+    # so deep pages cost the same as the first one
+    if cursor:
+        try:
+            sort_key, cursor_id = decode_cursor(cursor)
+            if score is not None:
+                sort_key = float(sort_key)
+                query = query.filter(
+                    db.or_(score > sort_key, db.and_(score == sort_key, Job.id > cursor_id))
+                )
+            else:
+                sort_key = datetime.fromisoformat(sort_key)
+                query = query.filter(
+                    db.or_(
+                        Job.posted_date < sort_key,
+                        db.and_(Job.posted_date == sort_key, Job.id < cursor_id)
+                    )
+                )
+        except (ValueError, TypeError):
+            return jsonify({"error": f"Invalid cursor: {cursor}"}), 400
+    
+    # Fetch one extra row to know whether another page follows
+    rows = query.order_by(*order_by).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last_row = rows[-1]
+        if score is not None:
+            last_key = last_row[-1]
+        else:
+            last_key = last_row[columns.index('posted_date')].isoformat()
+        next_cursor = encode_cursor(last_key, last_row[columns.index('id')])
+    
+    return json_response({
+        'jobs': serialize_rows(columns, rows, fields),
+        'next_cursor': next_cursor
+    })
+
+
+@app.route('/api/jobs/facets', methods=['GET'])
+@response_cache.cached_json
+def get_job_facets():
+    """Count jobs by company and location under the same filters as GET /api/jobs"""
+    company = request.args.get('company')
+    location = request.args.get('location')
+    search = request.args.get('search')
+    
+    try:
+        limit = int(request.args.get('limit', DEFAULT_FACET_LIMIT))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    limit = max(1, min(limit, MAX_FACET_LIMIT))
+    
+    try:
+        active = parse_active(request.args.get('active'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    # Active jobs filtered by company and location are answered from the summary table.
+    # A search has to find its matching rows first, so those are counted with GROUP BY
+    if facets_maintained(db) and active is True and not search:
+        facets = summary_facets(db, JobFacetCount, company, location, limit)
+    else:
+        query, _ = filter_jobs(db.session.query(Job.id), company, location, search, active)
+        facets = grouped_facets(query, Job, limit)
+    return json_response(facets)
+
+@app.route('/api/suggest', methods=['GET'])
+def get_suggestions():
+    """Complete a company or location prefix, most active jobs first"""
+    field = request.args.get('field', 'company')
+    if field not in SUGGEST_FIELDS:
+        return jsonify({"error": f"field must be one of: {', '.join(SUGGEST_FIELDS)}"}), 400
+    prefix = request.args.get('prefix', '')
+    
+    try:
+        limit = int(request.args.get('limit', DEFAULT_SUGGESTIONS))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    limit = max(1, min(limit, MAX_SUGGESTIONS))
+    
+    # Served from memory on every keystroke, so it skips the response cache
+    suggestions = suggest_index.suggest(field, prefix, limit)
+    return json_response({
+        'field': field,
+        'prefix': prefix,
+        'suggestions': [{'value': value, 'count': count} for value, count in suggestions]
+    })
+
+# Rows fetched from the server-side cursor and written to the response at a time
+EXPORT_BATCH_SIZE = 1000
+
+@app.route('/api/jobs/export', methods=['GET'])
+def export_jobs():
+    """Stream every matching job as NDJSON or CSV, holding one batch of rows in memory at a time"""
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in ('ndjson', 'csv'):
+        return jsonify({"error": "format must be ndjson or csv"}), 400
+    
+    try:
+        fields = parse_fields(request.args.get('fields'), default=JOB_FIELDS)
+        active = parse_active(request.args.get('active'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    query = db.session.query(*[getattr(Job, name) for name in fields])
+    query, _ = filter_jobs(
+        query,
+        request.args.get('company'),
+        request.args.get('location'),
+        request.args.get('search'),
+        active
+    )
+    # yield_per streams results from a server-side cursor instead of loading them all
+    rows = query.order_by(Job.id).yield_per(EXPORT_BATCH_SIZE)
     
-    # Get all jobs that match the filters
-    jobs = query.order_by(Job.posted_date.desc()).all()
-    print(jobs)
-    return jsonify([job.to_dict() for job in jobs])
+    def generate_ndjson():
+        batch = []
+        for job in serialize_rows(fields, rows, fields, lazy=True):
+            batch.append(orjson.dumps(job) if orjson is not None else json.dumps(job).encode())
+            if len(batch) >= EXPORT_BATCH_SIZE:
+                yield b'\n'.join(batch) + b'\n'
+                batch = []
+        if batch:
+            yield b'\n'.join(batch) + b'\n'
+    
+    def generate_csv():
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        for count, job in enumerate(serialize_rows(fields, rows, fields, lazy=True), start=1):
+            writer.writerow(job.values())
+            if count % EXPORT_BATCH_SIZE == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+        yield buffer.getvalue()
+    
+    if export_format == 'csv':
+        body, mimetype = generate_csv(), 'text/csv'
+    else:
+        body, mimetype = generate_ndjson(), 'application/x-ndjson'
+    
+    response = app.response_class(stream_with_context(body), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=jobs.{export_format}'
+    return response
+
+def parse_change_fields(fields_param):
+    """Parse ?fields= for the change feed, which always needs the id and active flag to apply a change"""
+    fields = parse_fields(fields_param)
+    return list(dict.fromkeys(['id', 'is_active'] + fields))
+
+def read_change_payload(since, limit, fields):
+    """The jobs written after since, their current rows in the order of their last change"""
+    cursor, job_ids = read_changes(db, JobChange, since, limit)
+    rows = db.session.query(*[getattr(Job, name) for name in fields]).filter(Job.id.in_(job_ids)).all() if job_ids else []
+    jobs = {job['id']: job for job in serialize_rows(fields, rows, fields)}
+    _, newest = change_window(db, JobChange)
+    # Release the connection before the response is written or the next wait
+    db.session.rollback()
+    return {
+        'jobs': [jobs[job_id] for job_id in job_ids if job_id in jobs],
+        # Jobs whose rows are gone were deleted
+        'deleted': [job_id for job_id in job_ids if job_id not in jobs],
+        'cursor': cursor,
+        'has_more': cursor < newest
+    }
 
+def cursor_expired(since):
+    """Whether changes after since have been pruned, or since isn't a cursor of this log"""
+    oldest, newest = change_window(db, JobChange)
+    return since > newest or (oldest and since < oldest - 1)
 
+@app.route('/api/jobs/changes', methods=['GET'])
+def get_job_changes():
+    """Jobs inserted, updated, deactivated or deleted after the since cursor, waiting up to timeout seconds for one.
+
+    Without since, returns the current cursor to start following from. A
+    cursor whose changes have been pruned gets 410, the client has to reload
+    the list and start again from a fresh cursor.
+    """
+    try:
+        fields = parse_change_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    try:
+        since = request.args.get('since')
+        since = int(since) if since is not None else None
+        limit = int(request.args.get('limit', DEFAULT_CHANGES_LIMIT))
+        timeout = float(request.args.get('timeout', 0))
+    except ValueError:
+        return jsonify({"error": "since and limit must be integers, timeout a number of seconds"}), 400
+    limit = max(1, min(limit, MAX_CHANGES_LIMIT))
+    timeout = max(0, min(timeout, MAX_CHANGES_WAIT_SECONDS))
+    
+    if since is None:
+        _, newest = change_window(db, JobChange)
+        return json_response({'jobs': [], 'deleted': [], 'cursor': newest, 'has_more': False})
+    if cursor_expired(since):
+        return jsonify({"error": "cursor has expired, reload the jobs and start from a new cursor"}), 410
+    
+    # The session is released before waiting, so a waiting request doesn't hold a connection
+    db.session.rollback()
+    if timeout:
+        change_feed.wait(since, timeout)
+    return json_response(read_change_payload(since, limit, fields))
+
+def server_sent_event(event, data, event_id=None):
+    lines = f'id: {event_id}\n' if event_id is not None else ''
+    return f'{lines}event: {event}\ndata: '.encode() + encode_json(data) + b'\n\n'
+
+@app.route('/api/jobs/changes/stream', methods=['GET'])
+def stream_job_changes():
+    """Server-Sent Events stream of the same payloads as GET /api/jobs/changes, one 'changes' event per batch.
+
+    Each event's id is the cursor after it, so a reconnecting EventSource
+    resumes from Last-Event-ID. An expired cursor gets a 'reset' event carrying
+    a fresh cursor. The stream ends after CHANGES_STREAM_SECONDS.
+    """
+    try:
+        fields = parse_change_fields(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    # EventSource sends the id of the last event it got when it reconnects
+    since = request.headers.get('Last-Event-ID') or request.args.get('since')
+    try:
+        since = int(since) if since is not None else None
+    except ValueError:
+        return jsonify({"error": "since must be an integer"}), 400
+    
+    def generate():
+        cursor = since
+        # Reconnect quickly after the stream's planned end
+        yield b'retry: 1000\n\n'
+        if cursor is None or cursor_expired(cursor):
+            _, newest = change_window(db, JobChange)
+            event = 'ready' if cursor is None else 'reset'
+            cursor = newest
+            yield server_sent_event(event, {'cursor': cursor}, cursor)
+        db.session.rollback()
+        
+        deadline = time.monotonic() + CHANGES_STREAM_SECONDS
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            if change_feed.wait(cursor, min(remaining, CHANGES_HEARTBEAT_SECONDS)):
+                payload = read_change_payload(cursor, DEFAULT_CHANGES_LIMIT, fields)
+                cursor = payload['cursor']
+                yield server_sent_event('changes', payload, cursor)
+            else:
+                yield b': keepalive\n\n'
+    
+    response = app.response_class(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Stops nginx from buffering events until the stream ends
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 @app.route('/api/jobs/<int:job_id>', methods=['GET'])
+@response_cache.cached_json
 def get_job(job_id):
     job = Job.query.get_or_404(job_id)
     return jsonify(job.to_dict())
@@ -97,7 +651,12 @@ def get_job(job_id):
 def create_job():
     data = request.json
     
-    if not data or not data.get('title') or not data.get('company'):
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a job object"}), 400
+    error = field_type_error(data)
+    if error:
+        return jsonify({"error": error}), 400
+    if not data.get('title') or not data.get('company'):
         return jsonify({"error": "Missing required fields"}), 400
     
     new_job = Job(
@@ -105,12 +664,16 @@ def create_job():
         company=data.get('company'),
         location=data.get('location'),
         description=data.get('description'),
-        url=data.get('url'),
+        url=data.get('url') or None,
         salary=data.get('salary')
     )
     
     db.session.add(new_job)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"error": "A job with this URL or title, company and location already exists"}), 409
     
     return jsonify(new_job.to_dict()), 201
 
@@ -128,6 +691,14 @@ def update_job(job_id):
     job = Job.query.get_or_404(job_id)
     data = request.json
     
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a job object"}), 400
+    error = field_type_error(data)
+    if error:
+        return jsonify({"error": error}), 400
+    if ('title' in data and not data['title']) or ('company' in data and not data['company']):
+        return jsonify({"error": "Missing required fields"}), 400
+    
     if 'title' in data:
         job.title = data['title']
     if 'company' in data:
@@ -137,52 +708,173 @@ def update_job(job_id):
     if 'description' in data:
         job.description = data['description']
     if 'url' in data:
-        job.url = data['url']
+        job.url = data['url'] or None
     if 'salary' in data:
         job.salary = data['salary']
     if 'is_active' in data:
         job.is_active = data['is_active']
     
-    db.session.commit()
+    for name, value in fingerprint_fields(job.title, job.company, job.location).items():
+        setattr(job, name, value)
+    
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"error": "A job with this URL or title, company and location already exists"}), 409
     return jsonify(job.to_dict())
 
-# Manual trigger for scraping (useful for testing)
+@app.route('/api/jobs/bulk', methods=['POST'])
+def bulk_jobs():
+    data = request.json
+
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected an object with create, update and delete lists"}), 400
+
+    creates = data.get('create') or []
+    updates = data.get('update') or []
+    deletes = data.get('delete') or []
+    if not all(isinstance(items, list) for items in (creates, updates, deletes)):
+        return jsonify({"error": "create, update and delete must be lists"}), 400
+    if len(creates) + len(updates) + len(deletes) > MAX_BULK_ITEMS:
+        return jsonify({"error": f"At most {MAX_BULK_ITEMS} items per request"}), 413
+
+    try:
+        results = apply_bulk(db, Job, creates, updates, deletes)
+    except IntegrityError:
+        return jsonify({"error": "A job with this URL or title, company and location already exists"}), 409
+    return json_response(results)
+
+# Worker that runs scrapes off the request thread, created on first use
+scrape_worker = None
+# Request threads and the scheduler can both ask for the worker first, only one may create it
+scrape_worker_lock = threading.Lock()
+
+def get_scrape_worker():
+    global scrape_worker
+    if scrape_worker is None:
+        with scrape_worker_lock:
+            if scrape_worker is None:
+                scrape_worker = ScrapeWorker(app, db, Job, ScrapeRun, ScrapeWatermark, JobChange)
+    return scrape_worker
+
+# Manual trigger for scraping, returns straight away with a run id to poll
 @app.route('/api/scrape', methods=['POST'])
 def trigger_scrape():
     try:
-        from scraper import scrape_and_save
-        scrape_and_save(db, Job)
-        return jsonify({"message": "Scraping completed successfully"}), 200
+        run, created = get_scrape_worker().submit('manual')
+        return jsonify({"run_id": run['id'], "status": run['status'], "coalesced": not created}), 202
     except Exception as e:
         logger.error(f"Error triggering scrape: {e}")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/scrape/<int:run_id>', methods=['GET'])
+def get_scrape_run(run_id):
+    run = db.get_or_404(ScrapeRun, run_id)
+    return jsonify(run.to_dict())
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    """Scrape stage timings, selector hit rates and request latencies of this process, for Prometheus"""
+    return app.response_class(registry.render(), content_type=METRICS_CONTENT_TYPE)
+
+def run_enrichment():
+    """Fill in job details from their detail pages, a separate stage from card scraping"""
+    with app.app_context():
+        try:
+            enrich_jobs(db, Job, JobDetail)
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error enriching jobs: {e}")
+
+def run_change_pruning():
+    """Drop change feed entries older than CHANGES_RETENTION_DAYS"""
+    with app.app_context():
+        try:
+            deleted = prune_changes(db, JobChange)
+            if deleted:
+                logger.info(f"Pruned {deleted} old job changes")
+        except Exception as e:
+            db.session.rollback()
+            logger.error(f"Error pruning job changes: {e}")
+
 def init_scheduler():
-    """Initialize the scheduler to run the scraper every minute"""
+    """Initialize the scheduler to queue a scrape run every minute.
+
+    Every process runs the scheduler, but only the holder of the
+    linkedin_scraper lease queues scrapes, so running several WSGI workers
+    doesn't multiply the browsers and scrapes. Returns the lease, or None if
+    the scheduler couldn't be started.
+    """
     try:
-        from scraper import scrape_and_save
-        
         scheduler = BackgroundScheduler(daemon=True)
+        lease = LeaderLease(app, db, SchedulerLease, 'linkedin_scraper')
+        lease.heartbeat()
+        atexit.register(lease.release)
         
-        # Create a job function that passes the app
+        # Triggers only queue a run, the worker coalesces them while one is in progress
         def job_function():
-            scrape_and_save(db, Job, app)
+            # Confirm the lease right before scraping rather than trusting the last heartbeat
+            if lease.heartbeat():
+                get_scrape_worker().submit('scheduled')
                 
         scheduler.add_job(
             job_function, 
             'interval', 
             minutes=1,
             id='linkedin_scraper',
-            replace_existing=True
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
+        )
+        # Detail pages are fetched on their own cadence, also only by the leader
+        def enrich_function():
+            if lease.heartbeat():
+                run_enrichment()
+        
+        scheduler.add_job(
+            enrich_function,
+            'interval',
+            minutes=ENRICH_INTERVAL_MINUTES,
+            id='job_enrichment',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
+        )
+        def prune_function():
+            if lease.heartbeat():
+                run_change_pruning()
+        
+        scheduler.add_job(
+            prune_function,
+            'interval',
+            hours=1,
+            id='job_change_pruning',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
+        )
+        scheduler.add_job(
+            lease.heartbeat,
+            'interval',
+            seconds=LEASE_HEARTBEAT_SECONDS,
+            id='scheduler_lease',
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True
         )
         scheduler.start()
-        logger.info("Scheduler started. Scraper will run every 60 minutes.")
+        logger.info(f"Scheduler started. Scraper will run every minute while this process holds the lease (leader: {lease.is_leader}).")
+        return lease
     except Exception as e:
         logger.error(f"Error initializing scheduler: {e}")
+        return None
 
 if __name__ == '__main__':
     with app.app_context():
         db.create_all()
+        init_database_objects()
+        suggest_index.refresh()
     # Initialize the scheduler
     init_scheduler()
     app.run(debug=True) 
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""Benchmark GET /api/jobs and /api/jobs/facets latency against a seeded SQLite database.
+
+Seeds a database with --rows generated jobs (kept in --data-dir between
+runs, so repeated runs skip seeding) and times listing, cursor paging,
+filters, full-text search, facet counts and the response cache through the Flask test
+client. The response cache is cleared before every timed request unless
+the scenario measures it. Run from the backend directory:
+
+    python benchmarks/bench_api.py --rows 100000
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import logging
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import measure, result, emit, add_output_arguments
+
+SUITE = 'api'
+
+SEED_CHUNK_SIZE = 10000
+
+TITLES = [
+    'Software Engineer', 'Senior Software Engineer', 'Python Developer', 'Backend Engineer',
+    'Frontend Developer', 'Full Stack Developer', 'Data Scientist', 'Data Engineer',
+    'DevOps Engineer', 'Machine Learning Engineer', 'QA Engineer', 'Mobile Developer',
+    'Web Developer', 'Site Reliability Engineer', 'Engineering Manager', 'Kubernetes Platform Engineer'
+]
+CITIES = ['Lahore', 'Karachi', 'Islamabad', 'Rawalpindi', 'Faisalabad', 'Multan', 'Peshawar', 'Remote']
+SKILLS = ['python', 'django', 'flask', 'react', 'typescript', 'postgresql', 'aws', 'docker', 'go', 'java']
+
+# (name, URL) of each timed request, the cursor is filled in from the seeded rows
+SCENARIOS = [
+    ('list_newest', '/api/jobs?limit=50'),
+    ('list_deep_cursor', '/api/jobs?limit=50&cursor={cursor}'),
+    ('list_200_with_description', '/api/jobs?limit=200&fields=id,title,company,description'),
+    ('filter_company', '/api/jobs?company=Company 42&limit=50'),
+    ('filter_location', '/api/jobs?location=Karachi&limit=50'),
+    ('search_common', '/api/jobs?search=python developer&limit=50'),
+    ('search_rare', '/api/jobs?search=kubernetes&limit=50'),
+    ('search_and_filter', '/api/jobs?search=engineer&location=Lahore&limit=50'),
+    ('inactive', '/api/jobs?active=false&limit=50'),
+    ('all_jobs', '/api/jobs?active=all&limit=50'),
+    ('facets', '/api/jobs/facets'),
+    ('facets_filtered', '/api/jobs/facets?company=Company 4&location=Lahore'),
+    ('facets_search', '/api/jobs/facets?search=kubernetes'),
+    ('suggest_company', '/api/suggest?field=company&prefix=comp'),
+    ('suggest_location', '/api/suggest?field=location&prefix=la')
+]
+
+
+def generate_jobs(start, stop, now):
+    rng = random.Random(start)
+    for i in range(start, stop):
+        title = f'{rng.choice(TITLES)} {i}'
+        company = f'Company {rng.randrange(2000)}'
+        location = f'{rng.choice(CITIES)}, Pakistan'
+        yield {
+            'title': title,
+            'company': company,
+            'location': location,
+            'description': f"{title} at {company}. Skills: {', '.join(rng.sample(SKILLS, 3))}.",
+            'url': f'https://www.linkedin.com/jobs/view/{i}',
+            'salary': 'N/A',
+            'posted_date': now - timedelta(minutes=rng.randrange(365 * 24 * 60)),
+            'is_active': rng.random() > 0.1,
+            'last_seen_at': now
+        }
+
+
+def seed(db, Job, rows):
+    """Insert rows generated jobs, then build the full-text index and facet counts once instead of per row"""
+    from search import init_search
+    from facets import init_facets
+    from dedup import job_fingerprint
+
+    db.create_all()
+    now = datetime.utcnow()
+    for start in range(0, rows, SEED_CHUNK_SIZE):
+        chunk = [
+            # The near-duplicate SimHash isn't read by the API, so it's left out to keep seeding fast
+            dict(job, fingerprint=job_fingerprint(job['title'], job['company'], job['location']), simhash=None)
+            for job in generate_jobs(start, min(start + SEED_CHUNK_SIZE, rows), now)
+        ]
+        db.session.execute(db.insert(Job), chunk)
+        db.session.commit()
+    init_search(db)
+    init_facets(db)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000, help='jobs in the seeded database')
+    parser.add_argument('--repeat', type=int, default=30, help='timed requests per scenario')
+    parser.add_argument('--data-dir', help='directory keeping seeded databases between runs (default: a temporary one)')
+    add_output_arguments(parser)
+    args = parser.parse_args()
+
+    data_dir = args.data_dir or tempfile.mkdtemp()
+    os.makedirs(data_dir, exist_ok=True)
+    db_path = os.path.join(data_dir, f'bench_api_{args.rows}.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    logging.disable(logging.INFO)
+
+    from app import app, db, Job, response_cache, encode_cursor
+    from search import init_search
+    from facets import init_facets
+
+    params = {'rows': args.rows}
+    results = []
+    with app.app_context():
+        if os.path.exists(db_path) and db.session.query(Job.id).count() == args.rows:
+            init_search(db)
+            init_facets(db)
+        else:
+            db.drop_all()
+            started = time.perf_counter()
+            seed(db, Job, args.rows)
+            results.append(result(SUITE, 'seed', [time.perf_counter() - started], params))
+
+        # A third of the way down the newest-first listing
+        posted_date, job_id = db.session.query(Job.posted_date, Job.id).filter(Job.is_active.is_(True)).order_by(
+            Job.posted_date.desc(), Job.id.desc()
+        ).offset(args.rows // 3).first()
+        cursor = encode_cursor(posted_date.isoformat(), job_id)
+        db.session.rollback()
+
+    client = app.test_client()
+
+    def timed_get(url, cached=False):
+        def request():
+            if not cached:
+                response_cache.bump()
+            response = client.get(url)
+            assert response.status_code == 200, (url, response.status_code)
+        return request
+
+    for name, url in SCENARIOS:
+        url = url.format(cursor=cursor)
+        results.append(result(SUITE, name, measure(timed_get(url), args.repeat), params))
+    results.append(result(SUITE, 'list_newest_cached', measure(timed_get('/api/jobs?limit=50', cached=True), args.repeat), params))
+    emit(results, args)
+
+
+if __name__ == '__main__':
+    main()
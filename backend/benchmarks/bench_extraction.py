@@ -0,0 +1,151 @@
+"""Benchmark card discovery and extraction against the local fixture server.
+
+Parses fixture results pages with the page_source extractor on every run.
+When a Chrome driver can start (set CHROMEDRIVER_PATH on offline hosts),
+also times the Selenium path: card discovery, extract_job_details_selenium
+per card and a full scrape_search_term harvest in scroll and paged modes.
+Run from the backend directory:
+
+    python benchmarks/bench_extraction.py --cards 200
+"""
+import os
+import sys
+import argparse
+import logging
+import threading
+from http.server import ThreadingHTTPServer
+from urllib.request import urlopen
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import measure, result, skipped, emit, add_output_arguments
+from fixture_server import make_handler, PAGE_SIZE
+
+SUITE = 'extraction'
+
+SELENIUM_BENCHMARKS = ['find_job_cards_selenium', 'extract_job_details_selenium', 'harvest_scroll', 'harvest_paged']
+
+
+def start_fixture_server(mode, total):
+    """Serve fixture pages on a free local port from a background thread, returning (server, base_url)"""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(mode, total, batches_per_button=3, delay=0.0))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def bench_page_source(base_url, repeat):
+    """The default extraction mode: one page snapshot parsed with lxml"""
+    import lxml.html
+    import scraper
+
+    # The first results page, PAGE_SIZE cards
+    page_url = f'{base_url}/jobs/search?keywords=python&location=Pakistan'
+    page_source = urlopen(page_url).read().decode()
+    tree = lxml.html.fromstring(page_source)
+    job_cards = scraper.find_job_cards_html(tree)
+    params = {'cards': len(job_cards)}
+    results = []
+
+    results.append(result(SUITE, 'parse_page', measure(lambda: lxml.html.fromstring(page_source), repeat), params))
+    results.append(result(SUITE, 'find_job_cards_html', measure(lambda: scraper.find_job_cards_html(tree), repeat), params))
+    results.append(result(
+        SUITE, 'extract_job_details_html',
+        measure(lambda: [scraper.extract_job_details_html(card, page_url) for card in job_cards], repeat),
+        params, per=len(job_cards)
+    ))
+
+    # Incremental run where every card is already known, so only the URLs are read
+    known_urls = {scraper.canonical_job_url(scraper.card_url_html(card, page_url)) for card in job_cards}
+    results.append(result(
+        SUITE, 'scan_cards_known',
+        measure(lambda: scraper.scan_cards(
+            job_cards, lambda card: scraper.card_url_html(card, page_url),
+            lambda card: scraper.extract_job_details_html(card, page_url),
+            known_urls, stop_at_known=False
+        ), repeat),
+        params, per=len(job_cards)
+    ))
+    return results
+
+
+def bench_selenium(cards, repeat):
+    """The browser path, skipped when no Chrome driver can be started here"""
+    import scraper
+
+    try:
+        driver = scraper.setup_driver()
+    except Exception as e:
+        driver = None
+        reason = f'could not start Chrome: {e}'
+    else:
+        reason = 'could not start Chrome, set CHROMEDRIVER_PATH'
+    if driver is None:
+        return [skipped(SUITE, name, reason) for name in SELENIUM_BENCHMARKS]
+
+    results = []
+    servers = []
+    try:
+        for mode in ('scroll', 'paged'):
+            server, base_url = start_fixture_server(mode, cards)
+            servers.append(server)
+            # get_linkedin_page builds its URL from the module setting
+            scraper.LINKEDIN_BASE_URL = base_url
+            params = {'mode': mode, 'cards': cards}
+
+            if mode == 'scroll':
+                scraper.get_linkedin_page(driver, 'python', 'Pakistan')
+                job_cards = scraper.find_job_cards_selenium(driver)
+                results.append(result(
+                    SUITE, 'find_job_cards_selenium',
+                    measure(lambda: scraper.find_job_cards_selenium(driver), repeat), {'cards': len(job_cards)}
+                ))
+                results.append(result(
+                    SUITE, 'extract_job_details_selenium',
+                    measure(lambda: [scraper.extract_job_details_selenium(card) for card in job_cards], max(1, repeat // 4)),
+                    {'cards': len(job_cards)}, per=len(job_cards)
+                ))
+
+            harvested = []
+            def harvest():
+                scan = scraper.scrape_search_term(driver, 'python', 'Pakistan', stop_at_known=False)
+                harvested.append(scan.card_count)
+            results.append(result(
+                SUITE, f'harvest_{mode}', measure(harvest, repeat=3, warmup=0), params,
+                cards_read=max(harvested)
+            ))
+    finally:
+        scraper.close_driver(driver)
+        for server in servers:
+            server.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--cards', type=int, default=200, help='results served per search')
+    parser.add_argument('--repeat', type=int, default=20, help='timed repetitions per measurement')
+    parser.add_argument('--no-browser', action='store_true', help='skip the Selenium measurements')
+    add_output_arguments(parser)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    # Page loads from the fixture server aren't rate limited, and harvests read every card it serves
+    os.environ.setdefault('SCRAPER_RATE_PER_SECOND', '1000')
+    os.environ.setdefault('SCRAPER_BURST', '1000')
+    os.environ.setdefault('SCRAPER_MAX_CARDS', str(args.cards))
+    os.environ.setdefault('SCRAPER_MAX_PAGES', str(args.cards // PAGE_SIZE + 2))
+
+    server, base_url = start_fixture_server('paged', args.cards)
+    try:
+        results = bench_page_source(base_url, args.repeat)
+    finally:
+        server.shutdown()
+    if args.no_browser:
+        results += [skipped(SUITE, name, 'disabled with --no-browser') for name in SELENIUM_BENCHMARKS]
+    else:
+        results += bench_selenium(args.cards, args.repeat)
+    emit(results, args)
+
+
+if __name__ == '__main__':
+    main()
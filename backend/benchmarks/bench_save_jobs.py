@@ -0,0 +1,118 @@
+"""Benchmark the database stage of scrape_and_save.
+
+Compares the previous per-job lookup loop with the batched save_jobs against a
+seeded SQLite database, with and without the near-duplicate index that
+scrape_and_save passes it. Run from the backend directory:
+
+    python benchmarks/bench_save_jobs.py --seed 20000 --scraped 600
+"""
+import os
+import sys
+import time
+import argparse
+import tempfile
+import logging
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from common import result, emit, add_output_arguments
+
+SUITE = 'save_jobs'
+
+
+def make_job(i):
+    return {
+        'title': f'Software Engineer {i}',
+        'company': f'Company {i % 500}',
+        'location': 'Lahore, Pakistan',
+        'description': f'https://www.linkedin.com/jobs/view/{i}',
+        'url': f'https://www.linkedin.com/jobs/view/{i}',
+        'salary': 'N/A',
+        'posted_date': datetime.utcnow(),
+        'is_active': True
+    }
+
+def save_jobs_per_row(db, Job, jobs):
+    """The save loop scrape_and_save used before batching, kept for comparison"""
+    jobs_added = 0
+    seen_jobs = set()
+    for job_data in jobs:
+        job_identifier = f"{job_data['title']}|{job_data['company']}|{job_data['location']}"
+        existing_job = Job.query.filter(
+            (Job.url == job_data['url']) |
+            ((Job.title == job_data['title']) &
+             (Job.company == job_data['company']) &
+             (Job.location == job_data['location']))
+        ).first()
+        if existing_job or job_identifier in seen_jobs:
+            continue
+        seen_jobs.add(job_identifier)
+        db.session.add(Job(**job_data))
+        jobs_added += 1
+    db.session.commit()
+    return jobs_added
+
+def save_jobs_near_duplicates(db, Job, jobs):
+    """The full database stage of scrape_and_save, building the SimHash index first"""
+    from scraper import save_jobs
+    from dedup import load_simhash_index
+
+    near_duplicates = load_simhash_index(db, Job)
+    db.session.rollback()
+    return save_jobs(db, Job, jobs, near_duplicates)
+
+def run(save, seed, scraped):
+    from app import app, db, Job
+    from search import init_search
+
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        init_search(db)
+        db.session.execute(db.insert(Job), [make_job(i) for i in range(seed)])
+        db.session.commit()
+
+        # Half of every scrape is already stored, as in a steady-state run
+        jobs = [make_job(i) for i in range(seed - scraped // 2, seed + scraped - scraped // 2)]
+        start = time.perf_counter()
+        save(db, Job, jobs)
+        return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--seed', type=int, default=20000, help='rows already in the database')
+    parser.add_argument('--scraped', type=int, default=600, help='jobs returned by one scrape run')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per variant, each on a freshly seeded database')
+    add_output_arguments(parser)
+    args = parser.parse_args()
+
+    db_path = os.path.join(tempfile.mkdtemp(), 'bench_jobs.db')
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    logging.disable(logging.INFO)
+
+    from scraper import save_jobs
+
+    params = {'seed': args.seed, 'scraped': args.scraped}
+    variants = [
+        ('per_row', save_jobs_per_row),
+        ('batched', save_jobs),
+        ('batched_near_duplicates', save_jobs_near_duplicates)
+    ]
+    results = []
+    for name, save in variants:
+        samples = [run(save, args.seed, args.scraped) for _ in range(args.repeat)]
+        results.append(result(SUITE, name, samples, params))
+        results.append(result(SUITE, f'{name}_per_job', samples, params, per=args.scraped))
+
+    if args.json:
+        emit(results, args)
+        return
+    before, after, full = (entry['median'] for entry in results[::2])
+    print(f"seeded rows: {args.seed}, scraped jobs: {args.scraped}")
+    print(f"per-row lookups: {before * 1000:.1f} ms")
+    print(f"batched save:    {after * 1000:.1f} ms ({before / after:.1f}x faster)")
+    print(f"with near-duplicate index: {full * 1000:.1f} ms")
+
+if __name__ == '__main__':
+    main()
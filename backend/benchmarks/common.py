@@ -0,0 +1,95 @@
+"""Timing and result helpers shared by the benchmarks.
+
+Every benchmark produces a list of result dicts of the same shape, keyed by
+suite, name and params, so runs can be saved as JSON and compared.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import subprocess
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def percentile(sorted_samples, fraction):
+    index = min(len(sorted_samples) - 1, max(0, round(fraction * (len(sorted_samples) - 1))))
+    return sorted_samples[index]
+
+def summarize(samples):
+    """Summary statistics in seconds of a list of timings"""
+    ordered = sorted(samples)
+    return {
+        'samples': len(ordered),
+        'min': ordered[0],
+        'median': percentile(ordered, 0.5),
+        'p95': percentile(ordered, 0.95),
+        'max': ordered[-1],
+        'mean': sum(ordered) / len(ordered)
+    }
+
+def measure(fn, repeat=20, warmup=2):
+    """Call fn warmup times untimed, then repeat times, returning the timings in seconds"""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return samples
+
+def result(suite, name, samples, params=None, per=1, unit='s', **extra):
+    """Build a result entry. per divides every timing, e.g. the number of cards a timed call handled"""
+    entry = {'suite': suite, 'name': name, 'params': params or {}, 'unit': unit}
+    entry.update(summarize([sample / per for sample in samples]))
+    if per != 1:
+        entry['per'] = per
+    entry.update(extra)
+    return entry
+
+def skipped(suite, name, reason, params=None):
+    return {'suite': suite, 'name': name, 'params': params or {}, 'skipped': reason}
+
+def result_key(entry):
+    return (entry['suite'], entry['name'], json.dumps(entry['params'], sort_keys=True))
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR,
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_metadata():
+    return {
+        'created_at': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+        'git_revision': git_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+def emit(results, args):
+    """Print results as JSON for the runner when --json is given, otherwise as a table"""
+    if args.json:
+        json.dump(results, sys.stdout)
+        sys.stdout.write('\n')
+        return
+    print_table(results)
+
+def print_table(results):
+    for entry in results:
+        params = ' '.join(f'{name}={value}' for name, value in entry['params'].items())
+        label = f"{entry['suite']}/{entry['name']} {params}".strip()
+        if 'skipped' in entry:
+            print(f"{label:<60} skipped: {entry['skipped']}")
+        else:
+            print(f"{label:<60} median {entry['median'] * 1000:9.3f} ms  p95 {entry['p95'] * 1000:9.3f} ms"
+                  f"  ({entry['samples']} samples)")
+
+def add_output_arguments(parser):
+    parser.add_argument('--json', action='store_true', help='print results as JSON instead of a table')
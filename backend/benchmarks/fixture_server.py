@@ -0,0 +1,269 @@
+"""Serve generated job search results pages for running the scraper offline.
+
+Results come either as an infinite list that grows as the page is scrolled,
+with a "See more jobs" button every few batches like the public LinkedIn
+search, or as numbered pages linked with rel="next". The cards link to job
+detail pages that answer conditional requests. Run from the backend
+directory and point the scraper at it:
+
+    python benchmarks/fixture_server.py --mode scroll --total 200
+    LINKEDIN_BASE_URL=http://127.0.0.1:8765 python main.py
+"""
+import argparse
+import html
+import re
+import json
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs, urlencode
+
+# Cards per page, or per batch appended to the infinite list
+PAGE_SIZE = 25
+
+# Job detail pages linked from the cards, /jobs/view/<slug>-<job id>
+DETAIL_PATH = re.compile(r'^/jobs/view/[^/]*-(\d+)/?$')
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><title>{keywords} jobs in {location}</title></head>
+<body>
+<main>
+<ul class="jobs-search__results-list">
+{cards}
+</ul>
+{footer}
+</main>
+{script}
+</body>
+</html>
+"""
+
+CARD_TEMPLATE = """<li>
+  <div class="base-card job-search-card">
+    <a class="base-card__full-link" href="/jobs/view/{slug}-{job_id}?refId={ref}&amp;trackingId={ref}">{title}</a>
+    <div class="base-search-card__info">
+      <h3 class="base-search-card__title">{title}</h3>
+      <h4 class="base-search-card__subtitle">{company}</h4>
+      <div class="base-search-card__metadata">
+        <span class="job-search-card__location">{location}</span>
+        <time class="job-search-card__listdate" datetime="2026-10-{day:02d}">{age} days ago</time>
+      </div>
+    </div>
+  </div>
+</li>"""
+
+# Appends the next batch when the list is scrolled to the bottom, and after every
+# few batches waits for the "See more jobs" button to be pressed instead
+SCROLL_SCRIPT = """<script>
+(function () {
+  var state = %s;
+  var list = document.querySelector('ul.jobs-search__results-list');
+  var button = document.querySelector('button.infinite-scroller__show-more-button');
+  var loading = false;
+
+  function load() {
+    if (loading || state.start >= state.total) return;
+    loading = true;
+    fetch(state.api + '&start=' + state.start)
+      .then(function (response) { return response.text(); })
+      .then(function (cards) {
+        list.insertAdjacentHTML('beforeend', cards);
+        state.start += state.pageSize;
+        state.batches += 1;
+        loading = false;
+        button.style.display = (state.batches %% state.batchesPerButton === 0 && state.start < state.total) ? '' : 'none';
+      });
+  }
+
+  window.addEventListener('scroll', function () {
+    if (button.style.display !== 'none') return;
+    if (window.innerHeight + window.scrollY >= document.body.scrollHeight - 2) load();
+  });
+  button.addEventListener('click', function () {
+    button.style.display = 'none';
+    load();
+  });
+})();
+</script>"""
+
+
+DETAIL_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<title>{title}</title>
+<script type="application/ld+json">{posting}</script>
+</head>
+<body>
+<main>
+<h1 class="top-card-layout__title">{title}</h1>
+<span class="posted-time-ago__text">{age} days ago</span>
+<div class="salary compensation__salary">{salary}</div>
+<div class="show-more-less-html__markup">
+<p>{title} at {company}, revision {revision}.</p>
+<ul><li>Build and maintain services</li><li>Review code</li></ul>
+</div>
+<input type="hidden" name="trackingId" value="{tracking}">
+</main>
+</body>
+</html>
+"""
+
+
+def render_detail(job_id, revision):
+    """Render the detail page of a fixture job, the same on every request apart from a tracking token"""
+    index = job_id - 100000
+    title = html.escape(f'Job {index}')
+    company = html.escape(f'Company {index % 40}')
+    low = 100000 + (index % 10) * 10000
+    posting = {
+        '@context': 'http://schema.org',
+        '@type': 'JobPosting',
+        'title': f'Job {index}',
+        'datePosted': f'2026-10-{max(1, 28 - index // PAGE_SIZE):02d}T09:00:00.000Z',
+        'baseSalary': {
+            '@type': 'MonetaryAmount',
+            'currency': 'PKR',
+            'value': {'@type': 'QuantitativeValue', 'minValue': low, 'maxValue': low + 50000, 'unitText': 'MONTH'}
+        }
+    }
+    return DETAIL_TEMPLATE.format(
+        title=title, company=company, revision=revision, age=index // PAGE_SIZE + 1,
+        salary=f'PKR {low:,} - {low + 50000:,}/month', posting=json.dumps(posting),
+        tracking=time.monotonic_ns()
+    )
+
+
+def render_cards(keywords, location, start, stop):
+    slug = '-'.join(keywords.lower().split()) or 'job'
+    cards = []
+    for index in range(start, stop):
+        # Newest first, like results sorted by date
+        cards.append(CARD_TEMPLATE.format(
+            slug=html.escape(slug),
+            job_id=100000 + index,
+            ref=f'{index:08x}',
+            title=html.escape(f'{keywords.title() or "Job"} {index}'),
+            company=html.escape(f'Company {index % 40}'),
+            location=html.escape(location or 'Pakistan'),
+            day=max(1, 28 - index // PAGE_SIZE),
+            age=index // PAGE_SIZE + 1
+        ))
+    return '\n'.join(cards)
+
+
+def make_handler(mode, total, batches_per_button, delay, revision=1, validators=True):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def send_html(self, body, status=200, headers=None):
+            payload = body.encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            params = {name: values[0] for name, values in parse_qs(url.query).items()}
+            keywords = params.get('keywords', '')
+            location = params.get('location', '')
+
+            if url.path == '/jobs/search':
+                if mode == 'paged':
+                    page = int(params.get('pageNum', 0))
+                    start = page * PAGE_SIZE
+                    stop = min(start + PAGE_SIZE, total)
+                    footer = ''
+                    if stop < total:
+                        next_params = dict(params, pageNum=page + 1)
+                        footer = f'<a rel="next" href="/jobs/search?{html.escape(urlencode(next_params))}">Next</a>'
+                    self.send_html(PAGE_TEMPLATE.format(
+                        keywords=html.escape(keywords), location=html.escape(location),
+                        cards=render_cards(keywords, location, start, stop), footer=footer, script=''
+                    ))
+                    return
+
+                state = {
+                    'api': '/jobs-guest/jobs/api/seeMoreJobPostings/search?' + urlencode(
+                        {'keywords': keywords, 'location': location}
+                    ),
+                    'start': min(PAGE_SIZE, total),
+                    'total': total,
+                    'pageSize': PAGE_SIZE,
+                    'batches': 1,
+                    'batchesPerButton': batches_per_button
+                }
+                footer = ('<button class="infinite-scroller__show-more-button" '
+                          'aria-label="See more jobs" style="display: none">See more jobs</button>')
+                # Tall enough that the first batch needs scrolling, like a real results list
+                footer += '<div style="height: 2000px"></div>'
+                self.send_html(PAGE_TEMPLATE.format(
+                    keywords=html.escape(keywords), location=html.escape(location),
+                    cards=render_cards(keywords, location, 0, min(PAGE_SIZE, total)),
+                    footer=footer, script=SCROLL_SCRIPT % json.dumps(state)
+                ))
+                return
+
+            if url.path == '/jobs-guest/jobs/api/seeMoreJobPostings/search':
+                if delay:
+                    time.sleep(delay)
+                start = int(params.get('start', 0))
+                self.send_html(render_cards(keywords, location, start, min(start + PAGE_SIZE, total)))
+                return
+
+            detail = DETAIL_PATH.match(url.path)
+            if detail:
+                if delay:
+                    time.sleep(delay)
+                job_id = int(detail.group(1))
+                etag = f'"{job_id}-{revision}"'
+                if validators and self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_html(render_detail(job_id, revision), headers={'ETag': etag} if validators else None)
+                return
+
+            self.send_html('<html><body>Not found</body></html>', status=404)
+
+        def log_message(self, format, *args):
+            pass
+
+    return FixtureHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--mode', choices=('scroll', 'paged'), default='scroll',
+                        help='infinite scroll list or numbered pages')
+    parser.add_argument('--total', type=int, default=200, help='results available per search')
+    parser.add_argument('--batches-per-button', type=int, default=3,
+                        help='scroll batches between "See more jobs" presses')
+    parser.add_argument('--delay', type=float, default=0.0,
+                        help='seconds before each appended batch or detail page is served')
+    parser.add_argument('--revision', type=int, default=1,
+                        help='content revision of the detail pages, change it to simulate edited postings')
+    parser.add_argument('--no-validators', action='store_true',
+                        help="don't send ETags or answer conditional requests with 304")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(
+        (args.host, args.port),
+        make_handler(args.mode, args.total, args.batches_per_button, args.delay,
+                     args.revision, not args.no_validators)
+    )
+    print(f"Serving {args.mode} results on http://{args.host}:{args.port}/jobs/search")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""Run the offline benchmark suite and save the results as JSON.
+
+Each benchmark runs in its own process (the app binds its database at
+import), and the results are written to one file together with the git
+revision and host details. Pass --baseline to compare the run with an
+earlier results file, the exit status is 1 if any median regressed by more
+than --threshold. Run from the backend directory:
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --quick --output new.json --baseline results.json
+    python benchmarks/run.py --compare results.json new.json
+"""
+import os
+import sys
+import json
+import argparse
+import subprocess
+
+from common import BACKEND_DIR, run_metadata, result_key, print_table
+
+BENCHMARKS_DIR = os.path.join(BACKEND_DIR, 'benchmarks')
+
+SUITES = ('extraction', 'save_jobs', 'api')
+
+def suite_commands(args):
+    """(suite, arguments) of every benchmark process to run"""
+    repeat = ['--repeat', '5'] if args.quick else []
+    commands = []
+    if 'extraction' in args.suites:
+        commands.append(('extraction', ['bench_extraction.py'] + repeat + (['--no-browser'] if args.no_browser else [])))
+    if 'save_jobs' in args.suites:
+        seed = '5000' if args.quick else '20000'
+        commands.append(('save_jobs', ['bench_save_jobs.py', '--seed', seed, '--repeat', '1' if args.quick else '3']))
+    if 'api' in args.suites:
+        for rows in args.api_rows:
+            command = ['bench_api.py', '--rows', str(rows)] + repeat
+            if args.data_dir:
+                command += ['--data-dir', args.data_dir]
+            commands.append(('api', command))
+    return commands
+
+def run_suite(suite, command):
+    script = os.path.join(BENCHMARKS_DIR, command[0])
+    completed = subprocess.run(
+        [sys.executable, script, '--json'] + command[1:], cwd=BACKEND_DIR,
+        capture_output=True, text=True
+    )
+    if completed.returncode != 0:
+        error = (completed.stderr.strip().splitlines() or ['no output'])[-1]
+        return [{'suite': suite, 'name': command[0], 'params': {}, 'error': error}]
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+def compare(baseline, current, threshold):
+    """Print the change in median of every result in both runs, returning the regressions"""
+    before = {result_key(entry): entry for entry in baseline['results'] if 'median' in entry}
+    regressions = []
+    for entry in current['results']:
+        old = before.get(result_key(entry))
+        if old is None or 'median' not in entry or not old['median']:
+            continue
+        ratio = entry['median'] / old['median']
+        params = ' '.join(f'{name}={value}' for name, value in entry['params'].items())
+        label = f"{entry['suite']}/{entry['name']} {params}".strip()
+        flag = ''
+        if ratio > 1 + threshold:
+            flag = '  REGRESSION'
+            regressions.append(entry)
+        elif ratio < 1 - threshold:
+            flag = '  improved'
+        print(f"{label:<60} {old['median'] * 1000:9.3f} ms -> {entry['median'] * 1000:9.3f} ms"
+              f"  {(ratio - 1) * 100:+6.1f}%{flag}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--suites', default=','.join(SUITES), help=f"comma separated subset of {', '.join(SUITES)}")
+    parser.add_argument('--api-rows', default='10000,100000,1000000', help='database sizes for the API benchmark')
+    parser.add_argument('--quick', action='store_true', help='fewer repetitions and a smaller save_jobs seed')
+    parser.add_argument('--no-browser', action='store_true', help='skip the Selenium extraction measurements')
+    parser.add_argument('--data-dir', help='keep seeded API databases here between runs')
+    parser.add_argument('--output', help='file to write the results to (default: print them)')
+    parser.add_argument('--baseline', help='earlier results file to compare this run with')
+    parser.add_argument('--threshold', type=float, default=0.10, help='slowdown of a median counted as a regression')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'RESULTS'),
+                        help='compare two saved results files without running anything')
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as baseline_file, open(args.compare[1]) as results_file:
+            regressions = compare(json.load(baseline_file), json.load(results_file), args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    args.suites = [suite.strip() for suite in args.suites.split(',') if suite.strip()]
+    unknown = set(args.suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(sorted(unknown))}")
+    args.api_rows = [int(rows) for rows in args.api_rows.split(',') if rows.strip()]
+
+    run = {'metadata': run_metadata(), 'results': []}
+    for suite, command in suite_commands(args):
+        print(f"Running {' '.join(command)}", file=sys.stderr)
+        run['results'].extend(run_suite(suite, command))
+
+    print_table([entry for entry in run['results'] if 'error' not in entry])
+    for entry in run['results']:
+        if 'error' in entry:
+            print(f"{entry['suite']}/{entry['name']} failed: {entry['error']}", file=sys.stderr)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(run, output_file, indent=2)
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            print()
+            regressions = compare(json.load(baseline_file), run, args.threshold)
+        sys.exit(1 if regressions else 0)
+    if any('error' in entry for entry in run['results']):
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,171 @@
+import os
+import shutil
+import logging
+import threading
+from selenium.common.exceptions import WebDriverException
+from webdriver_manager.chrome import ChromeDriverManager
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Explicit chromedriver binary, skips the driver manager entirely (needed on offline hosts)
+CHROMEDRIVER_PATH = os.environ.get('CHROMEDRIVER_PATH')
+
+# Keep browsers running between scrape runs instead of launching fresh ones every time
+BROWSER_KEEP_WARM = os.environ.get('BROWSER_KEEP_WARM', 'true').lower() in ('1', 'true', 'yes')
+
+# A warm browser is replaced after loading this many pages
+BROWSER_MAX_PAGES = int(os.environ.get('BROWSER_MAX_PAGES', 50))
+
+# ...or once its JavaScript heap grows past this many megabytes
+BROWSER_MAX_MEMORY_MB = int(os.environ.get('BROWSER_MAX_MEMORY_MB', 512))
+
+# Resolved chromedriver path, looked up once per process even when nothing was found
+_driver_path = None
+_driver_path_resolved = False
+_driver_path_lock = threading.Lock()
+
+def resolve_driver_path():
+    """Return the chromedriver binary to use, resolving it only on the first call.
+
+    CHROMEDRIVER_PATH wins, then a chromedriver on PATH, then the driver
+    manager (which checks the latest version online and caches the download).
+    Returns None to let Selenium locate the driver itself.
+    """
+    global _driver_path, _driver_path_resolved
+    with _driver_path_lock:
+        if _driver_path_resolved:
+            return _driver_path
+
+        if CHROMEDRIVER_PATH:
+            if os.path.exists(CHROMEDRIVER_PATH):
+                _driver_path = CHROMEDRIVER_PATH
+            else:
+                logger.warning(f"CHROMEDRIVER_PATH {CHROMEDRIVER_PATH} does not exist")
+
+        # A local driver needs no network round trip
+        if not _driver_path:
+            _driver_path = shutil.which('chromedriver')
+
+        if not _driver_path:
+            try:
+                _driver_path = ChromeDriverManager().install()
+            except Exception as e:
+                logger.warning(f"Driver manager could not resolve chromedriver: {e}")
+
+        # Not finding one is remembered too, every browser start would otherwise retry the download
+        _driver_path_resolved = True
+        if _driver_path:
+            logger.info(f"Using chromedriver at {_driver_path}")
+        return _driver_path
+
+def close_driver(driver):
+    """Quit a webdriver, logging instead of raising if the browser is already gone"""
+    try:
+        driver.quit()
+        logger.info("WebDriver closed successfully")
+    except Exception as e:
+        logger.error(f"Error closing WebDriver: {e}")
+
+class BrowserPool:
+    """Pool of headless browsers that stay warm between scrape runs.
+
+    Browsers are started lazily up to size, handed to one worker at a time
+    and recycled after max_pages page loads, when they stop responding, or
+    when their JavaScript heap passes max_memory_mb.
+    """
+
+    def __init__(self, create_driver, size, max_pages=BROWSER_MAX_PAGES, max_memory_mb=BROWSER_MAX_MEMORY_MB):
+        self.create_driver = create_driver
+        self.size = size
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.idle = []
+        # Pages loaded by every live browser, idle or checked out
+        self.pages_loaded = {}
+        self.slots_reserved = 0
+        self.available = threading.Condition()
+
+    def acquire(self):
+        """Check out a browser, starting one if the pool isn't full yet, or None if it failed to start"""
+        while True:
+            driver = None
+            with self.available:
+                while True:
+                    if self.idle:
+                        # Most recently used first, so surplus browsers age out on their own
+                        driver = self.idle.pop()
+                        break
+                    if len(self.pages_loaded) + self.slots_reserved < self.size:
+                        # Reserve the slot so concurrent callers can't overfill the pool while this one starts
+                        self.slots_reserved += 1
+                        break
+                    self.available.wait()
+            if driver is None:
+                break
+            # A browser can die while idle between runs, only hand out one that still answers
+            if self.responds(driver):
+                return driver
+            logger.info("Discarding a warm browser that stopped responding")
+            self.discard(driver)
+
+        driver = None
+        try:
+            driver = self.create_driver()
+        finally:
+            with self.available:
+                self.slots_reserved -= 1
+                if driver:
+                    self.pages_loaded[driver] = 0
+                else:
+                    self.available.notify()
+        return driver
+
+    def responds(self, driver):
+        """Whether a browser still answers its driver"""
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    def release(self, driver, pages=1):
+        """Return a browser after it loaded some pages, retiring it if it is crashed or worn out"""
+        with self.available:
+            self.pages_loaded[driver] = self.pages_loaded.get(driver, 0) + pages
+            pages_loaded = self.pages_loaded[driver]
+
+        reason = None
+        if pages_loaded >= self.max_pages:
+            reason = f"after {pages_loaded} pages"
+        else:
+            try:
+                heap_bytes = driver.execute_script(
+                    "return window.performance.memory ? window.performance.memory.usedJSHeapSize : 0"
+                )
+                if heap_bytes and heap_bytes > self.max_memory_mb * 1024 * 1024:
+                    reason = f"at {heap_bytes // (1024 * 1024)} MB of JS heap"
+            except WebDriverException as e:
+                reason = f"after it stopped responding ({e.__class__.__name__})"
+
+        if reason:
+            logger.info(f"Recycling browser {reason}")
+            self.discard(driver)
+        else:
+            with self.available:
+                self.idle.append(driver)
+                self.available.notify()
+
+    def discard(self, driver):
+        """Quit a checked-out browser and free its slot"""
+        with self.available:
+            self.pages_loaded.pop(driver, None)
+            self.available.notify()
+        close_driver(driver)
+
+    def shutdown(self):
+        """Quit every idle browser in the pool"""
+        with self.available:
+            drivers, self.idle = self.idle, []
+        for driver in drivers:
+            self.discard(driver)
@@ -0,0 +1,221 @@
+import logging
+from sqlalchemy import insert, update, delete
+from dedup import fingerprint_fields
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Most creates, updates and deletes accepted in one bulk request
+MAX_BULK_ITEMS = 10000
+
+# Fields a bulk create or update may set
+WRITABLE_FIELDS = ('title', 'company', 'location', 'description', 'url', 'salary', 'is_active')
+
+# Writable fields stored as text, any of them may be null unless it is required
+TEXT_FIELDS = ('title', 'company', 'location', 'description', 'url', 'salary')
+
+# Ids and keys looked up per IN query
+LOOKUP_CHUNK_SIZE = 500
+
+CONFLICT_ERROR = 'A job with this URL or title, company and location already exists'
+
+def chunked(items, size=LOOKUP_CHUNK_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+def field_type_error(data):
+    """Return an error naming the first writable field of a job item with the wrong type, or None.
+
+    Shared with the single job routes, a title or company that isn't a string
+    would otherwise fail in the fingerprint instead of being rejected.
+    """
+    for name in TEXT_FIELDS:
+        if data.get(name) is not None and not isinstance(data[name], str):
+            return f"{name} must be a string"
+    if 'is_active' in data and not isinstance(data['is_active'], bool):
+        return "is_active must be true or false"
+    return None
+
+def clean_job_fields(data):
+    """Keep the writable fields of an item, storing an empty url as NULL like create_job does"""
+    fields = {name: data[name] for name in WRITABLE_FIELDS if name in data}
+    if 'url' in fields:
+        fields['url'] = fields['url'] or None
+    return fields
+
+def existing_ids(db, Job, ids):
+    found = set()
+    for chunk in chunked(list(ids)):
+        found.update(job_id for (job_id,) in db.session.query(Job.id).filter(Job.id.in_(chunk)))
+    return found
+
+def key_owners(db, column, Job, keys):
+    """Map each of keys stored in the unique column to the id of the job holding it"""
+    owners = {}
+    for chunk in chunked(list(keys)):
+        owners.update((key, job_id) for key, job_id in db.session.query(column, Job.id).filter(column.in_(chunk)))
+    return owners
+
+def apply_bulk(db, Job, creates, updates, deletes):
+    """Apply creates, updates and deletes in one transaction with executemany statements.
+
+    Returns per-item results for each list, in request order. Invalid items
+    and creates or updates that would duplicate an existing job, or an
+    earlier item, are reported and skipped; the rest are written together.
+    Raises IntegrityError, after rolling back, if a write still violates a
+    unique key (e.g. a concurrent insert).
+    """
+    create_results = [None] * len(creates)
+    update_results = [None] * len(updates)
+    delete_results = [None] * len(deletes)
+
+    # Validate creates and drop those whose url or normalized title/company/location is already taken
+    new_rows = []
+    seen_urls = set()
+    seen_fingerprints = set()
+    candidates = []
+    for index, data in enumerate(creates):
+        error = field_type_error(data) if isinstance(data, dict) else None
+        if error:
+            create_results[index] = {'index': index, 'status': 'error', 'error': error}
+            continue
+        if not isinstance(data, dict) or not data.get('title') or not data.get('company'):
+            create_results[index] = {'index': index, 'status': 'error', 'error': 'Missing required fields'}
+            continue
+        fields = clean_job_fields(data)
+        fields.update(fingerprint_fields(fields['title'], fields['company'], fields.get('location')))
+        candidates.append((index, fields))
+
+    for chunk in chunked(candidates):
+        urls = {fields['url'] for _, fields in chunk if fields.get('url')}
+        fingerprints = {fields['fingerprint'] for _, fields in chunk}
+        if urls:
+            seen_urls.update(url for (url,) in db.session.query(Job.url).filter(Job.url.in_(urls)))
+        seen_fingerprints.update(
+            fingerprint for (fingerprint,) in db.session.query(Job.fingerprint).filter(Job.fingerprint.in_(fingerprints))
+        )
+        for index, fields in chunk:
+            url = fields.get('url')
+            if (url and url in seen_urls) or fields['fingerprint'] in seen_fingerprints:
+                create_results[index] = {'index': index, 'status': 'conflict', 'error': CONFLICT_ERROR}
+                continue
+            if url:
+                seen_urls.add(url)
+            seen_fingerprints.add(fields['fingerprint'])
+            new_rows.append((index, fields))
+
+    # Validate updates against the rows that actually exist, keeping their identity
+    # so the fingerprint of a partial update can be recomputed
+    update_ids = [data.get('id') for data in updates if isinstance(data, dict) and isinstance(data.get('id'), int)]
+    current = {}
+    for chunk in chunked(list(set(update_ids))):
+        current.update(
+            (job_id, {'title': title, 'company': company, 'location': location})
+            for job_id, title, company, location in db.session.query(
+                Job.id, Job.title, Job.company, Job.location
+            ).filter(Job.id.in_(chunk))
+        )
+    update_candidates = []
+    for index, data in enumerate(updates):
+        job_id = data.get('id') if isinstance(data, dict) else None
+        if not isinstance(job_id, int):
+            update_results[index] = {'index': index, 'status': 'error', 'error': 'Missing job id'}
+            continue
+        error = field_type_error(data)
+        if error:
+            update_results[index] = {'index': index, 'id': job_id, 'status': 'error', 'error': error}
+            continue
+        fields = clean_job_fields(data)
+        if ('title' in fields and not fields['title']) or ('company' in fields and not fields['company']):
+            update_results[index] = {'index': index, 'id': job_id, 'status': 'error', 'error': 'Missing required fields'}
+            continue
+        if job_id not in current:
+            update_results[index] = {'index': index, 'id': job_id, 'status': 'not_found'}
+            continue
+        if {'title', 'company', 'location'} & fields.keys():
+            identity = {**current[job_id], **{name: fields[name] for name in ('title', 'company', 'location') if name in fields}}
+            current[job_id] = identity
+            fields.update(fingerprint_fields(identity['title'], identity['company'], identity['location']))
+        update_candidates.append((index, job_id, fields))
+
+    # Updates that move a job onto another job's url or fingerprint are conflicts of their own,
+    # rather than failing the whole request at flush. Rows are updated in an order of the
+    # database's choosing, so a key another job holds before the request counts as taken even
+    # if that job is updated away from it or deleted in the same request
+    url_owners = key_owners(db, Job.url, Job, {fields['url'] for _, _, fields in update_candidates if fields.get('url')})
+    fingerprint_owners = key_owners(
+        db, Job.fingerprint, Job, {fields['fingerprint'] for _, _, fields in update_candidates if 'fingerprint' in fields}
+    )
+    # Created rows are inserted first, their keys are taken too
+    for _, fields in new_rows:
+        if fields.get('url'):
+            url_owners[fields['url']] = None
+        fingerprint_owners[fields['fingerprint']] = None
+
+    update_rows = []
+    for index, job_id, fields in update_candidates:
+        url = fields.get('url')
+        fingerprint = fields.get('fingerprint')
+        if (url and url_owners.get(url, job_id) != job_id) or \
+                (fingerprint and fingerprint_owners.get(fingerprint, job_id) != job_id):
+            update_results[index] = {'index': index, 'id': job_id, 'status': 'conflict', 'error': CONFLICT_ERROR}
+            continue
+        if url:
+            url_owners[url] = job_id
+        if fingerprint:
+            fingerprint_owners[fingerprint] = job_id
+        update_rows.append((index, job_id, fields))
+
+    delete_ids = [job_id for job_id in deletes if isinstance(job_id, int)]
+    found_delete_ids = existing_ids(db, Job, set(delete_ids))
+
+    try:
+        if new_rows:
+            # Full column set on every row so they all go out as one executemany batch
+            params = [
+                {name: fields.get(name) for name in WRITABLE_FIELDS if name != 'is_active'}
+                | {'is_active': fields.get('is_active', True), 'fingerprint': fields['fingerprint'], 'simhash': fields['simhash']}
+                for _, fields in new_rows
+            ]
+            if db.engine.dialect.insert_executemany_returning_sort_by_parameter_order:
+                result = db.session.execute(
+                    insert(Job).returning(Job.id, sort_by_parameter_order=True), params
+                )
+                new_ids = [job_id for (job_id,) in result]
+            else:
+                # Backends without executemany RETURNING insert row by row to learn the ids
+                new_ids = [
+                    db.session.execute(insert(Job), row).inserted_primary_key[0] for row in params
+                ]
+            for (index, _), job_id in zip(new_rows, new_ids):
+                create_results[index] = {'index': index, 'id': job_id, 'status': 'created'}
+
+        # ORM bulk UPDATE by primary key groups rows that set the same fields into one executemany
+        writes = [{'id': job_id, **fields} for _, job_id, fields in update_rows if fields]
+        if writes:
+            db.session.execute(update(Job), writes)
+        for index, job_id, _ in update_rows:
+            update_results[index] = {'index': index, 'id': job_id, 'status': 'updated'}
+
+        found_deletes = [job_id for job_id in delete_ids if job_id in found_delete_ids]
+        for chunk in chunked(found_deletes):
+            db.session.execute(delete(Job).where(Job.id.in_(chunk)))
+
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    for index, job_id in enumerate(deletes):
+        if not isinstance(job_id, int):
+            delete_results[index] = {'index': index, 'status': 'error', 'error': 'Job ids must be integers'}
+        elif job_id in found_delete_ids:
+            delete_results[index] = {'index': index, 'id': job_id, 'status': 'deleted'}
+        else:
+            delete_results[index] = {'index': index, 'id': job_id, 'status': 'not_found'}
+
+    logger.info(
+        f"Bulk write applied: {len(new_rows)} created, {len(update_rows)} updated, "
+        f"{len(found_delete_ids)} deleted"
+    )
+    return {'create': create_results, 'update': update_results, 'delete': delete_results}
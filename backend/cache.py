@@ -0,0 +1,153 @@
+import os
+import gzip
+import time
+import hashlib
+import logging
+import threading
+from functools import wraps
+from collections import OrderedDict
+from urllib.parse import urlencode
+from flask import request, make_response
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Number of serialized responses kept in memory
+API_CACHE_SIZE = int(os.environ.get('API_CACHE_SIZE', 256))
+
+# Writes made by other processes (e.g. the scraper leader) can't bump this process's
+# version counter, so entries are also refreshed after this many seconds
+API_CACHE_TTL = int(os.environ.get('API_CACHE_TTL', 30))
+
+# Bodies at least this large are stored gzipped as well for clients that accept it
+GZIP_MIN_SIZE = 1024
+
+class CacheEntry:
+    def __init__(self, version, body, created_at):
+        self.version = version
+        self.body = body
+        self.created_at = created_at
+        self.etag = f'{version}-{hashlib.sha1(body).hexdigest()[:16]}'
+        self.gzipped = gzip.compress(body, compresslevel=6) if len(body) >= GZIP_MIN_SIZE else None
+        # A strong ETag names one exact body, so the gzipped one gets its own
+        self.gzip_etag = f'{self.etag}-gzip'
+
+class ResponseCache:
+    """In-process LRU cache of serialized API responses.
+
+    Entries are tagged with the table version at the time they were built. Any
+    committed write to the tracked table bumps the version, which makes every
+    older entry stale without having to find and evict it.
+    """
+
+    def __init__(self, max_entries=API_CACHE_SIZE, ttl=API_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.version = 0
+        self.lock = threading.Lock()
+        # Called once a write to the tracked table is committed, for other in-memory views of it
+        self.write_listeners = []
+
+    def bump(self):
+        """Invalidate every cached response"""
+        with self.lock:
+            self.version += 1
+
+    def add_write_listener(self, listener):
+        """Call listener with no arguments after each committed session write to the tracked table"""
+        self.write_listeners.append(listener)
+
+    def get(self, key):
+        """Return the fresh entry for key, or None"""
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry.version != self.version or time.monotonic() - entry.created_at > self.ttl:
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return entry
+
+    def put(self, key, version, body):
+        """Store a response body built while the table was at version"""
+        entry = CacheEntry(version, body, time.monotonic())
+        with self.lock:
+            # A write committed while the body was built, it may already be out of date
+            if version != self.version:
+                return entry
+            self.entries[key] = entry
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        return entry
+
+    def cached_json(self, view):
+        """Decorator that serves a JSON view from the cache, answering If-None-Match with 304.
+
+        Only 200 responses are cached. The key is the path plus the sorted
+        query parameters, so equivalent requests share an entry.
+        """
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = f"{request.path}?{urlencode(sorted(request.args.items(multi=True)))}"
+            entry = self.get(key)
+
+            if entry is None:
+                version = self.version
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                entry = self.put(key, version, response.get_data())
+
+            if entry.gzipped is not None and 'gzip' in request.accept_encodings:
+                body, etag = entry.gzipped, entry.gzip_etag
+            else:
+                body, etag = entry.body, entry.etag
+
+            # Revalidation only needs the cache, not the database
+            if request.if_none_match.contains(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(body)
+                if body is entry.gzipped:
+                    response.headers['Content-Encoding'] = 'gzip'
+            response.mimetype = 'application/json'
+            response.set_etag(etag)
+            response.vary.add('Accept-Encoding')
+            return response
+        return wrapper
+
+    def track_writes(self, table_name):
+        """Bump the version whenever a transaction that wrote to table_name commits"""
+        pending = threading.local()
+
+        @event.listens_for(Engine, 'after_execute')
+        def mark_write(conn, clauseelement, multiparams, params, execution_options, result):
+            if isinstance(clauseelement, UpdateBase) and clauseelement.table.name == table_name:
+                conn.info['table_writes'] = True
+
+        @event.listens_for(Engine, 'commit')
+        def before_commit(conn):
+            if conn.info.pop('table_writes', False):
+                # Bump now so nothing cached from here on survives, and again once the
+                # commit is visible in case a reader cached the old rows in between
+                self.bump()
+                pending.bump_after_commit = True
+
+        @event.listens_for(Engine, 'rollback')
+        def discard_writes(conn):
+            conn.info.pop('table_writes', None)
+
+        @event.listens_for(Session, 'after_commit')
+        def after_commit(session):
+            if getattr(pending, 'bump_after_commit', False):
+                pending.bump_after_commit = False
+                self.bump()
+                for listener in self.write_listeners:
+                    listener()
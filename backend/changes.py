@@ -0,0 +1,187 @@
+import os
+import time
+import logging
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import text, func
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Log of job writes whose ids are the change feed's cursor, see JobChange
+CHANGE_TABLE = 'job_change'
+
+# Changes returned per response unless the request asks for fewer
+DEFAULT_CHANGES_LIMIT = 200
+MAX_CHANGES_LIMIT = 1000
+
+# Longest a long-poll request may wait for a change
+MAX_CHANGES_WAIT_SECONDS = 60
+
+# Writes by other processes aren't seen by this one's write listener, so waiting
+# clients also check the log this often (one query per process, however many wait)
+CHANGES_POLL_SECONDS = float(os.environ.get('CHANGES_POLL_SECONDS', 2))
+
+# An event stream is closed after this long so its thread is freed, EventSource
+# clients reconnect on their own and resume from the last event id
+CHANGES_STREAM_SECONDS = int(os.environ.get('CHANGES_STREAM_SECONDS', 300))
+
+# Comment lines sent on an idle event stream so proxies don't drop it
+CHANGES_HEARTBEAT_SECONDS = 15
+
+# Changes older than this are pruned, clients with an older cursor have to reload the list
+CHANGES_RETENTION_DAYS = int(os.environ.get('CHANGES_RETENTION_DAYS', 7))
+
+# Columns whose changes clients see. last_seen_at is rewritten for every job each
+# scrape finds, so updates are only logged when one of these actually changes value
+CHANGE_COLUMNS = ('title', 'company', 'location', 'description', 'url', 'salary', 'posted_date', 'is_active')
+
+_sqlite_changed = ' OR '.join(f'old.{name} IS NOT new.{name}' for name in CHANGE_COLUMNS)
+
+SQLITE_CHANGE_DDL = [
+    f"""CREATE TRIGGER IF NOT EXISTS job_change_ai AFTER INSERT ON job BEGIN
+        INSERT INTO {CHANGE_TABLE}(job_id, changed_at) VALUES (new.id, CURRENT_TIMESTAMP);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS job_change_ad AFTER DELETE ON job BEGIN
+        INSERT INTO {CHANGE_TABLE}(job_id, changed_at) VALUES (old.id, CURRENT_TIMESTAMP);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS job_change_au AFTER UPDATE ON job WHEN {_sqlite_changed} BEGIN
+        INSERT INTO {CHANGE_TABLE}(job_id, changed_at) VALUES (new.id, CURRENT_TIMESTAMP);
+    END""",
+]
+
+_pg_old = ', '.join(f'OLD.{name}' for name in CHANGE_COLUMNS)
+_pg_new = ', '.join(f'NEW.{name}' for name in CHANGE_COLUMNS)
+
+# Sequence values are handed out in insert order but become visible in commit order,
+# so a reader could move its cursor past a change that commits later with a lower id.
+# The transaction lock makes job writers log changes one transaction at a time
+PG_CHANGE_DDL = [
+    f"""CREATE OR REPLACE FUNCTION job_change_log() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'UPDATE' AND ROW({_pg_old}) IS NOT DISTINCT FROM ROW({_pg_new}) THEN
+            RETURN NULL;
+        END IF;
+        PERFORM pg_advisory_xact_lock(hashtext('{CHANGE_TABLE}'));
+        INSERT INTO {CHANGE_TABLE}(job_id, changed_at)
+        VALUES (CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END, now() AT TIME ZONE 'utc');
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql""",
+    "DROP TRIGGER IF EXISTS job_change_log ON job",
+    """CREATE TRIGGER job_change_log AFTER INSERT OR DELETE OR UPDATE ON job
+        FOR EACH ROW EXECUTE FUNCTION job_change_log()""",
+]
+
+# Databases whose job writes are logged, the change table stays empty on others
+CHANGE_LOG_DDL = {'sqlite': SQLITE_CHANGE_DDL, 'postgresql': PG_CHANGE_DDL}
+
+def init_changes(db):
+    """Create the triggers that log job writes to the change table.
+
+    Must run after the job and change tables have been created. On other
+    databases the feed stays empty.
+    """
+    dialect = db.engine.dialect.name
+    statements = CHANGE_LOG_DDL.get(dialect)
+    if statements is None:
+        logger.info(f"No change log triggers available for {dialect}, the change feed will stay empty")
+        return
+
+    try:
+        with db.engine.begin() as conn:
+            for statement in statements:
+                conn.execute(text(statement))
+    except Exception as e:
+        logger.error(f"Error initializing the change log: {e}")
+
+def prune_changes(db, JobChange, retention_days=CHANGES_RETENTION_DAYS):
+    """Delete changes older than the retention period, always keeping the newest so the cursor never goes back"""
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    newest = db.session.query(func.max(JobChange.id)).scalar_subquery()
+    deleted = db.session.query(JobChange).filter(
+        JobChange.changed_at < cutoff, JobChange.id < newest
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return deleted
+
+def change_window(db, JobChange):
+    """(oldest, newest) change id still in the log, (0, 0) when nothing has been logged"""
+    oldest, newest = db.session.query(func.min(JobChange.id), func.max(JobChange.id)).one()
+    return oldest or 0, newest or 0
+
+def read_changes(db, JobChange, since, limit=DEFAULT_CHANGES_LIMIT):
+    """Return the cursor after the next limit changes past since and the ids of the jobs they touched.
+
+    A job written several times is listed once, in the position of its last
+    change, so applying the jobs in order leaves a client with the current rows.
+    """
+    rows = db.session.query(JobChange.id, JobChange.job_id).filter(
+        JobChange.id > since
+    ).order_by(JobChange.id).limit(limit).all()
+    if not rows:
+        return since, []
+    last_change = {}
+    for change_id, job_id in rows:
+        last_change.pop(job_id, None)
+        last_change[job_id] = change_id
+    return rows[-1][0], list(last_change)
+
+class ChangeFeed:
+    """Wakes requests waiting for changes past their cursor.
+
+    Committed job writes in this process call notify (see
+    ResponseCache.add_write_listener). Writes by other processes are found by
+    re-reading the newest change id at most every CHANGES_POLL_SECONDS, shared
+    by all the requests waiting in this process.
+    """
+
+    def __init__(self, db, JobChange, poll_seconds=CHANGES_POLL_SECONDS):
+        self.db = db
+        self.JobChange = JobChange
+        self.poll_seconds = poll_seconds
+        # Newest change id seen and when it was read, None until the next read is due
+        self.newest = 0
+        self.checked_at = None
+        self.condition = threading.Condition()
+
+    def notify(self):
+        """Wake every waiting request to read the log again"""
+        with self.condition:
+            self.checked_at = None
+            self.condition.notify_all()
+
+    def check(self):
+        """Return the newest change id, reading it from the database when the last read is stale.
+
+        The caller is responsible for the app context.
+        """
+        with self.condition:
+            if self.checked_at is not None and time.monotonic() - self.checked_at < self.poll_seconds:
+                return self.newest
+            # Claim the read so the other waiters keep using the current value meanwhile
+            self.checked_at = time.monotonic()
+        try:
+            newest = self.db.session.query(func.max(self.JobChange.id)).scalar() or 0
+        finally:
+            # Don't hold a connection while waiting
+            self.db.session.rollback()
+        with self.condition:
+            if newest > self.newest:
+                self.newest = newest
+                self.condition.notify_all()
+            return self.newest
+
+    def wait(self, since, timeout):
+        """Block until a change past since exists or timeout seconds pass, returning whether one does"""
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.check() > since:
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            with self.condition:
+                # Another waiter may have read a newer id since this one checked
+                if self.newest <= since:
+                    self.condition.wait(min(remaining, self.poll_seconds))
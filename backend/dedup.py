@@ -0,0 +1,206 @@
+import re
+import sys
+import hashlib
+import logging
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Word forms that should compare equal in job titles
+TITLE_ABBREVIATIONS = {
+    'sr': 'senior', 'snr': 'senior',
+    'jr': 'junior', 'jnr': 'junior',
+    'eng': 'engineer', 'engr': 'engineer',
+    'dev': 'developer', 'devs': 'developers',
+    'mgr': 'manager', 'asst': 'assistant', 'assoc': 'associate',
+    'swe': 'software engineer',
+    'ii': '2', 'iii': '3', 'iv': '4'
+}
+
+# Legal suffixes that don't tell companies apart
+COMPANY_SUFFIXES = {
+    'inc', 'incorporated', 'llc', 'llp', 'ltd', 'limited', 'pvt', 'private',
+    'plc', 'corp', 'corporation', 'co', 'company', 'gmbh', 'smc'
+}
+
+# Locations the scraper stores when a card has none
+EMPTY_LOCATIONS = {'', 'not specified', 'n/a'}
+
+# Keeps + and # so C++ and C# stay distinct from C
+TOKEN_SPLIT = re.compile(r'[^a-z0-9+#]+')
+
+SIMHASH_BITS = 64
+
+# SimHash values are split into this many bands for the LSH buckets. Two hashes
+# within SIMHASH_BANDS - 1 bits of each other must agree on at least one band,
+# so comparing within buckets finds every candidate
+SIMHASH_BANDS = 4
+BAND_BITS = SIMHASH_BITS // SIMHASH_BANDS
+
+# Short titles at one company hash only a few bits apart even when they are
+# different roles, e.g. "Frontend Developer" and "Backend Developer" are 4 bits
+# apart, so the hash only proposes candidates. A near duplicate also has to be
+# at the same normalized company and location, and share this much of its title
+# words (intersection over union)
+NEAR_DUPLICATE_DISTANCE = 2
+NEAR_DUPLICATE_OVERLAP = 0.8
+
+def tokens(text):
+    return [token for token in TOKEN_SPLIT.split((text or '').lower()) if token]
+
+def normalize_title(title):
+    """Lowercase a title, drop punctuation and spell out abbreviations like Sr. and Jr."""
+    words = []
+    for token in tokens(title):
+        words.extend(TITLE_ABBREVIATIONS.get(token, token).split())
+    return ' '.join(words)
+
+def normalize_company(company):
+    """Lowercase a company name and drop legal suffixes like Ltd. and (Pvt.)"""
+    words = tokens(company)
+    while len(words) > 1 and words[-1] in COMPANY_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+def normalize_location(location):
+    """Reduce a location to its first part, so 'Lahore, Punjab, Pakistan' matches 'Lahore'"""
+    location = (location or '').strip().lower()
+    if location in EMPTY_LOCATIONS:
+        return ''
+    return ' '.join(tokens(location.split(',')[0]))
+
+def job_fingerprint(title, company, location):
+    """Return the hex digest identifying a job after normalizing its title, company and location"""
+    key = '|'.join((normalize_title(title), normalize_company(company), normalize_location(location)))
+    return hashlib.sha1(key.encode()).hexdigest()
+
+def feature_hash(feature):
+    return int.from_bytes(hashlib.blake2b(feature.encode(), digest_size=8).digest(), 'big')
+
+def to_signed(value):
+    """Map an unsigned 64 bit hash into the range of a signed BIGINT column"""
+    return value - (1 << SIMHASH_BITS) if value >= 1 << (SIMHASH_BITS - 1) else value
+
+def to_unsigned(value):
+    return value & ((1 << SIMHASH_BITS) - 1)
+
+def job_simhash(title, company, location):
+    """Return the SimHash of a job as a signed 64 bit integer.
+
+    Title words and word pairs are weighted features, and the company and
+    location count as single heavy features, so reworded titles at the same
+    company land a few bits apart while other companies land far away.
+    """
+    title_words = normalize_title(title).split()
+    features = {word: 1 for word in title_words}
+    features.update({f'{first} {second}': 1 for first, second in zip(title_words, title_words[1:])})
+    features[f'company={normalize_company(company)}'] = 4
+    features[f'location={normalize_location(location)}'] = 2
+
+    weights = [0] * SIMHASH_BITS
+    for feature, weight in features.items():
+        value = feature_hash(feature)
+        for bit in range(SIMHASH_BITS):
+            weights[bit] += weight if value >> bit & 1 else -weight
+
+    simhash = 0
+    for bit, weight in enumerate(weights):
+        if weight > 0:
+            simhash |= 1 << bit
+    return to_signed(simhash)
+
+def fingerprint_fields(title, company, location):
+    """Return the fingerprint and simhash column values for a job"""
+    return {
+        'fingerprint': job_fingerprint(title, company, location),
+        'simhash': job_simhash(title, company, location)
+    }
+
+def fingerprint_default(context):
+    """Column default filling in the fingerprint of every inserted row, including bulk inserts"""
+    params = context.get_current_parameters()
+    return job_fingerprint(params.get('title'), params.get('company'), params.get('location'))
+
+def simhash_default(context):
+    params = context.get_current_parameters()
+    return job_simhash(params.get('title'), params.get('company'), params.get('location'))
+
+def hamming_distance(first, second):
+    return bin(to_unsigned(first) ^ to_unsigned(second)).count('1')
+
+def near_duplicate_key(title, company, location):
+    """(company, location, title) after normalizing, what a near duplicate is checked against"""
+    # Many jobs share a company and location, interning stores each once in the index
+    return (sys.intern(normalize_company(company)), sys.intern(normalize_location(location)), normalize_title(title))
+
+def title_overlap(first, second):
+    """Share of title words two normalized titles have in common, from 0 to 1"""
+    first, second = set(first.split()), set(second.split())
+    if not first or not second:
+        return 0.0
+    return len(first & second) / len(first | second)
+
+def is_near_duplicate(key, candidate_key):
+    return (
+        key[:2] == candidate_key[:2]
+        and title_overlap(key[2], candidate_key[2]) >= NEAR_DUPLICATE_OVERLAP
+    )
+
+class SimHashIndex:
+    """In-memory LSH index over job SimHashes.
+
+    Each hash is filed under one bucket per band. A lookup only compares
+    against the jobs sharing a bucket with it, instead of every stored job,
+    and a match within max_distance bits still has to pass is_near_duplicate.
+    """
+
+    def __init__(self, max_distance=NEAR_DUPLICATE_DISTANCE):
+        self.max_distance = max_distance
+        self.buckets = {}
+        # Hashes indexed per job id, None for jobs added before they were stored
+        self.hashes = {}
+
+    def bands(self, simhash):
+        value = to_unsigned(simhash)
+        mask = (1 << BAND_BITS) - 1
+        return [(band, value >> (band * BAND_BITS) & mask) for band in range(SIMHASH_BANDS)]
+
+    def add(self, simhash, key, job_id=None):
+        """Index a job by its simhash and near_duplicate_key"""
+        entry = (simhash, key, job_id)
+        for band in self.bands(simhash):
+            self.buckets.setdefault(band, []).append(entry)
+        self.hashes.setdefault(job_id, []).append(simhash)
+
+    def remove(self, job_id):
+        """Drop the entries indexed under a job id, or every unstored job's for None"""
+        for simhash in self.hashes.pop(job_id, ()):
+            for band in self.bands(simhash):
+                entries = [entry for entry in self.buckets.get(band, ()) if entry[2] != job_id]
+                if entries:
+                    self.buckets[band] = entries
+                else:
+                    self.buckets.pop(band, None)
+
+    def find(self, simhash, key):
+        """Return (job_id, distance) of the nearest indexed near duplicate, or None"""
+        best = None
+        for band in self.bands(simhash):
+            for candidate, candidate_key, job_id in self.buckets.get(band, ()):
+                distance = hamming_distance(simhash, candidate)
+                if distance > self.max_distance or (best is not None and distance >= best[1]):
+                    continue
+                if is_near_duplicate(key, candidate_key):
+                    best = (job_id, distance)
+        return best
+
+    def __len__(self):
+        return sum(len(entries) for entries in self.buckets.values()) // SIMHASH_BANDS
+
+def load_simhash_index(db, Job, chunk_size=1000):
+    """Build a SimHashIndex over the stored jobs"""
+    index = SimHashIndex()
+    query = db.session.query(Job.id, Job.simhash, Job.title, Job.company, Job.location).filter(Job.simhash.isnot(None))
+    for job_id, simhash, title, company, location in query.execution_options(yield_per=chunk_size):
+        index.add(simhash, near_duplicate_key(title, company, location), job_id)
+    return index
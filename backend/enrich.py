@@ -0,0 +1,288 @@
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from datetime import datetime, timedelta
+from urllib.parse import urlparse, urlsplit
+from concurrent.futures import ThreadPoolExecutor
+import requests
+import lxml.html
+from sqlalchemy import update
+from scraper import compile_selector, rate_limiter, get_random_user_agent, LINKEDIN_BASE_URL
+from metrics import scrape_stage_seconds, count_selector
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Detail pages fetched at the same time, page loads still go through the scraper's per-host rate limit
+ENRICH_WORKERS = int(os.environ.get('ENRICH_WORKERS', 4))
+
+# Most jobs enriched per run, the ones never fetched or fetched longest ago first
+ENRICH_BATCH_SIZE = int(os.environ.get('ENRICH_BATCH_SIZE', 200))
+
+# A job's detail page is checked again for changes once its last fetch is this old
+ENRICH_REFRESH = timedelta(hours=int(os.environ.get('ENRICH_REFRESH_HOURS', 24)))
+
+# How often the enrichment stage runs, independently of card scraping
+ENRICH_INTERVAL_MINUTES = int(os.environ.get('ENRICH_INTERVAL_MINUTES', 30))
+
+REQUEST_TIMEOUT = 15
+
+# Detail pages are only fetched from the site the scraper reads (and its subdomains, e.g.
+# pk.linkedin.com), never from a link a client entered
+POSTING_HOSTS = {'linkedin.com', urlsplit(LINKEDIN_BASE_URL).hostname}
+
+DESCRIPTION_SELECTORS = [
+    "div.show-more-less-html__markup",
+    "div.description__text",
+    "section.description",
+    "#job-details"
+]
+
+SALARY_SELECTORS = [
+    "div.salary.compensation__salary",
+    ".compensation__salary",
+    ".salary-main-rail__data-body"
+]
+
+POSTED_SELECTORS = ["span.posted-time-ago__text", "span.posted-time-ago__text--new"]
+
+RELATIVE_AGE = re.compile(r'(\d+)\s+(minute|hour|day|week|month)s?\s+ago', re.IGNORECASE)
+AGE_UNITS = {'minute': 60, 'hour': 3600, 'day': 86400, 'week': 7 * 86400, 'month': 30 * 86400}
+
+# One HTTP session per worker thread so connections to the site are reused
+sessions = threading.local()
+
+def get_session():
+    session = getattr(sessions, 'session', None)
+    if session is None:
+        session = requests.Session()
+        session.headers['User-Agent'] = get_random_user_agent()
+        sessions.session = session
+    return session
+
+def block_text(element):
+    """Return an element's text with one line per block, keeping the paragraphs of a description"""
+    lines = (' '.join(text.split()) for text in element.itertext())
+    return '\n'.join(line for line in lines if line)
+
+def first_element(tree, selectors, fallback_list):
+    for selector in selectors:
+        matches = compile_selector(selector)(tree)
+        if matches:
+            count_selector(fallback_list, selector)
+            return matches[0]
+    count_selector(fallback_list, None)
+    return None
+
+def job_posting_data(tree):
+    """Return the schema.org JobPosting embedded in a detail page, or an empty dict"""
+    for script in tree.xpath('//script[@type="application/ld+json"]'):
+        try:
+            data = json.loads(script.text or '')
+        except ValueError:
+            continue
+        if isinstance(data, dict) and data.get('@type') == 'JobPosting':
+            return data
+    return {}
+
+def format_salary(base_salary):
+    """Format a JobPosting baseSalary as e.g. 'PKR 150000-250000/MONTH'"""
+    if not isinstance(base_salary, dict):
+        return None
+    value = base_salary.get('value') or {}
+    if not isinstance(value, dict):
+        value = {'value': value}
+    low = value.get('minValue', value.get('value'))
+    high = value.get('maxValue')
+    if low is None:
+        return None
+    amount = f"{low}-{high}" if high not in (None, low) else f"{low}"
+    unit = value.get('unitText')
+    currency = base_salary.get('currency')
+    return ' '.join(part for part in (currency, amount + (f"/{unit}" if unit else '')) if part)
+
+def parse_posted_date(text, now):
+    """Turn an ISO date or a relative age like '3 days ago' into a datetime"""
+    if not text:
+        return None
+    try:
+        return datetime.fromisoformat(text.strip().replace('Z', '+00:00')).replace(tzinfo=None)
+    except ValueError:
+        pass
+    match = RELATIVE_AGE.search(text)
+    if match:
+        return now - timedelta(seconds=int(match.group(1)) * AGE_UNITS[match.group(2).lower()])
+    return None
+
+def parse_detail_page(page_source, now=None):
+    """Extract description, salary and posted date from a job detail page.
+
+    The embedded JobPosting data is preferred and the visible page is the
+    fallback. Fields that can't be found are None.
+    """
+    now = now or datetime.utcnow()
+    tree = lxml.html.fromstring(page_source)
+    posting = job_posting_data(tree)
+
+    description = None
+    element = first_element(tree, DESCRIPTION_SELECTORS, 'description')
+    if element is not None:
+        description = block_text(element)
+    elif posting.get('description'):
+        description = block_text(lxml.html.fromstring(posting['description']))
+
+    salary = format_salary(posting.get('baseSalary'))
+    if not salary:
+        element = first_element(tree, SALARY_SELECTORS, 'salary')
+        if element is not None:
+            salary = ' '.join(element.text_content().split()) or None
+
+    posted_date = parse_posted_date(posting.get('datePosted'), now)
+    if posted_date is None:
+        element = first_element(tree, POSTED_SELECTORS, 'posted')
+        if element is not None:
+            posted_date = parse_posted_date(element.text_content(), now)
+
+    return {'description': description or None, 'salary': salary, 'posted_date': posted_date}
+
+def content_hash(fields):
+    """Hash the fields read from a detail page, ignoring the markup and tracking noise around them"""
+    posted_date = fields['posted_date'].date().isoformat() if fields['posted_date'] else ''
+    content = '\x1f'.join((fields['description'] or '', fields['salary'] or '', posted_date))
+    return hashlib.sha1(content.encode()).hexdigest()
+
+def is_posting_url(url):
+    """Whether url is a job view page on one of POSTING_HOSTS"""
+    parts = urlsplit(url)
+    host = parts.hostname or ''
+    return parts.scheme in ('http', 'https') and parts.path.startswith('/jobs/view/') and any(
+        host == allowed or host.endswith(f'.{allowed}') for allowed in POSTING_HOSTS
+    )
+
+def fetch_detail(url, cached):
+    """Fetch one detail page, sending the validators from the last fetch.
+
+    Returns a dict with 'status': 'not_modified' when the server answered
+    304, 'unchanged' when the page's content hash matches the last one,
+    'changed' with the parsed 'fields', or 'failed' with an 'error'. URLs
+    that aren't job postings on the scraped site fail without a request.
+    """
+    if not is_posting_url(url):
+        return {'status': 'failed', 'error': "Not a job posting on the scraped site"}
+
+    headers = {}
+    if cached.get('etag'):
+        headers['If-None-Match'] = cached['etag']
+    if cached.get('last_modified'):
+        headers['If-Modified-Since'] = cached['last_modified']
+
+    rate_limiter.acquire(urlparse(url).netloc)
+    try:
+        with scrape_stage_seconds.time(stage='detail_fetch'):
+            response = get_session().get(url, headers=headers, timeout=REQUEST_TIMEOUT)
+    except requests.RequestException as e:
+        return {'status': 'failed', 'error': str(e)}
+
+    if response.status_code == 304:
+        return {'status': 'not_modified'}
+    if response.status_code != 200:
+        return {'status': 'failed', 'error': f"HTTP {response.status_code}"}
+
+    result = {
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified')
+    }
+    try:
+        fields = parse_detail_page(response.text)
+    except Exception as e:
+        return {**result, 'status': 'failed', 'error': f"Could not parse detail page: {e}"}
+
+    result['content_hash'] = content_hash(fields)
+    if result['content_hash'] == cached.get('content_hash'):
+        return {**result, 'status': 'unchanged'}
+    return {**result, 'status': 'changed', 'fields': fields}
+
+def enrich_jobs(db, Job, JobDetail, limit=ENRICH_BATCH_SIZE, max_workers=None):
+    """Fill in description, salary and posted date of jobs from their detail pages.
+
+    Picks up to limit active scraped jobs whose detail page was never
+    fetched or was last fetched more than ENRICH_REFRESH ago, fetches the pages
+    concurrently, and writes back only the jobs whose content changed. The
+    validators and content hash of every fetch are kept in JobDetail so the
+    next run can skip unchanged postings. Returns a dict of counts and
+    timings. The caller is responsible for the app context.
+    """
+    stats = {'fetched': 0, 'not_modified': 0, 'unchanged': 0, 'updated': 0, 'failed': 0, 'timings': {}}
+    cutoff = datetime.utcnow() - ENRICH_REFRESH
+
+    rows = db.session.query(Job.id, Job.url, JobDetail).outerjoin(
+        JobDetail, JobDetail.job_id == Job.id
+    ).filter(
+        # Only scraped postings, jobs entered by hand keep their own fields and their links aren't fetched
+        Job.last_seen_at.isnot(None),
+        Job.url.like('%/jobs/view/%'),
+        Job.is_active.is_(True),
+        db.or_(JobDetail.job_id.is_(None), JobDetail.fetched_at < cutoff)
+    ).order_by(JobDetail.fetched_at.asc().nullsfirst(), Job.id.desc()).limit(limit).all()
+
+    targets = [
+        (job_id, url, {
+            'etag': detail.etag, 'last_modified': detail.last_modified, 'content_hash': detail.content_hash
+        } if detail else {})
+        for job_id, url, detail in rows
+    ]
+    # Don't hold a transaction open while the pages download
+    db.session.rollback()
+    if not targets:
+        return stats
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers or ENRICH_WORKERS, thread_name_prefix='enrich') as executor:
+        results = list(executor.map(lambda target: fetch_detail(target[1], target[2]), targets))
+    stats['timings']['fetch'] = round(time.perf_counter() - started, 3)
+
+    started = time.perf_counter()
+    now = datetime.utcnow()
+    details = {
+        detail.job_id: detail
+        for detail in JobDetail.query.filter(JobDetail.job_id.in_([job_id for job_id, _, _ in targets]))
+    }
+    job_updates = []
+    for (job_id, url, cached), result in zip(targets, results):
+        stats['fetched'] += 1
+        stats[result['status'] if result['status'] != 'changed' else 'updated'] += 1
+
+        detail = details.get(job_id)
+        if detail is None:
+            detail = JobDetail(job_id=job_id)
+            db.session.add(detail)
+        detail.fetched_at = now
+        detail.error = result.get('error')
+        if result['status'] in ('unchanged', 'changed'):
+            detail.etag = result['etag']
+            detail.last_modified = result['last_modified']
+            detail.content_hash = result['content_hash']
+
+        if result['status'] == 'changed':
+            fields = {name: value for name, value in result['fields'].items() if value is not None}
+            if fields:
+                job_updates.append({'id': job_id, **fields})
+        elif result['status'] == 'failed':
+            logger.warning(f"Could not enrich job {job_id} from {url}: {result['error']}")
+
+    db.session.flush()
+    if job_updates:
+        # ORM bulk UPDATE by primary key, rows setting the same fields share one executemany
+        db.session.execute(update(Job), job_updates)
+    db.session.commit()
+    stats['timings']['save'] = round(time.perf_counter() - started, 3)
+
+    logger.info(
+        f"Enriched {stats['fetched']} jobs: {stats['updated']} updated, {stats['unchanged']} unchanged, "
+        f"{stats['not_modified']} not modified, {stats['failed']} failed"
+    )
+    return stats
@@ -0,0 +1,157 @@
+import logging
+from sqlalchemy import text, func
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Summary table holding the number of active jobs per (company, location), see JobFacetCount
+FACET_TABLE = 'job_facet_count'
+
+# Values returned per facet unless the request asks for fewer
+DEFAULT_FACET_LIMIT = 20
+MAX_FACET_LIMIT = 100
+
+# Dialect whose triggers keep the summary table current, None until init_facets or facets_maintained has found them
+_facet_dialect = None
+
+# Queries that find the triggers installed by init_facets, whichever process ran it
+FACET_TRIGGER_SQL = {
+    'sqlite': "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'job_facet_ai'",
+    'postgresql': "SELECT 1 FROM pg_trigger WHERE tgname = 'job_facet_sync' AND NOT tgisinternal",
+}
+
+# Jobs without a location are counted under an empty one, key columns can't be NULL
+SQLITE_FACET_DDL = [
+    f"""CREATE TRIGGER IF NOT EXISTS job_facet_ai AFTER INSERT ON job WHEN new.is_active BEGIN
+        INSERT INTO {FACET_TABLE}(company, location, job_count) VALUES (new.company, coalesce(new.location, ''), 1)
+        ON CONFLICT(company, location) DO UPDATE SET job_count = job_count + 1;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS job_facet_ad AFTER DELETE ON job WHEN old.is_active BEGIN
+        UPDATE {FACET_TABLE} SET job_count = job_count - 1
+        WHERE company = old.company AND location = coalesce(old.location, '');
+        DELETE FROM {FACET_TABLE}
+        WHERE company = old.company AND location = coalesce(old.location, '') AND job_count <= 0;
+    END""",
+    # Updates that don't touch the counted columns, like last_seen_at or enrichment, don't fire it
+    f"""CREATE TRIGGER IF NOT EXISTS job_facet_au AFTER UPDATE OF company, location, is_active ON job BEGIN
+        UPDATE {FACET_TABLE} SET job_count = job_count - 1
+        WHERE old.is_active AND company = old.company AND location = coalesce(old.location, '');
+        DELETE FROM {FACET_TABLE}
+        WHERE old.is_active AND company = old.company AND location = coalesce(old.location, '') AND job_count <= 0;
+        INSERT INTO {FACET_TABLE}(company, location, job_count)
+        SELECT new.company, coalesce(new.location, ''), 1 WHERE new.is_active
+        ON CONFLICT(company, location) DO UPDATE SET job_count = job_count + 1;
+    END""",
+]
+
+PG_FACET_DDL = [
+    f"""CREATE OR REPLACE FUNCTION job_facet_sync() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.is_active THEN
+            UPDATE {FACET_TABLE} SET job_count = job_count - 1
+            WHERE company = OLD.company AND location = coalesce(OLD.location, '');
+            DELETE FROM {FACET_TABLE}
+            WHERE company = OLD.company AND location = coalesce(OLD.location, '') AND job_count <= 0;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.is_active THEN
+            INSERT INTO {FACET_TABLE}(company, location, job_count) VALUES (NEW.company, coalesce(NEW.location, ''), 1)
+            ON CONFLICT (company, location) DO UPDATE SET job_count = {FACET_TABLE}.job_count + 1;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql""",
+    "DROP TRIGGER IF EXISTS job_facet_sync ON job",
+    """CREATE TRIGGER job_facet_sync AFTER INSERT OR DELETE OR UPDATE OF company, location, is_active ON job
+        FOR EACH ROW EXECUTE FUNCTION job_facet_sync()""",
+]
+
+REBUILD_SQL = [
+    f"DELETE FROM {FACET_TABLE}",
+    f"""INSERT INTO {FACET_TABLE}(company, location, job_count)
+        SELECT company, coalesce(location, ''), count(*) FROM job
+        WHERE is_active = :active GROUP BY company, coalesce(location, '')""",
+]
+
+def rebuild_facets(conn):
+    """Recount the summary table from the job table"""
+    for statement in REBUILD_SQL:
+        conn.execute(text(statement), {'active': True})
+
+def init_facets(db):
+    """Create the triggers that keep the facet summary table current, recounting it on first install.
+
+    Must run after the job and summary tables have been created. Databases
+    without supported triggers keep computing facets with GROUP BY.
+    """
+    global _facet_dialect
+    dialect = db.engine.dialect.name
+
+    try:
+        if dialect == 'sqlite':
+            with db.engine.begin() as conn:
+                exists = conn.execute(text(FACET_TRIGGER_SQL['sqlite'])).first()
+                for statement in SQLITE_FACET_DDL:
+                    conn.execute(text(statement))
+                if not exists:
+                    rebuild_facets(conn)
+                    logger.info(f"Built {FACET_TABLE} facet counts")
+        elif dialect == 'postgresql':
+            with db.engine.begin() as conn:
+                exists = conn.execute(text(FACET_TRIGGER_SQL['postgresql'])).first()
+                for statement in PG_FACET_DDL:
+                    conn.execute(text(statement))
+                if not exists:
+                    rebuild_facets(conn)
+                    logger.info(f"Built {FACET_TABLE} facet counts")
+        else:
+            logger.info(f"No facet triggers available for {dialect}, facets will be counted with GROUP BY")
+            return
+        _facet_dialect = dialect
+    except Exception as e:
+        logger.error(f"Error initializing facet counts: {e}")
+
+def facets_maintained(db):
+    """Whether triggers keep the summary table current, checking the database until they are found.
+
+    The caller is responsible for the app context.
+    """
+    global _facet_dialect
+    dialect = db.engine.dialect.name
+    if _facet_dialect is None and dialect in FACET_TRIGGER_SQL:
+        if db.session.execute(text(FACET_TRIGGER_SQL[dialect])).first():
+            _facet_dialect = dialect
+    return _facet_dialect is not None
+
+def top_values(query, value, count, limit):
+    rows = query.with_entities(value, count).group_by(value).order_by(count.desc(), value).limit(limit)
+    return [{'value': name, 'count': total} for name, total in rows]
+
+def summary_facets(db, JobFacetCount, company=None, location=None, limit=DEFAULT_FACET_LIMIT):
+    """Company and location counts of active jobs read from the summary table.
+
+    The filters are applied to the summary rows, one per (company, location)
+    pair, so the cost follows the number of distinct pairs, not jobs.
+    """
+    query = db.session.query(JobFacetCount)
+    if company:
+        query = query.filter(JobFacetCount.company.ilike(f'%{company}%'))
+    if location:
+        query = query.filter(JobFacetCount.location.ilike(f'%{location}%'))
+    count = func.sum(JobFacetCount.job_count)
+    total = query.with_entities(count).scalar() or 0
+    return {
+        'total': total,
+        'company': top_values(query, JobFacetCount.company, count, limit),
+        # Jobs without a location aren't offered as a location to filter on
+        'location': top_values(query.filter(JobFacetCount.location != ''), JobFacetCount.location, count, limit)
+    }
+
+def grouped_facets(query, Job, limit=DEFAULT_FACET_LIMIT):
+    """Company and location counts over a filtered Job query, for filters the summary table can't answer"""
+    count = func.count(Job.id)
+    total = query.with_entities(count).scalar() or 0
+    return {
+        'total': total,
+        'company': top_values(query, Job.company, count, limit),
+        'location': top_values(query.filter(Job.location.isnot(None), Job.location != ''), Job.location, count, limit)
+    }
@@ -0,0 +1,86 @@
+import os
+import uuid
+import socket
+import logging
+from datetime import datetime, timedelta
+from sqlalchemy.exc import IntegrityError
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# How long a lease stays valid without a heartbeat before another process may take it
+LEASE_TTL = timedelta(seconds=int(os.environ.get('SCHEDULER_LEASE_TTL', 60)))
+
+# How often the holder renews its lease, and others check whether it has lapsed
+LEASE_HEARTBEAT_SECONDS = int(os.environ.get('SCHEDULER_LEASE_HEARTBEAT', 15))
+
+class LeaderLease:
+    """Lease row in the database that elects one process to run scheduled work.
+
+    Every process heartbeats the same named lease. The holder extends it, the
+    others take it over once it expires, so if the leader dies another process
+    picks up within LEASE_TTL.
+    """
+
+    def __init__(self, app, db, SchedulerLease, name):
+        self.app = app
+        self.db = db
+        self.SchedulerLease = SchedulerLease
+        self.name = name
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+
+    def heartbeat(self):
+        """Renew the lease if this process holds it, or take it over if it has expired"""
+        SchedulerLease = self.SchedulerLease
+        db = self.db
+        was_leader = self.is_leader
+
+        with self.app.app_context():
+            now = datetime.utcnow()
+            try:
+                # A single conditional UPDATE, so two processes can never both win an expired lease
+                renewed = SchedulerLease.query.filter(
+                    SchedulerLease.name == self.name,
+                    db.or_(SchedulerLease.holder == self.holder, SchedulerLease.expires_at < now)
+                ).update(
+                    {'holder': self.holder, 'expires_at': now + LEASE_TTL},
+                    synchronize_session=False
+                )
+                if not renewed and not db.session.get(SchedulerLease, self.name):
+                    db.session.add(SchedulerLease(name=self.name, holder=self.holder, expires_at=now + LEASE_TTL))
+                    renewed = 1
+                db.session.commit()
+                self.is_leader = bool(renewed)
+            except IntegrityError:
+                # Another process created the lease row first
+                db.session.rollback()
+                self.is_leader = False
+            except Exception as e:
+                db.session.rollback()
+                logger.error(f"Error renewing {self.name} lease: {e}")
+                self.is_leader = False
+
+        if self.is_leader and not was_leader:
+            logger.info(f"{self.holder} is now the leader for {self.name}")
+        elif was_leader and not self.is_leader:
+            logger.warning(f"{self.holder} lost the {self.name} lease")
+        return self.is_leader
+
+    def release(self):
+        """Give up the lease so another process can take over without waiting for it to expire"""
+        if not self.is_leader:
+            return
+        SchedulerLease = self.SchedulerLease
+        with self.app.app_context():
+            try:
+                SchedulerLease.query.filter(
+                    SchedulerLease.name == self.name,
+                    SchedulerLease.holder == self.holder
+                ).update({'expires_at': datetime.utcnow()}, synchronize_session=False)
+                self.db.session.commit()
+                self.is_leader = False
+                logger.info(f"{self.holder} released the {self.name} lease")
+            except Exception as e:
+                self.db.session.rollback()
+                logger.error(f"Error releasing {self.name} lease: {e}")
@@ -1,12 +1,12 @@
-from app import app, db, init_scheduler
+from app import app, db, init_scheduler, get_scrape_worker, suggest_index, init_database_objects
 import os
-from scraper import scrape_and_save
-from app import Job
 
 def create_db():
     """Create the database tables if they don't exist"""
     with app.app_context():
         db.create_all()
+        init_database_objects()
+        suggest_index.refresh()
         print("Database tables created")
 
 def main():
@@ -14,15 +14,15 @@ def main():
     # Create database tables
     create_db()
     
-    # Run scraper immediately at startup
-    with app.app_context():
-        print("Running initial scrape...")
-        scrape_and_save(db, Job, app)
-        print("Initial scrape completed")
-    
     # Initialize the scheduler for regular scraping
     with app.app_context():
-        init_scheduler()
+        lease = init_scheduler()
+    
+    # Queue a scrape immediately at startup, it runs in the background while the server starts.
+    # Only the lease holder scrapes, the others leave it to the leader's scheduled runs
+    if lease is not None and lease.heartbeat():
+        run, _ = get_scrape_worker().submit('startup')
+        print(f"Queued initial scrape run {run['id']}")
     
     # Run the Flask application
     port = int(os.environ.get("PORT", 5000))
@@ -0,0 +1,165 @@
+import time
+import threading
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Upper bounds in seconds of the latency histogram buckets, from sub-millisecond
+# card extraction up to browser startup and slow page loads
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def format_labels(names, values, extra=()):
+    pairs = [f'{name}="{escape_label(value)}"' for name, value in list(zip(names, values)) + list(extra)]
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    """Monotonic count per combination of label values"""
+
+    kind = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def samples(self):
+        with self.lock:
+            values = sorted(self.values.items())
+        for key, value in values:
+            yield self.name, format_labels(self.labelnames, key), value
+
+class Histogram:
+    """Distribution of observed durations per combination of label values.
+
+    Each observation is one bisect and a few additions under a lock, so it
+    is cheap enough to record on every request and every card.
+    """
+
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Label values -> [count per bucket (not cumulative) plus overflow, sum]
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(labels[name] for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            state = self.values.get(key)
+            if state is None:
+                state = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the time spent in a with block, including when it raises"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def samples(self):
+        with self.lock:
+            values = sorted((key, (list(counts), total)) for key, (counts, total) in self.values.items())
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                yield (f'{self.name}_bucket',
+                       format_labels(self.labelnames, key, [('le', format_value(float(bound)))]), cumulative)
+            yield f'{self.name}_sum', format_labels(self.labelnames, key), total
+            yield f'{self.name}_count', format_labels(self.labelnames, key), cumulative
+
+class MetricsRegistry:
+    """The metrics of this process, rendered in the Prometheus text format"""
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def register(self, metric):
+        with self.lock:
+            if metric.name in self.metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self.metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self.register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self):
+        with self.lock:
+            metrics = list(self.metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.kind}')
+            for name, labels, value in metric.samples():
+                lines.append(f'{name}{labels} {format_value(value)}')
+        return '\n'.join(lines) + '\n'
+
+# Shared by every module of the process, served by /api/metrics
+registry = MetricsRegistry()
+
+scrape_stage_seconds = registry.histogram(
+    'scraper_stage_seconds',
+    'Time spent in each stage of scraping, extract_card is observed once per card',
+    ('stage',)
+)
+
+rate_limit_wait_seconds = registry.histogram(
+    'scraper_rate_limit_wait_seconds',
+    'Time page loads waited for the per-host rate limit',
+    ('host',)
+)
+
+selector_hits = registry.counter(
+    'scraper_selector_hits_total',
+    'Lookups answered by each selector of a fallback selector list',
+    ('list', 'selector')
+)
+
+selector_misses = registry.counter(
+    'scraper_selector_misses_total',
+    'Lookups for which no selector of a fallback selector list matched',
+    ('list',)
+)
+
+scraped_jobs = registry.counter(
+    'scraper_jobs_total',
+    'Jobs handled by scrape runs, by outcome',
+    ('outcome',)
+)
+
+def count_selector(fallback_list, selector):
+    """Count which selector of a fallback list matched, or a miss when selector is None"""
+    if selector is None:
+        selector_misses.inc(list=fallback_list)
+    else:
+        selector_hits.inc(list=fallback_list, selector=selector)
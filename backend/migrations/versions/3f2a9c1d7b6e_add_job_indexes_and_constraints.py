@@ -0,0 +1,80 @@
+"""add job indexes and constraints
+
+Revision ID: 3f2a9c1d7b6e
+Revises:
+Create Date: 2026-10-17 06:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c1d7b6e'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def existing_indexes(table):
+    return {index['name'] for index in sa.inspect(op.get_bind()).get_indexes(table)}
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    # Databases set up before migrations were introduced got their tables from db.create_all()
+    if 'job' not in sa.inspect(bind).get_table_names():
+        op.create_table(
+            'job',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('title', sa.String(length=200), nullable=False),
+            sa.Column('company', sa.String(length=100), nullable=False),
+            sa.Column('location', sa.String(length=100), nullable=True),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('url', sa.String(length=500), nullable=True),
+            sa.Column('salary', sa.String(length=100), nullable=True),
+            sa.Column('posted_date', sa.DateTime(), nullable=True),
+            sa.Column('is_active', sa.Boolean(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    # Rows saved before the unique keys existed: placeholder urls become NULL and
+    # duplicates are removed, keeping the oldest row of each
+    op.execute("UPDATE job SET url = NULL WHERE url IN ('', 'N/A')")
+    op.execute(
+        "DELETE FROM job WHERE url IS NOT NULL AND id NOT IN ("
+        " SELECT id FROM (SELECT MIN(id) AS id FROM job WHERE url IS NOT NULL GROUP BY url) AS keep_url"
+        ")"
+    )
+    op.execute(
+        "DELETE FROM job WHERE location IS NOT NULL AND id NOT IN ("
+        " SELECT id FROM (SELECT MIN(id) AS id FROM job WHERE location IS NOT NULL"
+        " GROUP BY title, company, location) AS keep_key"
+        ")"
+    )
+
+    # db.create_all() on a fresh database already builds these from the model
+    indexes = existing_indexes('job')
+    # Same predicate as the model's Job.is_active.is_(True), the planner only uses a
+    # partial index when the query's WHERE clause matches it
+    active = sa.text('is_active IS true') if bind.dialect.name == 'postgresql' else sa.text('is_active IS 1')
+
+    if 'ix_job_posted_date_id' not in indexes:
+        op.create_index('ix_job_posted_date_id', 'job', [sa.text('posted_date DESC'), sa.text('id DESC')])
+    if 'ix_job_active_posted_date_id' not in indexes:
+        op.create_index(
+            'ix_job_active_posted_date_id', 'job', [sa.text('posted_date DESC'), sa.text('id DESC')],
+            sqlite_where=active, postgresql_where=active
+        )
+    if 'ux_job_url' not in indexes:
+        op.create_index('ux_job_url', 'job', ['url'], unique=True)
+    if 'ux_job_title_company_location' not in indexes:
+        op.create_index('ux_job_title_company_location', 'job', ['title', 'company', 'location'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ux_job_title_company_location', table_name='job')
+    op.drop_index('ux_job_url', table_name='job')
+    op.drop_index('ix_job_active_posted_date_id', table_name='job')
+    op.drop_index('ix_job_posted_date_id', table_name='job')
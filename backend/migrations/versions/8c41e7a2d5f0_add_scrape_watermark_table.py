@@ -0,0 +1,34 @@
+"""add scrape watermark table
+
+Revision ID: 8c41e7a2d5f0
+Revises: 3f2a9c1d7b6e
+Create Date: 2026-10-17 07:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c41e7a2d5f0'
+down_revision = '3f2a9c1d7b6e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() on a fresh database already builds it from the model
+    if 'scrape_watermark' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'scrape_watermark',
+        sa.Column('search', sa.String(length=200), nullable=False),
+        sa.Column('location', sa.String(length=100), nullable=False),
+        sa.Column('newest_url', sa.String(length=500), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('search', 'location')
+    )
+
+
+def downgrade():
+    op.drop_table('scrape_watermark')
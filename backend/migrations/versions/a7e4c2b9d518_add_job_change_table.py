@@ -0,0 +1,45 @@
+"""add job change table
+
+Revision ID: a7e4c2b9d518
+Revises: f3b86d1c9a47
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7e4c2b9d518'
+down_revision = 'f3b86d1c9a47'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() on a fresh database already builds it from the model. The triggers
+    # that fill it in are installed by init_changes at startup
+    if 'job_change' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'job_change',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('changed_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sqlite_autoincrement=True
+    )
+    op.create_index('ix_job_change_changed_at', 'job_change', ['changed_at'])
+
+
+def downgrade():
+    # The triggers write to the table, so they have to go first or every job write would fail
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        for trigger in ('job_change_ai', 'job_change_ad', 'job_change_au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    elif bind.dialect.name == 'postgresql':
+        op.execute('DROP TRIGGER IF EXISTS job_change_log ON job')
+        op.execute('DROP FUNCTION IF EXISTS job_change_log()')
+    op.drop_index('ix_job_change_changed_at', table_name='job_change')
+    op.drop_table('job_change')
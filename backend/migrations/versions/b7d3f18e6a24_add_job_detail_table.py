@@ -0,0 +1,39 @@
+"""add job detail table
+
+Revision ID: b7d3f18e6a24
+Revises: 8c41e7a2d5f0
+Create Date: 2026-10-17 08:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d3f18e6a24'
+down_revision = '8c41e7a2d5f0'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() on a fresh database already builds it from the model
+    if 'job_detail' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'job_detail',
+        sa.Column('job_id', sa.Integer(), nullable=False),
+        sa.Column('etag', sa.String(length=200), nullable=True),
+        sa.Column('last_modified', sa.String(length=100), nullable=True),
+        sa.Column('content_hash', sa.String(length=40), nullable=True),
+        sa.Column('fetched_at', sa.DateTime(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['job_id'], ['job.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('job_id')
+    )
+    op.create_index('ix_job_detail_fetched_at', 'job_detail', ['fetched_at'])
+
+
+def downgrade():
+    op.drop_index('ix_job_detail_fetched_at', table_name='job_detail')
+    op.drop_table('job_detail')
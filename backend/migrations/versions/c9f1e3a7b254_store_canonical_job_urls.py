@@ -0,0 +1,68 @@
+"""store canonical job urls
+
+Revision ID: c9f1e3a7b254
+Revises: a7e4c2b9d518
+Create Date: 2026-10-17 16:00:00.000000
+
+"""
+from urllib.parse import urlsplit, urlunsplit
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9f1e3a7b254'
+down_revision = 'a7e4c2b9d518'
+branch_labels = None
+depends_on = None
+
+BACKFILL_CHUNK_SIZE = 1000
+
+
+def canonical_job_url(url):
+    """scraper.canonical_job_url as of this revision, kept here so later changes don't alter the migration"""
+    if not url or url == 'N/A':
+        return None
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path.rstrip('/'), '', ''))
+
+
+def upgrade():
+    bind = op.get_bind()
+    job = sa.table('job', sa.column('id', sa.Integer), sa.column('url', sa.String))
+    job_detail = sa.table('job_detail', sa.column('job_id', sa.Integer))
+
+    # Scraped jobs were stored under the link on their card, tracking parameters and all.
+    # Only job view pages are the scraper's, links on jobs added by hand are left as they are
+    rows = bind.execute(
+        sa.select(job.c.id, job.c.url).where(job.c.url.like('%/jobs/view/%')).order_by(job.c.id)
+    ).all()
+
+    # The same posting saved more than once, under different tracking parameters or once
+    # already canonical, is one job. Oldest first, so the oldest row is the one kept
+    seen = set()
+    updates = []
+    duplicates = []
+    for job_id, url in rows:
+        canonical = canonical_job_url(url)
+        if canonical in seen:
+            duplicates.append(job_id)
+            continue
+        seen.add(canonical)
+        if canonical != url:
+            updates.append({'job_id': job_id, 'canonical_url': canonical})
+
+    # Duplicates go first, one of them may hold the URL a kept row is about to take
+    update = job.update().where(job.c.id == sa.bindparam('job_id')).values(url=sa.bindparam('canonical_url'))
+    for start in range(0, len(duplicates), BACKFILL_CHUNK_SIZE):
+        chunk = duplicates[start:start + BACKFILL_CHUNK_SIZE]
+        bind.execute(job_detail.delete().where(job_detail.c.job_id.in_(chunk)))
+        bind.execute(job.delete().where(job.c.id.in_(chunk)))
+    for start in range(0, len(updates), BACKFILL_CHUNK_SIZE):
+        bind.execute(update, updates[start:start + BACKFILL_CHUNK_SIZE])
+
+
+def downgrade():
+    # The tracking parameters weren't kept, the canonical URLs still lead to the same postings
+    pass
@@ -0,0 +1,70 @@
+"""add job fingerprint
+
+Revision ID: d2a95c4e8b13
+Revises: b7d3f18e6a24
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from dedup import fingerprint_fields
+
+
+# revision identifiers, used by Alembic.
+revision = 'd2a95c4e8b13'
+down_revision = 'b7d3f18e6a24'
+branch_labels = None
+depends_on = None
+
+BACKFILL_CHUNK_SIZE = 1000
+
+
+def upgrade():
+    bind = op.get_bind()
+    columns = {column['name'] for column in sa.inspect(bind).get_columns('job')}
+
+    # db.create_all() on a fresh database already builds them from the model
+    if 'fingerprint' not in columns:
+        op.add_column('job', sa.Column('fingerprint', sa.String(length=40), nullable=True))
+    if 'simhash' not in columns:
+        op.add_column('job', sa.Column('simhash', sa.BigInteger(), nullable=True))
+
+    job = sa.table(
+        'job',
+        sa.column('id', sa.Integer), sa.column('title', sa.String), sa.column('company', sa.String),
+        sa.column('location', sa.String), sa.column('fingerprint', sa.String), sa.column('simhash', sa.BigInteger)
+    )
+
+    # Rows saved before the fingerprint existed, oldest first so the first of each fingerprint is kept
+    rows = bind.execute(
+        sa.select(job.c.id, job.c.title, job.c.company, job.c.location)
+        .where(job.c.fingerprint.is_(None)).order_by(job.c.id)
+    ).all()
+    seen = set(bind.execute(sa.select(job.c.fingerprint).where(job.c.fingerprint.isnot(None))).scalars())
+    updates = []
+    duplicates = []
+    for job_id, title, company, location in rows:
+        fields = fingerprint_fields(title, company, location)
+        if fields['fingerprint'] in seen:
+            duplicates.append(job_id)
+            continue
+        seen.add(fields['fingerprint'])
+        updates.append({'job_id': job_id, **fields})
+
+    update = job.update().where(job.c.id == sa.bindparam('job_id')).values(
+        fingerprint=sa.bindparam('fingerprint'), simhash=sa.bindparam('simhash')
+    )
+    for start in range(0, len(updates), BACKFILL_CHUNK_SIZE):
+        bind.execute(update, updates[start:start + BACKFILL_CHUNK_SIZE])
+    for start in range(0, len(duplicates), BACKFILL_CHUNK_SIZE):
+        bind.execute(job.delete().where(job.c.id.in_(duplicates[start:start + BACKFILL_CHUNK_SIZE])))
+
+    if 'ux_job_fingerprint' not in {index['name'] for index in sa.inspect(bind).get_indexes('job')}:
+        op.create_index('ux_job_fingerprint', 'job', ['fingerprint'], unique=True)
+
+
+def downgrade():
+    op.drop_index('ux_job_fingerprint', table_name='job')
+    op.drop_column('job', 'simhash')
+    op.drop_column('job', 'fingerprint')
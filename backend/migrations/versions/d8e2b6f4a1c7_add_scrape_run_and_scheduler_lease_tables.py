@@ -0,0 +1,62 @@
+"""add scrape run and scheduler lease tables
+
+Revision ID: d8e2b6f4a1c7
+Revises: c9f1e3a7b254
+Create Date: 2026-10-17 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd8e2b6f4a1c7'
+down_revision = 'c9f1e3a7b254'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    tables = sa.inspect(bind).get_table_names()
+
+    # Databases that ran db.create_all() already have these, possibly from before the
+    # scrape run counted deactivated jobs
+    if 'scrape_run' not in tables:
+        op.create_table(
+            'scrape_run',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('trigger', sa.String(length=20), nullable=False),
+            sa.Column('status', sa.String(length=20), nullable=False),
+            sa.Column('queued_at', sa.DateTime(), nullable=True),
+            sa.Column('started_at', sa.DateTime(), nullable=True),
+            sa.Column('finished_at', sa.DateTime(), nullable=True),
+            sa.Column('terms_done', sa.Integer(), nullable=True),
+            sa.Column('terms_total', sa.Integer(), nullable=True),
+            sa.Column('jobs_scraped', sa.Integer(), nullable=True),
+            sa.Column('jobs_added', sa.Integer(), nullable=True),
+            sa.Column('jobs_skipped', sa.Integer(), nullable=True),
+            sa.Column('jobs_deactivated', sa.Integer(), nullable=True),
+            sa.Column('timings', sa.JSON(), nullable=True),
+            sa.Column('error', sa.Text(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+    elif 'jobs_deactivated' not in {column['name'] for column in sa.inspect(bind).get_columns('scrape_run')}:
+        op.add_column('scrape_run', sa.Column('jobs_deactivated', sa.Integer(), nullable=True))
+    if 'ix_scrape_run_status' not in {index['name'] for index in sa.inspect(bind).get_indexes('scrape_run')}:
+        op.create_index('ix_scrape_run_status', 'scrape_run', ['status'])
+
+    if 'scheduler_lease' not in tables:
+        op.create_table(
+            'scheduler_lease',
+            sa.Column('name', sa.String(length=100), nullable=False),
+            sa.Column('holder', sa.String(length=200), nullable=False),
+            sa.Column('expires_at', sa.DateTime(), nullable=False),
+            sa.PrimaryKeyConstraint('name')
+        )
+
+
+def downgrade():
+    op.drop_table('scheduler_lease')
+    op.drop_index('ix_scrape_run_status', table_name='scrape_run')
+    op.drop_table('scrape_run')
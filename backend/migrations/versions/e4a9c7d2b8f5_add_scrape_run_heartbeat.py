@@ -0,0 +1,27 @@
+"""add scrape run heartbeat
+
+Revision ID: e4a9c7d2b8f5
+Revises: d8e2b6f4a1c7
+Create Date: 2026-10-17 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4a9c7d2b8f5'
+down_revision = 'd8e2b6f4a1c7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() on a fresh database already builds it from the model
+    columns = {column['name'] for column in sa.inspect(op.get_bind()).get_columns('scrape_run')}
+    if 'heartbeat_at' not in columns:
+        op.add_column('scrape_run', sa.Column('heartbeat_at', sa.DateTime(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('scrape_run', 'heartbeat_at')
@@ -0,0 +1,56 @@
+"""add job last seen at
+
+Revision ID: e5c17b9a3f62
+Revises: d2a95c4e8b13
+Create Date: 2026-10-17 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5c17b9a3f62'
+down_revision = 'd2a95c4e8b13'
+branch_labels = None
+depends_on = None
+
+
+def existing_columns(table):
+    return {column['name'] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    # db.create_all() on a fresh database already builds these from the model
+    if 'last_seen_at' not in existing_columns('job'):
+        op.add_column('job', sa.Column('last_seen_at', sa.DateTime(), nullable=True))
+        # Count scraped jobs as last seen when they were posted. Jobs added by hand can carry a
+        # link too, only job view pages are the scraper's, the rest stay NULL and are never swept
+        op.execute("UPDATE job SET last_seen_at = posted_date WHERE url LIKE '%/jobs/view/%'")
+    if 'full_scan_at' not in existing_columns('scrape_watermark'):
+        op.add_column('scrape_watermark', sa.Column('full_scan_at', sa.DateTime(), nullable=True))
+
+    # The partial indexes need the exact predicate the queries use, Job.is_active.is_(True),
+    # for the planner to pick them. Databases upgraded by an earlier 3f2a9c1d7b6e have the
+    # active listing index built as is_active = 1, so it is rebuilt
+    active = sa.text('is_active IS true') if bind.dialect.name == 'postgresql' else sa.text('is_active IS 1')
+    indexes = {index['name'] for index in sa.inspect(bind).get_indexes('job')}
+    if 'ix_job_active_posted_date_id' in indexes:
+        op.drop_index('ix_job_active_posted_date_id', table_name='job')
+    op.create_index(
+        'ix_job_active_posted_date_id', 'job', [sa.text('posted_date DESC'), sa.text('id DESC')],
+        sqlite_where=active, postgresql_where=active
+    )
+    if 'ix_job_active_last_seen_at' not in indexes:
+        op.create_index(
+            'ix_job_active_last_seen_at', 'job', ['last_seen_at'],
+            sqlite_where=active, postgresql_where=active
+        )
+
+
+def downgrade():
+    op.drop_index('ix_job_active_last_seen_at', table_name='job')
+    op.drop_column('scrape_watermark', 'full_scan_at')
+    op.drop_column('job', 'last_seen_at')
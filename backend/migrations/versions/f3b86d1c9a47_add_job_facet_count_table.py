@@ -0,0 +1,42 @@
+"""add job facet count table
+
+Revision ID: f3b86d1c9a47
+Revises: e5c17b9a3f62
+Create Date: 2026-10-17 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3b86d1c9a47'
+down_revision = 'e5c17b9a3f62'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # db.create_all() on a fresh database already builds it from the model. The triggers
+    # that maintain it are installed by init_facets at startup, which also fills it in
+    if 'job_facet_count' in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        'job_facet_count',
+        sa.Column('company', sa.String(length=100), nullable=False),
+        sa.Column('location', sa.String(length=100), nullable=False),
+        sa.Column('job_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('company', 'location')
+    )
+
+
+def downgrade():
+    # The triggers write to the table, so they have to go first or every job write would fail
+    bind = op.get_bind()
+    if bind.dialect.name == 'sqlite':
+        for trigger in ('job_facet_ai', 'job_facet_ad', 'job_facet_au'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+    elif bind.dialect.name == 'postgresql':
+        op.execute('DROP TRIGGER IF EXISTS job_facet_sync ON job')
+        op.execute('DROP FUNCTION IF EXISTS job_facet_sync()')
+    op.drop_table('job_facet_count')
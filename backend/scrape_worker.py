@@ -0,0 +1,148 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from concurrent.futures import ThreadPoolExecutor
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Runs waiting for or holding the worker
+ACTIVE_STATUSES = ('queued', 'running')
+
+# How often a running scrape refreshes its heartbeat
+RUN_HEARTBEAT_INTERVAL = timedelta(minutes=1)
+
+# An active run without a heartbeat for this long was left behind by a process that died,
+# not a slow scrape. Queued runs, which have no heartbeat yet, count from when they were queued
+STALE_RUN_AGE = timedelta(minutes=10)
+
+class ScrapeWorker:
+    """Runs scrapes one at a time on a dedicated thread, outside of any HTTP request.
+
+    Every run is recorded as a ScrapeRun row so its progress can be polled.
+    A trigger that arrives while a run is queued or running is coalesced into
+    that run instead of starting another one.
+    """
+
+    def __init__(self, app, db, Job, ScrapeRun, ScrapeWatermark=None, JobChange=None):
+        self.app = app
+        self.db = db
+        self.Job = Job
+        self.ScrapeRun = ScrapeRun
+        # Given the watermark model, runs only extract jobs newer than the last run's
+        self.ScrapeWatermark = ScrapeWatermark
+        # Given the change log model, runs catch up on stored jobs from it instead of reloading them
+        self.JobChange = JobChange
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='scrape-worker')
+        self.lock = threading.Lock()
+
+    def submit(self, trigger):
+        """Queue a scrape run, returning (run, created) where created is False if it was coalesced"""
+        ScrapeRun = self.ScrapeRun
+        with self.app.app_context(), self.lock:
+            self.expire_stale_runs()
+            active = ScrapeRun.query.filter(ScrapeRun.status.in_(ACTIVE_STATUSES)).order_by(ScrapeRun.id.desc()).first()
+            if active:
+                logger.info(f"Scrape run {active.id} is already {active.status}, coalescing {trigger} trigger")
+                return active.to_dict(), False
+
+            run = ScrapeRun(trigger=trigger)
+            self.db.session.add(run)
+            self.db.session.commit()
+            self.executor.submit(self.execute, run.id)
+            logger.info(f"Queued scrape run {run.id} ({trigger})")
+            return run.to_dict(), True
+
+    def expire_stale_runs(self):
+        """Fail active runs abandoned by a crashed process so they stop absorbing new triggers"""
+        ScrapeRun = self.ScrapeRun
+        cutoff = datetime.utcnow() - STALE_RUN_AGE
+        stale = ScrapeRun.query.filter(
+            ScrapeRun.status.in_(ACTIVE_STATUSES),
+            func.coalesce(ScrapeRun.heartbeat_at, ScrapeRun.queued_at) < cutoff
+        ).all()
+        for run in stale:
+            run.status = 'failed'
+            run.error = 'Abandoned by a worker that stopped'
+            run.finished_at = datetime.utcnow()
+        if stale:
+            self.db.session.commit()
+
+    def update_run(self, run_id, status, values):
+        """Update a run only while it is still in the given status, returning whether it was.
+
+        A run expired as abandoned stays failed, rather than being picked up or
+        overwritten by a worker that turns out to be alive after all.
+        """
+        ScrapeRun = self.ScrapeRun
+        updated = ScrapeRun.query.filter(ScrapeRun.id == run_id, ScrapeRun.status == status).update(
+            values, synchronize_session=False
+        )
+        self.db.session.commit()
+        return bool(updated)
+
+    def beat(self, run_id, stop):
+        """Refresh a running scrape's heartbeat until it finishes or is expired"""
+        while not stop.wait(RUN_HEARTBEAT_INTERVAL.total_seconds()):
+            with self.app.app_context():
+                try:
+                    if not self.update_run(run_id, 'running', {'heartbeat_at': datetime.utcnow()}):
+                        return
+                except Exception as e:
+                    self.db.session.rollback()
+                    logger.error(f"Error refreshing the heartbeat of scrape run {run_id}: {e}")
+
+    def execute(self, run_id):
+        """Run a queued scrape and record its progress, counts and timings"""
+        from scraper import scrape_and_save
+
+        db = self.db
+        with self.app.app_context():
+            started_at = datetime.utcnow()
+            if not self.update_run(run_id, 'queued', {'status': 'running', 'started_at': started_at, 'heartbeat_at': started_at}):
+                logger.warning(f"Scrape run {run_id} is no longer queued, skipping it")
+                return
+
+            # The heartbeat runs on its own thread, the scrape can spend minutes without reporting progress
+            stop = threading.Event()
+            heartbeat = threading.Thread(target=self.beat, args=(run_id, stop), name=f'scrape-run-{run_id}-heartbeat', daemon=True)
+            heartbeat.start()
+
+            def on_progress(terms_done, terms_total):
+                self.update_run(run_id, 'running', {
+                    'terms_done': terms_done,
+                    'terms_total': terms_total,
+                    'heartbeat_at': datetime.utcnow()
+                })
+
+            try:
+                stats = scrape_and_save(
+                    db, self.Job, on_progress=on_progress, ScrapeWatermark=self.ScrapeWatermark, JobChange=self.JobChange
+                )
+            except Exception as e:
+                logger.error(f"Error in scrape run {run_id}: {e}")
+                stats = {'error': str(e)}
+            finally:
+                stop.set()
+                heartbeat.join()
+
+            # Start from a clean transaction in case the scrape left a failed one behind
+            db.session.rollback()
+            error = stats.get('error')
+            status = 'failed' if error else 'succeeded'
+            finished_at = datetime.utcnow()
+            recorded = self.update_run(run_id, 'running', {
+                'jobs_scraped': stats.get('jobs_scraped', 0),
+                'jobs_added': stats.get('jobs_added', 0),
+                'jobs_skipped': stats.get('jobs_skipped', 0),
+                'jobs_deactivated': stats.get('jobs_deactivated', 0),
+                'timings': stats.get('timings', {}),
+                'error': error,
+                'status': status,
+                'finished_at': finished_at
+            })
+            if not recorded:
+                logger.warning(f"Scrape run {run_id} was expired before it finished, leaving it failed")
+                return
+            logger.info(f"Scrape run {run_id} {status} in {(finished_at - started_at).total_seconds():.1f}s")
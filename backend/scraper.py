@@ -1,7 +1,17 @@
+import os
 import time
+import atexit
 import logging
+import threading
 import random
-from datetime import datetime
+from functools import lru_cache
+from urllib.parse import urljoin, urlparse, urlsplit, urlunsplit
+from concurrent.futures import ThreadPoolExecutor
+import lxml.html
+from lxml import etree
+from cssselect import HTMLTranslator
+from sqlalchemy import update, case, and_
+from datetime import datetime, timedelta
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -9,7 +19,10 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
+from browser import BrowserPool, BROWSER_KEEP_WARM, resolve_driver_path
+from dedup import job_fingerprint, fingerprint_fields, near_duplicate_key, SimHashIndex
+from changes import CHANGE_LOG_DDL, change_window, read_changes
+from metrics import scrape_stage_seconds, rate_limit_wait_seconds, scraped_jobs, count_selector
 
 # Set up logging
 logging.basicConfig(level=logging.INFO, 
@@ -30,6 +43,112 @@ USER_AGENTS = [
     'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.4 Safari/605.1.15'
 ]
 
+# Base URL of the job search site, override to point the scraper at a local fixture server
+LINKEDIN_BASE_URL = os.environ.get('LINKEDIN_BASE_URL', 'https://www.linkedin.com')
+
+# Number of headless browsers scraping search terms concurrently
+SCRAPER_WORKERS = int(os.environ.get('SCRAPER_WORKERS', 3))
+
+# How job cards are read: 'page_source' parses one HTML snapshot per page with lxml,
+# 'selenium' queries every card field through the WebDriver
+EXTRACTION_MODE = os.environ.get('SCRAPER_EXTRACTION_MODE', 'page_source')
+
+# Page loads allowed per second to each host, and how many may go out back to back
+SCRAPER_RATE_PER_SECOND = float(os.environ.get('SCRAPER_RATE_PER_SECOND', 0.5))
+SCRAPER_BURST = int(os.environ.get('SCRAPER_BURST', 1))
+
+# Known cards in a row after which the rest of a newest-first results page is assumed known too
+KNOWN_CARDS_TO_STOP = int(os.environ.get('SCRAPER_KNOWN_CARDS_TO_STOP', 5))
+
+# Results are harvested per term for up to this many loads (the first page plus scrolls,
+# "see more" presses or next pages) or until this many cards have been read
+SCRAPER_MAX_PAGES = int(os.environ.get('SCRAPER_MAX_PAGES', 5))
+SCRAPER_MAX_CARDS = int(os.environ.get('SCRAPER_MAX_CARDS', 250))
+
+# Scrolls without new cards before the results count as exhausted
+LOAD_MORE_ATTEMPTS = 2
+
+# Each term is read to its full depth, ignoring its watermark, at least this often, so
+# jobs further down the results are still seen by incremental runs
+FULL_SCAN_INTERVAL = timedelta(hours=int(os.environ.get('SCRAPER_FULL_SCAN_HOURS', 24)))
+
+# Scraped jobs no run has seen listed for this long are deactivated
+STALE_AFTER = timedelta(days=int(os.environ.get('SCRAPER_STALE_AFTER_DAYS', 7)))
+
+# Longest we wait for results to appear and for the card list to stop growing
+PAGE_READY_TIMEOUT = 10
+
+# The card list counts as loaded once its size is unchanged for this many polls
+SETTLE_POLL_INTERVAL = 0.25
+SETTLE_POLLS = 2
+
+# Fallback selectors, tried in order, shared by both extraction modes
+JOB_CARD_SELECTORS = [
+    "div.base-search-card__info",
+    "li.jobs-search-results__list-item",
+    "div.job-search-card",
+    "div.job-card-container",
+    "li.jobs-search-two-pane__job-card-container--viewport-tracking-0",
+    "div.jobs-search-results__list-item",
+    ".job-card-list",
+    "ul.jobs-search__results-list > li",
+    ".job-card-container__link"
+]
+
+# Cards read from the items of the main results list, tried before JOB_CARD_SELECTORS
+RESULTS_LIST_CARDS = "ul.jobs-search__results-list li"
+
+# Last resort when none of JOB_CARD_SELECTORS match
+GENERAL_CARD_SELECTOR = "div[class*='job-']"
+
+TITLE_SELECTORS = [
+    "h3.base-search-card__title",
+    "h3.job-search-card__title",
+    ".job-card-container__title", 
+    ".job-card-list__title"
+]
+
+COMPANY_SELECTORS = [
+    "h4.base-search-card__subtitle",
+    "h4.job-search-card__subtitle",
+    ".job-card-container__company-name",
+    ".job-card-container__primary-description",
+    ".job-card-list__company-name"
+]
+
+LOCATION_SELECTORS = [
+    "span.job-search-card__location",
+    ".job-card-container__metadata-item",
+    ".job-card-container__metadata-wrapper",
+    ".job-card-list__location"
+]
+
+TIME_SELECTORS = [".job-search-card__listdate", ".job-card-container__metadata-item--posted-date"]
+
+# Buttons that load the next batch of an infinite results list
+SEE_MORE_SELECTORS = [
+    "button.infinite-scroller__show-more-button",
+    "button.see-more-jobs",
+    "button[aria-label='See more jobs']"
+]
+
+# Links to the next page of paged results
+NEXT_PAGE_SELECTORS = [
+    "a[rel='next']",
+    "a.artdeco-pagination__button--next",
+    "li.artdeco-pagination__indicator--number.active + li > a"
+]
+
+# Any of these appearing means the search results have rendered
+RESULTS_READY_SELECTORS = [
+    "ul.jobs-search__results-list",
+    "div.base-search-card__info",
+    "li.jobs-search-results__list-item",
+    "div.job-search-card",
+    "div.job-card-container",
+    ".job-card-list"
+]
+
 def get_random_user_agent():
     """Return a random user agent from the list"""
     return random.choice(USER_AGENTS)
@@ -55,8 +174,11 @@ def setup_driver():
     
     # Initialize the Chrome driver with options
     try:
-        service = Service(ChromeDriverManager().install())
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+        # The binary is resolved once per process, not on every launch
+        driver_path = resolve_driver_path()
+        service = Service(driver_path) if driver_path else Service()
+        with scrape_stage_seconds.time(stage='driver_startup'):
+            driver = webdriver.Chrome(service=service, options=chrome_options)
         
         # Set the page load timeout
         driver.set_page_load_timeout(30)
@@ -66,102 +188,180 @@ def setup_driver():
         logger.error(f"Error setting up WebDriver: {e}")
         return None
 
-def get_linkedin_page(driver, search, location, max_retries=3):
-    """Navigate to LinkedIn job search page using Selenium"""
-    url = f'https://www.linkedin.com/jobs/search?keywords={search}&location={location}&geoId=&trk=public_jobs_jobs-search-bar_search-submit&position=1&pageNum=0'
+class RateLimiter:
+    """Per-host token bucket that spaces out page loads across all scraper threads"""
+    
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.buckets = {}
+        self.lock = threading.Lock()
+    
+    def acquire(self, host):
+        """Block until a request to host is allowed, returning the time spent waiting"""
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                tokens, updated = self.buckets.get(host, (self.burst, now))
+                tokens = min(self.burst, tokens + (now - updated) * self.rate)
+                if tokens >= 1:
+                    self.buckets[host] = (tokens - 1, now)
+                    break
+                self.buckets[host] = (tokens, now)
+                delay = (1 - tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+        rate_limit_wait_seconds.observe(waited, host=host)
+        return waited
+
+# Shared by every driver in the pool so concurrent workers don't multiply the request rate
+rate_limiter = RateLimiter(SCRAPER_RATE_PER_SECOND, SCRAPER_BURST)
+
+# Browsers shared by every scrape run in this process, quit when the process exits
+browser_pool = BrowserPool(setup_driver, SCRAPER_WORKERS)
+atexit.register(browser_pool.shutdown)
+
+def wait_for_results(driver, timeout=PAGE_READY_TIMEOUT):
+    """Wait for whichever results selector appears first, returning it or None on timeout"""
+    try:
+        WebDriverWait(driver, timeout).until(
+            EC.any_of(*[
+                EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+                for selector in RESULTS_READY_SELECTORS
+            ])
+        )
+    except TimeoutException:
+        count_selector('results_ready', None)
+        return None
+    
+    # any_of doesn't say which condition matched, one more lookup tells us for the log
+    for selector in RESULTS_READY_SELECTORS:
+        if driver.find_elements(By.CSS_SELECTOR, selector):
+            count_selector('results_ready', selector)
+            return selector
+    count_selector('results_ready', None)
+    return None
+
+def wait_for_cards_to_settle(driver, timeout=PAGE_READY_TIMEOUT):
+    """Wait until the number of job cards on the page stops growing, returning the final count"""
+    card_selector = ', '.join(JOB_CARD_SELECTORS)
+    state = {'count': -1, 'stable_polls': 0}
+    
+    def cards_settled(driver):
+        count = driver.execute_script(
+            "return document.querySelectorAll(arguments[0]).length", card_selector
+        )
+        if count == state['count']:
+            state['stable_polls'] += 1
+        else:
+            state['count'] = count
+            state['stable_polls'] = 0
+        return state['stable_polls'] >= SETTLE_POLLS
+    
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=SETTLE_POLL_INTERVAL).until(cards_settled)
+    except TimeoutException:
+        logger.info(f"Job cards still loading after {timeout}s, continuing with {state['count']} cards")
+    return state['count']
+
+def get_linkedin_page(driver, search, location, max_retries=3, scan=None):
+    """Navigate to LinkedIn job search page using Selenium, counting each attempt's load in scan if given"""
+    # Newest postings first (sortBy=DD), so an incremental scrape can stop once it reaches known jobs
+    url = f'{LINKEDIN_BASE_URL}/jobs/search?keywords={search}&location={location}&geoId=&trk=public_jobs_jobs-search-bar_search-submit&position=1&pageNum=0&sortBy=DD'
+    host = urlparse(url).netloc
     
     for attempt in range(max_retries):
         try:
-            # Add random delay between requests
-            delay = random.uniform(1.0, 3.0)
-            time.sleep(delay)
+            # Politeness delay comes from the per-host rate limit, not a fixed sleep
+            rate_limiter.acquire(host)
             
             # Navigate to the URL
-            driver.get(url)
+            if scan is not None:
+                scan.pages_loaded += 1
+            with scrape_stage_seconds.time(stage='page_load'):
+                driver.get(url)
             
-            # Wait for page to load with more flexibility
-            try:
-                # First try to wait for the results list
-                WebDriverWait(driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "ul.jobs-search__results-list"))
-                )
-                logger.info(f"Found main results list for {search} in {location}")
-                # Add a more substantial wait to ensure the page loads properly
-                time.sleep(random.uniform(3.0, 5.0))
+            # Wait for the results list or any kind of job card, whichever shows up first
+            with scrape_stage_seconds.time(stage='page_ready'):
+                selector = wait_for_results(driver)
+                card_count = wait_for_cards_to_settle(driver) if selector else 0
+            if selector:
+                logger.info(f"Found results using selector {selector} for {search} in {location}")
+                logger.info(f"Page ready with {card_count} job cards for {search} in {location}")
                 return True
-            except TimeoutException:
-                # If results list not found, try looking for any job cards
-                selectors = [
-                    "div.base-search-card__info",
-                    "li.jobs-search-results__list-item",
-                    "div.job-search-card",
-                    "div.job-card-container",
-                    ".job-card-list"
-                ]
-                
-                for selector in selectors:
-                    try:
-                        WebDriverWait(driver, 5).until(
-                            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                        )
-                        logger.info(f"Found job cards using selector {selector} for {search} in {location}")
-                        # Add a more substantial wait to ensure the page loads properly
-                        time.sleep(random.uniform(3.0, 5.0))
-                        return True
-                    except TimeoutException:
-                        continue
-                
-                # If we got here, no specific job card selector worked, 
-                # but the page might still have loaded (LinkedIn can have different structures)
-                # Check if we at least have the main content area
+            
+            # If we got here, no specific job card selector worked, 
+            # but the page might still have loaded (LinkedIn can have different structures)
+            # Check if we at least have the main content area
+            if driver.find_elements(By.CSS_SELECTOR, "main"):
+                logger.info(f"Found main content area for {search} in {location}")
+                # Take a screenshot to debug
                 try:
-                    WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "main"))
-                    )
-                    logger.info(f"Found main content area for {search} in {location}")
-                    # Take a screenshot to debug
-                    try:
-                        screenshot_path = f"linkedin_search_{search}_{location}.png"
-                        driver.save_screenshot(screenshot_path)
-                        logger.info(f"Saved screenshot to {screenshot_path}")
-                    except Exception as e:
-                        logger.warning(f"Could not save screenshot: {e}")
-                    
-                    # Even if we couldn't find specific job card selectors, return True as the page loaded
-                    # Add a more substantial wait to ensure the page loads properly
-                    time.sleep(random.uniform(3.0, 5.0))
-                    return True
-                except TimeoutException:
-                    logger.warning(f"Could not find main content for {search} in {location}")
-                    # Continue to retry
+                    screenshot_path = f"linkedin_search_{search}_{location}.png"
+                    driver.save_screenshot(screenshot_path)
+                    logger.info(f"Saved screenshot to {screenshot_path}")
+                except Exception as e:
+                    logger.warning(f"Could not save screenshot: {e}")
+                
+                # Even if we couldn't find specific job card selectors, return True as the page loaded
+                return True
+            
+            logger.warning(f"Could not find main content for {search} in {location}")
+            # Continue to retry
             
         except WebDriverException as e:
             logger.error(f"Error loading LinkedIn jobs (attempt {attempt+1}/{max_retries}): {e}")
-            time.sleep(random.uniform(2.0, 4.0))  # Longer delay after error
+            with scrape_stage_seconds.time(stage='retry_backoff'):
+                time.sleep(random.uniform(2.0, 4.0))  # Longer delay after error
             
     logger.error(f"Failed to load LinkedIn jobs after {max_retries} attempts")
     return False
 
+def build_job_data(title, company_name, location, job_url):
+    """Build the job data dict for a card, or return None if essential data is missing"""
+    # Skip jobs with missing essential data
+    if not title or not company_name:
+        logger.warning(f"Skipping job with missing data: Title='{title}', Company='{company_name}'")
+        return None
+    
+    # Use job_url as the description as per original code
+    description = job_url
+    
+    # Set salary to N/A since LinkedIn doesn't typically show salary on the cards
+    salary = 'N/A'
+    
+    # Create job data dictionary
+    job_data = {
+        'title': title,
+        'company': company_name,
+        'location': location or 'Not specified',
+        'description': description,  # Using job_url as description
+        'url': job_url,
+        'salary': salary,
+        'posted_date': datetime.utcnow(),  # Convert to datetime object for database
+        'is_active': True
+    }
+    
+    logger.info(f"Extracted job: {title} at {company_name}")
+    return job_data
+
 def extract_job_details_selenium(job_element):
     """Extract job details from a job card element using Selenium"""
     try:
         # Try multiple selectors for job title
         title = ''
-        title_selectors = [
-            "h3.base-search-card__title",
-            "h3.job-search-card__title",
-            ".job-card-container__title", 
-            ".job-card-list__title"
-        ]
-        
-        for selector in title_selectors:
+        for selector in TITLE_SELECTORS:
             try:
                 title_element = job_element.find_element(By.CSS_SELECTOR, selector)
-                title = title_element.text.strip()
+                title = normalize_text(title_element.text)
                 if title:
+                    count_selector('title', selector)
                     break
             except NoSuchElementException:
                 continue
+        else:
+            count_selector('title', None)
                 
         # If title not found, try looking at parent element
         if not title:
@@ -170,28 +370,23 @@ def extract_job_details_selenium(job_element):
                 parent_card = job_element.find_element(By.XPATH, "./..")
                 title_elements = parent_card.find_elements(By.CSS_SELECTOR, "h3")
                 if title_elements:
-                    title = title_elements[0].text.strip()
+                    title = normalize_text(title_elements[0].text)
             except NoSuchElementException:
                 pass
         
         # Try multiple selectors for company name
         company_name = ''
-        company_selectors = [
-            "h4.base-search-card__subtitle",
-            "h4.job-search-card__subtitle",
-            ".job-card-container__company-name",
-            ".job-card-container__primary-description",
-            ".job-card-list__company-name"
-        ]
-        
-        for selector in company_selectors:
+        for selector in COMPANY_SELECTORS:
             try:
                 company_element = job_element.find_element(By.CSS_SELECTOR, selector)
-                company_name = company_element.text.strip()
+                company_name = normalize_text(company_element.text)
                 if company_name:
+                    count_selector('company', selector)
                     break
             except NoSuchElementException:
                 continue
+        else:
+            count_selector('company', None)
                 
         # If company not found, try looking at parent element
         if not company_name:
@@ -199,27 +394,23 @@ def extract_job_details_selenium(job_element):
                 parent_card = job_element.find_element(By.XPATH, "./..")
                 company_elements = parent_card.find_elements(By.CSS_SELECTOR, "h4")
                 if company_elements:
-                    company_name = company_elements[0].text.strip()
+                    company_name = normalize_text(company_elements[0].text)
             except NoSuchElementException:
                 pass
         
         # Try multiple selectors for location
         location = ''
-        location_selectors = [
-            "span.job-search-card__location",
-            ".job-card-container__metadata-item",
-            ".job-card-container__metadata-wrapper",
-            ".job-card-list__location"
-        ]
-        
-        for selector in location_selectors:
+        for selector in LOCATION_SELECTORS:
             try:
                 location_element = job_element.find_element(By.CSS_SELECTOR, selector)
-                location = location_element.text.strip()
+                location = normalize_text(location_element.text)
                 if location:
+                    count_selector('location', selector)
                     break
             except NoSuchElementException:
                 continue
+        else:
+            count_selector('location', None)
         
         # Extract time posted if available
         posted_time = 'N/A'
@@ -228,73 +419,425 @@ def extract_job_details_selenium(job_element):
             time_element = job_element.find_element(By.TAG_NAME, "time")
             posted_time = time_element.text.strip()
             date = time_element.get_attribute("datetime")
+            count_selector('time', 'time')
         except NoSuchElementException:
             # Try alternative selectors for time
-            time_selectors = [".job-search-card__listdate", ".job-card-container__metadata-item--posted-date"]
-            for selector in time_selectors:
+            for selector in TIME_SELECTORS:
                 try:
                     time_element = job_element.find_element(By.CSS_SELECTOR, selector)
                     posted_time = time_element.text.strip()
                     date_attr = time_element.get_attribute("datetime")
                     if date_attr:
                         date = date_attr
+                    count_selector('time', selector)
                     break
                 except NoSuchElementException:
                     continue
+            else:
+                count_selector('time', None)
+        
+        job_url = card_url_selenium(job_element)
         
-        # Extract job URL
-        job_url = 'N/A'
+        return build_job_data(title, company_name, location, job_url)
+        
+    except Exception as e:
+        logger.error(f"Error extracting job details: {e}")
+        return None
+
+def card_url_selenium(job_element):
+    """Return the job URL of a card element, looking in the card, then its parent, then its grandparent"""
+    job_url = 'N/A'
+    try:
+        # Try first for anchor tag directly in the job element
+        link_element = job_element.find_element(By.TAG_NAME, "a")
+        job_url = link_element.get_attribute("href")
+    except NoSuchElementException:
+        # Try parent element if no anchor found
         try:
-            # Try first for anchor tag directly in the job element
-            link_element = job_element.find_element(By.TAG_NAME, "a")
+            parent = job_element.find_element(By.XPATH, "./..")
+            link_element = parent.find_element(By.TAG_NAME, "a")
             job_url = link_element.get_attribute("href")
         except NoSuchElementException:
-            # Try parent element if no anchor found
+            # Try grandparent
             try:
-                parent = job_element.find_element(By.XPATH, "./..")
-                link_element = parent.find_element(By.TAG_NAME, "a")
+                grandparent = job_element.find_element(By.XPATH, "./../..")
+                link_element = grandparent.find_element(By.TAG_NAME, "a")
                 job_url = link_element.get_attribute("href")
             except NoSuchElementException:
-                # Try grandparent
-                try:
-                    grandparent = job_element.find_element(By.XPATH, "./../..")
-                    link_element = grandparent.find_element(By.TAG_NAME, "a")
-                    job_url = link_element.get_attribute("href")
-                except NoSuchElementException:
-                    pass
+                pass
+    return job_url
+
+@lru_cache(maxsize=None)
+def compile_selector(selector):
+    """Compile a CSS selector to an XPath matching descendants only, like WebElement.find_element"""
+    return etree.XPath(HTMLTranslator().css_to_xpath(selector, prefix='descendant::'))
+
+# Elements whose text isn't rendered: the hidden attribute, inline display:none or
+# visibility:hidden, and the screen-reader-only classes. WebElement.text leaves their
+# text out, while lxml's text_content includes it
+HIDDEN_ELEMENTS = etree.XPath(
+    "descendant-or-self::*[@hidden"
+    " or contains(translate(@style, ' ', ''), 'display:none')"
+    " or contains(translate(@style, ' ', ''), 'visibility:hidden')"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' sr-only ')"
+    " or contains(concat(' ', normalize-space(@class), ' '), ' visually-hidden ')]"
+)
+
+def normalize_text(text):
+    """Collapse runs of whitespace, including the line breaks WebElement.text keeps between blocks"""
+    return ' '.join((text or '').split())
+
+# WebElement.text puts a line break at these, text_content runs the text on either side together
+LINE_BREAK_TAGS = frozenset(['br', 'div', 'p', 'li', 'ul', 'ol', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'tr'])
+
+def visible_text(element, hidden):
+    parts = [element.text or '']
+    for child in element:
+        # Comments and processing instructions have no text of their own, only a tail
+        if isinstance(child.tag, str) and child not in hidden:
+            if child.tag in LINE_BREAK_TAGS:
+                parts.extend(('\n', visible_text(child, hidden), '\n'))
+            else:
+                parts.append(visible_text(child, hidden))
+        parts.append(child.tail or '')
+    return ''.join(parts)
+
+def element_text(element):
+    """Return the whitespace-normalised text of an lxml element, as WebElement.text would show it"""
+    hidden = HIDDEN_ELEMENTS(element)
+    if hidden and hidden[0] is element:
+        return ''
+    return normalize_text(visible_text(element, set(hidden)))
+
+def first_text_html(element, selectors, fallback_list):
+    """Return the first non-empty text matched by a list of fallback selectors, counting which one hit"""
+    for selector in selectors:
+        matches = compile_selector(selector)(element)
+        if matches:
+            text = element_text(matches[0])
+            if text:
+                count_selector(fallback_list, selector)
+                return text
+    count_selector(fallback_list, None)
+    return ''
+
+def find_job_cards_html(tree):
+    """Find the job cards in a parsed results page, using the same fallbacks as scrape_search_term"""
+    results_lists = compile_selector("ul.jobs-search__results-list")(tree)
+    if results_lists:
+        job_cards = compile_selector("li")(results_lists[0])
+        if job_cards:
+            count_selector('job_cards', RESULTS_LIST_CARDS)
+            return job_cards
+    
+    for selector in JOB_CARD_SELECTORS:
+        job_cards = compile_selector(selector)(tree)
+        if job_cards:
+            count_selector('job_cards', selector)
+            return job_cards
+    
+    job_cards = compile_selector(GENERAL_CARD_SELECTOR)(tree)
+    count_selector('job_cards', GENERAL_CARD_SELECTOR if job_cards else None)
+    return job_cards
+
+def extract_job_details_html(job_element, base_url):
+    """Extract job details from a job card parsed out of page_source.
+
+    Mirrors extract_job_details_selenium and produces the same job data dict,
+    without a WebDriver round trip per field.
+    """
+    try:
+        title = first_text_html(job_element, TITLE_SELECTORS, 'title')
+        parent = job_element.getparent()
         
-        # Skip jobs with missing essential data
-        if not title or not company_name:
-            logger.warning(f"Skipping job with missing data: Title='{title}', Company='{company_name}'")
-            return None
+        # If title not found, try looking at parent element
+        if not title and parent is not None:
+            title_elements = compile_selector("h3")(parent)
+            if title_elements:
+                title = element_text(title_elements[0])
         
-        # Use job_url as the description as per original code
-        description = job_url
+        company_name = first_text_html(job_element, COMPANY_SELECTORS, 'company')
         
-        # Set salary to N/A since LinkedIn doesn't typically show salary on the cards
-        salary = 'N/A'
+        # If company not found, try looking at parent element
+        if not company_name and parent is not None:
+            company_elements = compile_selector("h4")(parent)
+            if company_elements:
+                company_name = element_text(company_elements[0])
         
-        # Create job data dictionary
-        job_data = {
-            'title': title,
-            'company': company_name,
-            'location': location or 'Not specified',
-            'description': description,  # Using job_url as description
-            'url': job_url,
-            'salary': salary,
-            'posted_date': datetime.utcnow(),  # Convert to datetime object for database
-            'is_active': True
-        }
+        location = first_text_html(job_element, LOCATION_SELECTORS, 'location')
         
-        logger.info(f"Extracted job: {title} at {company_name}")
-        return job_data
+        job_url = card_url_html(job_element, base_url)
         
+        return build_job_data(title, company_name, location, job_url)
+    
     except Exception as e:
         logger.error(f"Error extracting job details: {e}")
         return None
 
-def scrape_linkedin(search_terms=None, max_retries=3):
-    """Scrape job listings from LinkedIn using Selenium"""
+def card_url_html(job_element, base_url):
+    """Return the job URL of a parsed card, looking in the card, then its parent, then its grandparent"""
+    element = job_element
+    for _ in range(3):
+        if element is None:
+            break
+        links = compile_selector("a")(element)
+        if links:
+            href = links[0].get('href')
+            # WebElement.get_attribute("href") resolves relative links against the page URL
+            return urljoin(base_url, href) if href is not None else None
+        element = element.getparent()
+    return 'N/A'
+
+def canonical_job_url(url):
+    """Strip the query and fragment from a job URL.
+
+    Result links carry tracking parameters that change on every page load, so
+    the same posting is only recognisable by its path.
+    """
+    if not url or url == 'N/A':
+        return None
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path.rstrip('/'), '', ''))
+
+class PageScan:
+    """Outcome of reading a term's results: the new jobs, and what was recognised"""
+
+    def __init__(self, card_count=0):
+        self.jobs = []
+        self.card_count = card_count
+        self.newest_url = None
+        self.known = 0
+        self.known_in_a_row = 0
+        self.reached_known = False
+        # Canonical URLs of every card read, known or new, for tracking which jobs are still listed
+        self.seen_urls = []
+        # Pages the browser loaded, retries and appended batches included, see BrowserPool.release
+        self.pages_loaded = 0
+
+def scan_cards(job_cards, read_url, extract, known_urls=frozenset(), watermark_url=None, scan=None,
+               stop_at_known=True):
+    """Extract the cards of a newest-first results page until it runs into jobs already stored.
+
+    Each card's URL is read first and checked against known_urls, which is
+    far cheaper than extracting every field, so known cards are skipped. The
+    scan stops at the term's watermark (the newest URL the last run saw) or
+    after KNOWN_CARDS_TO_STOP known cards in a row, since everything after
+    that point was already scraped.
+
+    Pass the scan of the cards before these to carry on reading a page that
+    has grown, it is updated and returned. With stop_at_known False known
+    cards are still skipped but reading carries on to the last card.
+    """
+    if scan is None:
+        scan = PageScan()
+    scan.card_count += len(job_cards)
+    for job in job_cards:
+        url = canonical_job_url(read_url(job))
+        if url:
+            scan.seen_urls.append(url)
+            if scan.newest_url is None:
+                scan.newest_url = url
+        
+        if url and (url == watermark_url or url in known_urls):
+            scan.known += 1
+            scan.known_in_a_row += 1
+            if stop_at_known and (url == watermark_url or scan.known_in_a_row >= KNOWN_CARDS_TO_STOP):
+                scan.reached_known = True
+                break
+            continue
+        scan.known_in_a_row = 0
+        
+        started = time.perf_counter()
+        job_data = extract(job)
+        scrape_stage_seconds.observe(time.perf_counter() - started, stage='extract_card')
+        if job_data:
+            scan.jobs.append(job_data)
+    return scan
+
+def extract_jobs_from_page_source(page_source, base_url, known_urls=frozenset(), watermark_url=None):
+    """Parse a results page snapshot and return a PageScan of the cards not already known"""
+    tree = lxml.html.fromstring(page_source)
+    job_cards = find_job_cards_html(tree)
+    return scan_cards(
+        job_cards,
+        lambda job: card_url_html(job, base_url),
+        lambda job: extract_job_details_html(job, base_url),
+        known_urls, watermark_url
+    )
+
+def find_job_cards_selenium(driver):
+    """Find the job cards on the current page through the WebDriver, trying each fallback selector"""
+    job_cards = []
+    
+    # First try to get the list container, get_linkedin_page has already waited for it
+    try:
+        results_lists = driver.find_elements(By.CSS_SELECTOR, "ul.jobs-search__results-list")
+        if results_lists:
+            # Get all list items from the results list
+            job_cards = results_lists[0].find_elements(By.TAG_NAME, "li")
+            logger.info(f"Found {len(job_cards)} job cards from results list")
+            if job_cards:
+                count_selector('job_cards', RESULTS_LIST_CARDS)
+        else:
+            logger.warning("Could not find main results list")
+    except WebDriverException as e:
+        logger.warning(f"Could not find main results list: {e}")
+        # Continue with other selectors
+    
+    # If no job cards found yet, try the different selectors
+    if not job_cards:
+        for selector in JOB_CARD_SELECTORS:
+            try:
+                job_cards = driver.find_elements(By.CSS_SELECTOR, selector)
+                if job_cards:
+                    logger.info(f"Found {len(job_cards)} job cards using selector: {selector}")
+                    count_selector('job_cards', selector)
+                    break
+            except WebDriverException as e:
+                logger.warning(f"Error finding elements with selector {selector}: {e}")
+    
+    if not job_cards:
+        # One last attempt - get all divs with certain classes that might contain job info
+        try:
+            job_cards = driver.find_elements(By.CSS_SELECTOR, GENERAL_CARD_SELECTOR)
+            logger.info(f"Found {len(job_cards)} potential job cards using general job class selector")
+        except WebDriverException as e:
+            logger.warning(f"Error finding elements with general job class selector: {e}")
+        count_selector('job_cards', GENERAL_CARD_SELECTOR if job_cards else None)
+    
+    return job_cards
+
+def find_job_cards(driver):
+    """Return the current page's job cards with the functions that read their URL and extract them"""
+    if EXTRACTION_MODE == 'page_source':
+        # Read every card from a single snapshot instead of one WebDriver call per field
+        base_url = driver.current_url
+        job_cards = find_job_cards_html(lxml.html.fromstring(driver.page_source))
+        return (
+            job_cards,
+            lambda job: card_url_html(job, base_url),
+            lambda job: extract_job_details_html(job, base_url)
+        )
+    return find_job_cards_selenium(driver), card_url_selenium, extract_job_details_selenium
+
+def load_more_cards(driver, scan=None):
+    """Bring more results onto the page by scrolling, pressing "see more" or following the next page link.
+
+    Returns 'appended' when new cards were added after the ones already on
+    the page, 'next_page' when a new page of results replaced them, or None
+    once the results have stopped growing. Loads are counted in scan if given.
+    """
+    host = urlparse(driver.current_url).netloc
+    before = driver.execute_script(
+        "return document.querySelectorAll(arguments[0]).length", ', '.join(JOB_CARD_SELECTORS)
+    )
+    
+    for _ in range(LOAD_MORE_ATTEMPTS):
+        # Each scroll or press fetches another batch of results from the site
+        rate_limiter.acquire(host)
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        for button in driver.find_elements(By.CSS_SELECTOR, ', '.join(SEE_MORE_SELECTORS)):
+            if button.is_displayed() and button.is_enabled():
+                driver.execute_script("arguments[0].click();", button)
+                break
+        if wait_for_cards_to_settle(driver) > before:
+            if scan is not None:
+                scan.pages_loaded += 1
+            return 'appended'
+        
+        # Paged results instead of an infinite list
+        next_links = driver.find_elements(By.CSS_SELECTOR, ', '.join(NEXT_PAGE_SELECTORS))
+        next_url = next_links[0].get_attribute("href") if next_links else None
+        if next_url:
+            rate_limiter.acquire(host)
+            if scan is not None:
+                scan.pages_loaded += 1
+            with scrape_stage_seconds.time(stage='page_load'):
+                driver.get(next_url)
+            if wait_for_results(driver):
+                wait_for_cards_to_settle(driver)
+                return 'next_page'
+            return None
+    return None
+
+def scrape_search_term(driver, search, location, max_retries=3, known_urls=frozenset(), watermark_url=None,
+                       stop_at_known=True, scan=None):
+    """Load a term's search results and return a PageScan of the jobs extracted from their cards.
+
+    After the first screenful, more results are brought in with
+    load_more_cards, up to SCRAPER_MAX_PAGES loads or SCRAPER_MAX_CARDS
+    cards, and only the cards added since the last read are extracted.
+    Reading stops early once the results stop growing, or when it runs into
+    known jobs (cards whose URL is in known_urls, or watermark_url) unless
+    stop_at_known is False, see scan_cards.
+
+    Pass an empty scan to see how many pages the browser loaded even if
+    scraping the term fails partway, it is filled in and returned.
+    """
+    logger.info(f"Searching for {search} in {location}")
+    if scan is None:
+        scan = PageScan()
+    
+    # Navigate to LinkedIn jobs page
+    success = get_linkedin_page(driver, search, location, max_retries, scan)
+    
+    if not success:
+        logger.warning(f"Could not load LinkedIn jobs page for {search} in {location}")
+        return scan
+    
+    # Cards at the top of the current page that have already been read
+    cards_read = 0
+    pages_loaded = 1
+    
+    while True:
+        with scrape_stage_seconds.time(stage='card_discovery'):
+            job_cards, read_url, extract = find_job_cards(driver)
+        scan_cards(job_cards[cards_read:], read_url, extract, known_urls, watermark_url, scan, stop_at_known)
+        cards_read = len(job_cards)
+        
+        if scan.reached_known:
+            logger.info(f"Reached jobs already scraped for {search} in {location}")
+            break
+        if pages_loaded >= SCRAPER_MAX_PAGES or scan.card_count >= SCRAPER_MAX_CARDS:
+            break
+        
+        with scrape_stage_seconds.time(stage='load_more'):
+            loaded = load_more_cards(driver, scan)
+        if loaded is None:
+            logger.info(f"No more results for {search} in {location} after {pages_loaded} loads")
+            break
+        if loaded == 'next_page':
+            cards_read = 0
+        pages_loaded += 1
+    
+    if not scan.card_count:
+        logger.warning(f"No job cards found for {search} in {location}")
+    logger.info(
+        f"Extracted {len(scan.jobs)} jobs out of {scan.card_count} cards from {pages_loaded} loads, "
+        f"{scan.known} already known, for {search} in {location}"
+    )
+    return scan
+
+def scrape_batches(search_terms=None, max_retries=3, max_workers=None, on_progress=None,
+                   known_urls=frozenset(), watermarks=None, full_scan_terms=None):
+    """Scrape job listings from LinkedIn using Selenium, yielding each term's results as it completes.
+
+    Yields (terms, scan) pairs in search term order, where scan is the
+    term's PageScan with jobs already seen under an earlier term removed, so
+    the caller can save every batch as soon as it arrives. Terms that fail
+    are logged and skipped.
+
+    Search terms are scraped concurrently, max_workers at a time
+    (SCRAPER_WORKERS by default), on browsers from the shared warm pool.
+    on_progress, if given, is called with (terms_done, terms_total) as each
+    term's results are merged.
+
+    For an incremental scrape, known_urls holds the canonical URLs of jobs
+    already stored and watermarks maps (search, location) to the newest URL
+    the last run saw for that term. Known cards are not extracted. Terms in
+    full_scan_terms (all terms if it's None) ignore their watermark and are
+    read to their full harvesting depth, so every job still listed is seen.
+    """
     logger.info("Starting LinkedIn scraper with Selenium")
     
     if search_terms is None:
@@ -306,127 +849,375 @@ def scrape_linkedin(search_terms=None, max_retries=3):
             {"search": "python", "location": "Pakistan"}
         ]
     
-    all_jobs = []
-    driver = None
+    if max_workers is None:
+        max_workers = SCRAPER_WORKERS
+    max_workers = max(1, min(max_workers, len(search_terms)))
+    
+    jobs_found = 0
     # Track unique jobs during extraction to prevent duplicates
     seen_job_identifiers = set()
     
-    try:
-        # Initialize the driver
-        driver = setup_driver()
+    # Drivers are checked out by one worker at a time, a driver is never shared
+    def scrape_term(terms):
+        driver = browser_pool.acquire()
         if not driver:
-            logger.error("Failed to initialize WebDriver")
-            return all_jobs
+            raise RuntimeError("Failed to initialize WebDriver")
+        # Counts the pages this term loads, so the pool knows how worn the browser is
+        scan = PageScan()
+        try:
+            term = (terms["search"], terms["location"])
+            full_scan = full_scan_terms is None or term in full_scan_terms
+            watermark_url = watermarks.get(term) if watermarks and not full_scan else None
+            with scrape_stage_seconds.time(stage='search_term'):
+                scrape_search_term(
+                    driver, terms["search"], terms["location"], max_retries, known_urls, watermark_url,
+                    stop_at_known=not full_scan, scan=scan
+                )
+        except WebDriverException:
+            # Don't hand a browser that failed mid-page to the next run
+            browser_pool.discard(driver)
+            raise
+        except Exception:
+            browser_pool.release(driver, scan.pages_loaded)
+            raise
+        browser_pool.release(driver, scan.pages_loaded)
+        return scan
+    
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        futures = [(terms, executor.submit(scrape_term, terms)) for terms in search_terms]
         
-        for terms in search_terms:
-            search = terms["search"]
-            location = terms["location"]
-            
-            logger.info(f"Searching for {search} in {location}")
-            
-            # Navigate to LinkedIn jobs page
-            success = get_linkedin_page(driver, search, location, max_retries)
-            
-            if not success:
-                logger.warning(f"Could not load LinkedIn jobs page for {search} in {location}")
+        # Merge in search term order so the result doesn't depend on which worker finishes first
+        for terms_done, (terms, future) in enumerate(futures, start=1):
+            try:
+                scan = future.result()
+            except Exception as e:
+                logger.error(f"Error scraping {terms['search']} in {terms['location']}: {e}")
                 continue
+            finally:
+                if on_progress:
+                    on_progress(terms_done, len(search_terms))
             
-            # Wait for a moment to ensure the page is fully loaded
-            time.sleep(5)
-            
-            # Try different selectors for job cards - expanded list with more options
-            job_cards = []
-            selectors = [
-                "div.base-search-card__info",
-                "li.jobs-search-results__list-item",
-                "div.job-search-card",
-                "div.job-card-container",
-                "li.jobs-search-two-pane__job-card-container--viewport-tracking-0",
-                "div.jobs-search-results__list-item",
-                ".job-card-list",
-                "ul.jobs-search__results-list > li",
-                ".job-card-container__link"
-            ]
-            
-            # First try to get the list container
-            try:
-                results_list = WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "ul.jobs-search__results-list"))
-                )
-                # Get all list items from the results list
-                job_cards = results_list.find_elements(By.TAG_NAME, "li")
-                logger.info(f"Found {len(job_cards)} job cards from results list")
-            except (TimeoutException, NoSuchElementException, WebDriverException) as e:
-                logger.warning(f"Could not find main results list: {e}")
-                # Continue with other selectors
+            batch = []
+            duplicates_skipped = 0
             
-            # If no job cards found yet, try the different selectors
-            if not job_cards:
-                for selector in selectors:
-                    try:
-                        job_cards = driver.find_elements(By.CSS_SELECTOR, selector)
-                        if job_cards:
-                            logger.info(f"Found {len(job_cards)} job cards using selector: {selector}")
-                            break
-                    except WebDriverException as e:
-                        logger.warning(f"Error finding elements with selector {selector}: {e}")
+            for job_data in scan.jobs:
+                # Normalized identity, so trivial variants of a job listed under several terms match
+                job_identifier = job_fingerprint(job_data['title'], job_data['company'], job_data['location'])
+                
+                # Skip if we've already seen this job
+                if job_identifier in seen_job_identifiers:
+                    duplicates_skipped += 1
+                    logger.info(f"Skipping duplicate during extraction: {job_data['title']} at {job_data['company']}")
+                    continue
+                
+                # Add to seen jobs
+                seen_job_identifiers.add(job_identifier)
+                batch.append(job_data)
             
-            if not job_cards:
-                # One last attempt - get all divs with certain classes that might contain job info
-                try:
-                    job_cards = driver.find_elements(By.CSS_SELECTOR, "div[class*='job-']")
-                    logger.info(f"Found {len(job_cards)} potential job cards using general job class selector")
-                except WebDriverException as e:
-                    logger.warning(f"Error finding elements with general job class selector: {e}")
+            logger.info(f"Successfully extracted {len(batch)} valid jobs, skipped {duplicates_skipped} duplicates for {terms['search']} in {terms['location']}")
+            jobs_found += len(batch)
+            scan.jobs = batch
+            yield terms, scan
+    
+    finally:
+        # A consumer that stops early doesn't need the terms that haven't started yet
+        executor.shutdown(wait=True, cancel_futures=True)
+        # Warm browsers stay in the pool for the next run unless keeping them is disabled
+        if not BROWSER_KEEP_WARM:
+            browser_pool.shutdown()
+    
+    logger.info(f"Scraping completed. Found {jobs_found} unique jobs")
+
+def scrape_linkedin(search_terms=None, max_retries=3, max_workers=None, on_progress=None,
+                    known_urls=frozenset(), watermarks=None, newest_urls=None, full_scan_terms=None):
+    """Scrape job listings from LinkedIn and return them all once every term is done.
+
+    Takes the same arguments as scrape_batches. If newest_urls is given it is
+    filled with the newest URL this run saw for each term that returned
+    cards, the watermarks for the next run.
+    """
+    all_jobs = []
+    try:
+        for terms, scan in scrape_batches(
+            search_terms, max_retries, max_workers, on_progress, known_urls, watermarks, full_scan_terms
+        ):
+            if newest_urls is not None and scan.newest_url:
+                newest_urls[(terms["search"], terms["location"])] = scan.newest_url
+            all_jobs.extend(scan.jobs)
+    except Exception as e:
+        logger.error(f"Error in scrape_linkedin: {e}")
+    return all_jobs
+
+# Number of scraped jobs looked up and inserted per statement
+SAVE_CHUNK_SIZE = 500
+
+def insert_ignoring_duplicates(db, Job):
+    """Build a bulk INSERT that skips rows violating a unique constraint where the backend supports it"""
+    dialect = db.engine.dialect.name
+    if dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+        return insert(Job).on_conflict_do_nothing()
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+        return insert(Job).on_conflict_do_nothing()
+    if dialect in ('mysql', 'mariadb'):
+        return db.insert(Job).prefix_with('IGNORE')
+    return db.insert(Job)
+
+def save_jobs(db, Job, jobs, near_duplicates=None, matched_ids=None):
+    """Insert scraped jobs that aren't already stored, returning (added, skipped) counts.
+
+    Jobs are stored under their canonical URL, without the tracking
+    parameters that differ on every page load. Existing rows are found with
+    one IN query per chunk on it and one on the indexed fingerprint, instead
+    of one lookup per job. Given a
+    SimHashIndex of the stored jobs, jobs within a couple of bits of one at
+    the same company and location, with nearly the same title words, are
+    skipped as near duplicates too, and the new jobs are added to it.
+    Given a matched_ids set, the ids of the stored jobs that skipped jobs
+    matched are added to it, since those jobs are evidently still listed.
+    The caller is responsible for the app context and for rolling back on
+    error.
+    """
+    jobs_added = 0
+    jobs_skipped = 0
+    
+    # Url and fingerprint of stored jobs and of jobs saved earlier in the batch, mapped to
+    # the id of the stored job (None for the batch's own)
+    seen_urls = {}
+    seen_fingerprints = {}
+    
+    for start in range(0, len(jobs), SAVE_CHUNK_SIZE):
+        chunk = jobs[start:start + SAVE_CHUNK_SIZE]
+        started = time.perf_counter()
+        
+        # Cards without a link are stored with no url so they don't collide on the unique url index
+        chunk_urls = [canonical_job_url(job_data['url']) for job_data in chunk]
+        urls = {url for url in chunk_urls if url}
+        identities = [
+            fingerprint_fields(job_data['title'], job_data['company'], job_data['location'])
+            for job_data in chunk
+        ]
+        fingerprints = {identity['fingerprint'] for identity in identities}
+        
+        if urls:
+            seen_urls.update(db.session.query(Job.url, Job.id).filter(Job.url.in_(urls)))
+        seen_fingerprints.update(
+            db.session.query(Job.fingerprint, Job.id).filter(Job.fingerprint.in_(fingerprints))
+        )
+        
+        rows = []
+        for job_data, identity, url in zip(chunk, identities, chunk_urls):
             
-            if not job_cards:
-                logger.warning(f"No job cards found for {search} in {location}")
+            # Skip jobs already in the database or earlier in this batch
+            if (url and url in seen_urls) or identity['fingerprint'] in seen_fingerprints:
+                jobs_skipped += 1
+                if matched_ids is not None:
+                    matched_ids.update(
+                        job_id for job_id in (seen_urls.get(url), seen_fingerprints.get(identity['fingerprint']))
+                        if job_id is not None
+                    )
+                logger.info(f"Skipping duplicate job: {job_data['title']} at {job_data['company']}")
                 continue
             
-            logger.info(f"Found {len(job_cards)} job cards for {search} in {location}")
-            
-            valid_jobs = 0
-            duplicates_skipped = 0
-            
-            for job in job_cards:
-                job_data = extract_job_details_selenium(job)
-                if job_data:
-                    # Create a unique identifier for this job
-                    job_identifier = f"{job_data['title']}|{job_data['company']}|{job_data['location']}"
-                    
-                    # Skip if we've already seen this job
-                    if job_identifier in seen_job_identifiers:
-                        duplicates_skipped += 1
-                        logger.info(f"Skipping duplicate during extraction: {job_data['title']} at {job_data['company']}")
-                        continue
-                    
-                    # Add to seen jobs
-                    seen_job_identifiers.add(job_identifier)
-                    all_jobs.append(job_data)
-                    valid_jobs += 1
+            if near_duplicates is not None:
+                key = near_duplicate_key(job_data['title'], job_data['company'], job_data['location'])
+                match = near_duplicates.find(identity['simhash'], key)
+                if match:
+                    jobs_skipped += 1
+                    if matched_ids is not None and match[0] is not None:
+                        matched_ids.add(match[0])
+                    logger.info(f"Skipping near duplicate of job {match[0]} ({match[1]} bits apart): {job_data['title']} at {job_data['company']}")
+                    continue
+                near_duplicates.add(identity['simhash'], key)
             
-            logger.info(f"Successfully extracted {valid_jobs} valid jobs, skipped {duplicates_skipped} duplicates out of {len(job_cards)} cards")
+            if url:
+                seen_urls[url] = None
+            seen_fingerprints[identity['fingerprint']] = None
             
-            # If we found jobs, we can continue to next search term
-            # Don't break early to get more variety of jobs
+            rows.append({
+                'title': job_data['title'],
+                'company': job_data['company'],
+                'location': job_data['location'],
+                'description': job_data['description'],
+                'url': url,
+                'salary': job_data['salary'],
+                'posted_date': job_data['posted_date'],
+                'is_active': True,
+                'last_seen_at': datetime.utcnow(),
+                **identity
+            })
+        scrape_stage_seconds.observe(time.perf_counter() - started, stage='dedup')
         
-    except Exception as e:
-        logger.error(f"Error in scrape_linkedin: {e}")
+        if rows:
+            # Rows that lost a race with a concurrent writer are dropped by the unique constraints
+            with scrape_stage_seconds.time(stage='insert'):
+                result = db.session.connection().execute(insert_ignoring_duplicates(db, Job), rows)
+            inserted = result.rowcount if result.rowcount >= 0 else len(rows)
+            jobs_added += inserted
+            jobs_skipped += len(rows) - inserted
     
-    finally:
-        # Close the driver
-        if driver:
-            try:
-                driver.quit()
-                logger.info("WebDriver closed successfully")
-            except Exception as e:
-                logger.error(f"Error closing WebDriver: {e}")
-    
-    logger.info(f"Scraping completed. Found {len(all_jobs)} unique jobs")
-    return all_jobs
+    with scrape_stage_seconds.time(stage='commit'):
+        db.session.commit()
+    return jobs_added, jobs_skipped
+
+class StoredJobs:
+    """Canonical URLs and SimHash index of the stored jobs, kept between scrape runs.
+
+    Building them reads every job, so a process builds them once and then
+    only re-reads the jobs the change log (see changes.py) has recorded
+    writes to since. Without the JobChange model, on a database the log
+    doesn't cover, or once the log has been pruned past the last sync, they
+    are rebuilt from the whole table.
+    """
+
+    def __init__(self):
+        # Held for a whole run, save_jobs adds the run's new jobs to the SimHash index
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget every stored job, the next sync rebuilds from the whole table"""
+        # Canonical URL to job id, and back so a rewritten job's old URL can be dropped
+        self.known_urls = {}
+        self.urls_by_id = {}
+        self.near_duplicates = SimHashIndex()
+        # Last change applied, None until built from the log
+        self.cursor = None
+
+    def add(self, job_id, url, simhash, title, company, location):
+        canonical = canonical_job_url(url)
+        if canonical:
+            self.known_urls[canonical] = job_id
+            self.urls_by_id[job_id] = canonical
+        if simhash is not None:
+            self.near_duplicates.add(simhash, near_duplicate_key(title, company, location), job_id)
+
+    def remove(self, job_id):
+        canonical = self.urls_by_id.pop(job_id, None)
+        if canonical and self.known_urls.get(canonical) == job_id:
+            del self.known_urls[canonical]
+        self.near_duplicates.remove(job_id)
+
+    def columns(self, db, Job):
+        return db.session.query(Job.id, Job.url, Job.simhash, Job.title, Job.company, Job.location)
+
+    def rebuild(self, db, Job):
+        self.reset()
+        for row in self.columns(db, Job).execution_options(yield_per=SAVE_CHUNK_SIZE):
+            self.add(*row)
+
+    def sync(self, db, Job, JobChange=None):
+        """Bring the index up to date with the stored jobs, returning whether it was rebuilt"""
+        # The last run's new jobs were indexed without ids, their changes add them back with them
+        self.near_duplicates.remove(None)
 
-def scrape_and_save(db, Job, app=None):
-    """Scrape jobs from LinkedIn and save to database"""
+        if JobChange is None or db.engine.dialect.name not in CHANGE_LOG_DDL:
+            self.rebuild(db, Job)
+            return True
+
+        oldest, newest = change_window(db, JobChange)
+        # A log behind the cursor belongs to another database, one past it has lost changes
+        if self.cursor is None or newest < self.cursor or oldest > self.cursor + 1:
+            # The cursor is read first, so writes made while loading are applied again next sync
+            self.rebuild(db, Job)
+            self.cursor = newest
+            return True
+
+        while True:
+            cursor, job_ids = read_changes(db, JobChange, self.cursor, SAVE_CHUNK_SIZE)
+            if cursor == self.cursor:
+                return False
+            for job_id in job_ids:
+                self.remove(job_id)
+            # Deleted jobs are only removed
+            for row in self.columns(db, Job).filter(Job.id.in_(job_ids)):
+                self.add(*row)
+            self.cursor = cursor
+
+# Stored jobs as of the last scrape run in this process
+stored_jobs = StoredJobs()
+
+def load_watermarks(db, ScrapeWatermark, search_terms):
+    """Return the newest URL seen per (search, location) term by earlier runs, and the terms due a full scan"""
+    marks = {(mark.search, mark.location): mark for mark in db.session.query(ScrapeWatermark)}
+    cutoff = datetime.utcnow() - FULL_SCAN_INTERVAL
+    full_scan_terms = {
+        (terms['search'], terms['location']) for terms in search_terms
+        if (terms['search'], terms['location']) not in marks
+        or not marks[(terms['search'], terms['location'])].full_scan_at
+        or marks[(terms['search'], terms['location'])].full_scan_at < cutoff
+    }
+    return {term: mark.newest_url for term, mark in marks.items()}, full_scan_terms
+
+def save_watermarks(db, ScrapeWatermark, watermarks, full_scan=False):
+    """Store the newest URL seen per term, once the jobs it covers have been saved"""
+    now = datetime.utcnow()
+    for (search, location), newest_url in watermarks.items():
+        mark = db.session.get(ScrapeWatermark, (search, location))
+        if mark is None:
+            mark = ScrapeWatermark(search=search, location=location, newest_url=newest_url, updated_at=now)
+            db.session.add(mark)
+        elif mark.newest_url != newest_url:
+            mark.newest_url = newest_url
+            mark.updated_at = now
+        if full_scan:
+            mark.full_scan_at = now
+    db.session.commit()
+
+def mark_jobs_seen(db, Job, job_ids):
+    """Record that stored jobs are still listed, reactivating any the staleness sweep turned off.
+
+    Only inactive jobs that had gone unseen for STALE_AFTER count as swept, a
+    job turned off through the API while still listed stays off.
+    """
+    job_ids = sorted(job_ids)
+    now = datetime.utcnow()
+    # SET reads the row as it was, so this checks last_seen_at before it is bumped
+    swept = and_(Job.is_active.is_(False), Job.last_seen_at < now - STALE_AFTER)
+    with scrape_stage_seconds.time(stage='mark_seen'):
+        for start in range(0, len(job_ids), SAVE_CHUNK_SIZE):
+            db.session.execute(
+                update(Job).where(Job.id.in_(job_ids[start:start + SAVE_CHUNK_SIZE])).values(
+                    last_seen_at=now, is_active=case((swept, True), else_=Job.is_active)
+                ),
+                execution_options={'synchronize_session': False}
+            )
+        db.session.commit()
+
+def sweep_stale_jobs(db, Job):
+    """Deactivate scraped jobs that no run has seen listed for STALE_AFTER, in one UPDATE.
+
+    Jobs that didn't come from the scraper have no last_seen_at and are left alone.
+    """
+    cutoff = datetime.utcnow() - STALE_AFTER
+    with scrape_stage_seconds.time(stage='sweep'):
+        result = db.session.execute(
+            update(Job).where(Job.is_active.is_(True), Job.last_seen_at < cutoff).values(is_active=False),
+            execution_options={'synchronize_session': False}
+        )
+        db.session.commit()
+    return result.rowcount
+
+def scrape_and_save(db, Job, app=None, on_progress=None, ScrapeWatermark=None, JobChange=None):
+    """Scrape jobs from LinkedIn and save to database.
+
+    Jobs are committed one search term at a time as the scrape goes. Returns
+    a dict of counts and per-stage timings in seconds (first_commit is the
+    time until the first new job was saved), with an 'error' entry if any
+    part of the run failed. on_progress is passed to scrape_batches.
+
+    Cards already in the database are skipped without being extracted, and
+    the jobs they belong to are marked as seen. Given the ScrapeWatermark
+    model the scrape is incremental: each term stops at the newest job the
+    previous run saw, apart from a full scan every FULL_SCAN_INTERVAL.
+    Without it every term is read to its full depth. Once every term has
+    loaded, jobs not seen for STALE_AFTER are deactivated. Given the JobChange
+    model, the stored jobs' URLs and SimHashes are caught up from the change
+    log rather than reloaded, see StoredJobs.
+    """
+    stats = {'jobs_scraped': 0, 'jobs_added': 0, 'jobs_skipped': 0, 'jobs_deactivated': 0, 'timings': {}}
     try:
         # Define search terms to try
         search_terms = [
@@ -438,76 +1229,110 @@ def scrape_and_save(db, Job, app=None):
             {"search": "frontend developer", "location": "Pakistan"}
         ]
         
-        # Scrape LinkedIn jobs
-        jobs = scrape_linkedin(search_terms)
-        
-        if not jobs:
-            logger.error("Could not scrape any jobs from LinkedIn")
-            return
-        
         # If app is provided, ensure we're in app context
         if app:
             ctx = app.app_context()
             ctx.push()
         
+        # Runs in a process take turns with the stored jobs, the scrape worker runs one at a time anyway
+        stored_jobs.lock.acquire()
         try:
-            jobs_added = 0
-            jobs_skipped = 0
+            started = time.perf_counter()
+            # Stored URLs, so known cards are skipped, and SimHashes, so reworded copies aren't saved again
+            stored_jobs.sync(db, Job, JobChange)
+            known_urls = stored_jobs.known_urls
+            near_duplicates = stored_jobs.near_duplicates
+            watermarks = None
+            full_scan_terms = None
+            if ScrapeWatermark is not None:
+                watermarks, full_scan_terms = load_watermarks(db, ScrapeWatermark, search_terms)
+            # Don't hold a transaction open for the length of the scrape
+            db.session.rollback()
+            stats['timings']['preload'] = round(time.perf_counter() - started, 3)
+            scrape_stage_seconds.observe(stats['timings']['preload'], stage='preload')
             
-            # Create a set to track unique job combinations
-            seen_jobs = set()
+            # Save each term's jobs as soon as it's scraped, so they become visible without waiting
+            # for the whole run and a failure later on doesn't lose them
+            run_started = time.perf_counter()
+            save_seconds = 0.0
+            terms_with_cards = 0
             
-            for job_data in jobs:
-                # Create a unique identifier using title, company, and location
-                job_identifier = f"{job_data['title']}|{job_data['company']}|{job_data['location']}"
-                
-                # Check if job already exists by URL or by title+company+location combination
-                existing_job = Job.query.filter(
-                    (Job.url == job_data['url']) | 
-                    ((Job.title == job_data['title']) & 
-                     (Job.company == job_data['company']) & 
-                     (Job.location == job_data['location']))
-                ).first()
+            for terms, scan in scrape_batches(
+                search_terms, on_progress=on_progress, known_urls=known_urls,
+                watermarks=watermarks, full_scan_terms=full_scan_terms
+            ):
+                stats['jobs_scraped'] += len(scan.jobs)
+                if scan.newest_url:
+                    terms_with_cards += 1
                 
-                # Also check if we've already seen this job in the current batch
-                if existing_job or job_identifier in seen_jobs:
-                    jobs_skipped += 1
-                    logger.info(f"Skipping duplicate job: {job_data['title']} at {job_data['company']}")
-                    continue
-                
-                # Add to seen jobs set
-                seen_jobs.add(job_identifier)
-                
-                # Log description to debug
-                logger.info(f"Adding job with description length: {len(str(job_data['description']))}")
+                started = time.perf_counter()
+                try:
+                    seen_ids = {known_urls[url] for url in scan.seen_urls if url in known_urls}
+                    if seen_ids:
+                        mark_jobs_seen(db, Job, seen_ids)
+                    
+                    if scan.jobs:
+                        matched_ids = set()
+                        jobs_added, jobs_skipped = save_jobs(db, Job, scan.jobs, near_duplicates, matched_ids)
+                        stats['jobs_added'] += jobs_added
+                        stats['jobs_skipped'] += jobs_skipped
+                        # Reposts under a new URL match a stored job by identity, that job is still listed
+                        matched_ids -= seen_ids
+                        if matched_ids:
+                            mark_jobs_seen(db, Job, matched_ids)
+                        logger.info(f"Saved jobs for {terms['search']} in {terms['location']}. {jobs_added} new jobs added, {jobs_skipped} duplicates skipped.")
+                        if jobs_added and 'first_commit' not in stats['timings']:
+                            stats['timings']['first_commit'] = round(time.perf_counter() - run_started, 3)
+                    
+                    # The watermark only moves once the jobs it covers are committed
+                    if ScrapeWatermark is not None and scan.newest_url:
+                        term = (terms['search'], terms['location'])
+                        save_watermarks(db, ScrapeWatermark, {term: scan.newest_url}, full_scan=term in full_scan_terms)
                 
-                # Create new job
-                new_job = Job(
-                    title=job_data['title'],
-                    company=job_data['company'],
-                    location=job_data['location'],
-                    description=job_data['description'],
-                    url=job_data['url'],
-                    salary=job_data['salary'],
-                    posted_date=job_data['posted_date'],
-                    is_active=True
-                )
+                except Exception as e:
+                    db.session.rollback()
+                    logger.error(f"Error saving jobs for {terms['search']} in {terms['location']}: {e}")
+                    stats.setdefault('error', f"Error saving jobs to database: {e}")
                 
-                db.session.add(new_job)
-                jobs_added += 1
-                logger.info(f"Added new job: {job_data['title']}")
+                save_seconds += time.perf_counter() - started
+            
+            stats['timings']['scrape'] = round(time.perf_counter() - run_started - save_seconds, 3)
+            stats['timings']['save'] = round(save_seconds, 3)
             
-            db.session.commit()
-            logger.info(f"Jobs saved to database. {jobs_added} new jobs added, {jobs_skipped} duplicates skipped.")
+            # Only a run that saw every term can tell which jobs have stopped being listed
+            if terms_with_cards == len(search_terms) and 'error' not in stats:
+                started = time.perf_counter()
+                stats['jobs_deactivated'] = sweep_stale_jobs(db, Job)
+                stats['timings']['sweep'] = round(time.perf_counter() - started, 3)
+                if stats['jobs_deactivated']:
+                    logger.info(f"Deactivated {stats['jobs_deactivated']} jobs not listed for {STALE_AFTER.days} days")
+            
+            if not stats['jobs_scraped']:
+                if ScrapeWatermark is not None and terms_with_cards:
+                    # Pages loaded but held nothing new, which is what a steady-state run looks like
+                    logger.info("No new jobs since the last scrape")
+                    return stats
+                logger.error("Could not scrape any jobs from LinkedIn")
+                stats['error'] = "Could not scrape any jobs from LinkedIn"
+                return stats
+            
+            logger.info(f"Jobs saved to database. {stats['jobs_added']} new jobs added, {stats['jobs_skipped']} duplicates skipped.")
         
         except Exception as e:
             db.session.rollback()
-            logger.error(f"Error saving jobs to database: {e}")
+            logger.error(f"Error scraping jobs: {e}")
+            stats['error'] = f"Error scraping jobs: {e}"
         
         finally:
+            stored_jobs.lock.release()
+            for outcome in ('scraped', 'added', 'skipped', 'deactivated'):
+                scraped_jobs.inc(stats[f'jobs_{outcome}'], outcome=outcome)
             # Pop the context if we pushed it
             if app:
                 ctx.pop()
     
     except Exception as e:
-        logger.error(f"Error in scrape_and_save: {e}") 
\ No newline at end of file
+        logger.error(f"Error in scrape_and_save: {e}")
+        stats['error'] = str(e)
+    
+    return stats
@@ -0,0 +1,145 @@
+import re
+import logging
+from sqlalchemy import text, func, literal_column, table, column
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Name of the SQLite FTS5 index that shadows the job table
+FTS_TABLE = 'job_fts'
+
+# Text search configuration used for the PostgreSQL expression index
+PG_TS_CONFIG = 'english'
+
+# Lightweight handle on the FTS5 virtual table, kept out of the model metadata
+# so db.create_all() never tries to create it as a regular table
+job_fts = table(FTS_TABLE, column('rowid'), column('rank'))
+
+# Dialect whose full-text index is installed, None until init_search or search_dialect has found it
+_search_dialect = None
+
+SQLITE_FTS_DDL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description, company,
+        content='job', content_rowid='id'
+    )""",
+    # Keep the index in sync with every write to the job table, whichever code path makes it
+    f"""CREATE TRIGGER IF NOT EXISTS job_fts_ai AFTER INSERT ON job BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description, company)
+        VALUES (new.id, new.title, new.description, new.company);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS job_fts_ad AFTER DELETE ON job BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, company)
+        VALUES ('delete', old.id, old.title, old.description, old.company);
+    END""",
+    # Only writes to the indexed columns touch the index, not the last_seen_at and is_active
+    # updates every scrape makes. Databases set up before that have the trigger on every update
+    "DROP TRIGGER IF EXISTS job_fts_au",
+    f"""CREATE TRIGGER job_fts_au AFTER UPDATE OF title, description, company ON job BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, company)
+        VALUES ('delete', old.id, old.title, old.description, old.company);
+        INSERT INTO {FTS_TABLE}(rowid, title, description, company)
+        VALUES (new.id, new.title, new.description, new.company);
+    END""",
+]
+
+# Queries that find the index installed by init_search, whichever process ran it
+FTS_INSTALLED_SQL = {
+    'sqlite': "SELECT 1 FROM sqlite_master WHERE type = 'trigger' AND name = 'job_fts_ai'",
+    'postgresql': "SELECT 1 FROM pg_indexes WHERE indexname = 'ix_job_search_document'",
+}
+
+PG_DOCUMENT_SQL = (
+    "coalesce(title, '') || ' ' || coalesce(company, '') || ' ' || coalesce(description, '')"
+)
+
+PG_FTS_DDL = [
+    # Expression index, so PostgreSQL maintains it on every write without triggers
+    f"""CREATE INDEX IF NOT EXISTS ix_job_search_document ON job
+        USING GIN (to_tsvector('{PG_TS_CONFIG}', {PG_DOCUMENT_SQL}))""",
+]
+
+def init_search(db):
+    """Create the full-text index for the current database if it doesn't exist.
+
+    Must run after the job table has been created. Databases without a supported
+    full-text engine keep using ilike matching.
+    """
+    global _search_dialect
+    dialect = db.engine.dialect.name
+
+    try:
+        if dialect == 'sqlite':
+            with db.engine.begin() as conn:
+                exists = conn.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                    {'name': FTS_TABLE}
+                ).first()
+                for statement in SQLITE_FTS_DDL:
+                    conn.execute(text(statement))
+                if not exists:
+                    # Index rows that were written before the FTS table existed
+                    conn.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+                    logger.info(f"Built {FTS_TABLE} full-text index")
+        elif dialect == 'postgresql':
+            with db.engine.begin() as conn:
+                for statement in PG_FTS_DDL:
+                    conn.execute(text(statement))
+        else:
+            logger.info(f"No full-text index available for {dialect}, search will use ilike")
+            return
+        _search_dialect = dialect
+    except Exception as e:
+        logger.error(f"Error initializing full-text search: {e}")
+
+def search_dialect(db):
+    """Return the dialect of the installed full-text index, or None to fall back to ilike.
+
+    The index may have been installed by another process, so until it is
+    found the database is checked again on each call. The caller is
+    responsible for the app context.
+    """
+    global _search_dialect
+    dialect = db.engine.dialect.name
+    if _search_dialect is None and dialect in FTS_INSTALLED_SQL:
+        if db.session.execute(text(FTS_INSTALLED_SQL[dialect])).first():
+            _search_dialect = dialect
+    return _search_dialect
+
+def search_tokens(term):
+    """Split a free-text search term into the word tokens used to build a match query"""
+    return re.findall(r'\w+', term.lower())
+
+def apply_search(query, db, Job, term):
+    """Restrict a Job query to rows matching a free-text search term.
+
+    Returns the filtered query and a relevance score expression where lower
+    scores are better matches, or None as the score when the ilike fallback
+    was used and results have no ranking.
+    """
+    tokens = search_tokens(term)
+    dialect = search_dialect(db) if tokens else None
+
+    if dialect == 'sqlite':
+        # Every token must match, as a prefix so partial words still find results
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        query = query.join(job_fts, job_fts.c.rowid == Job.id).filter(
+            literal_column(FTS_TABLE).op('MATCH')(match)
+        )
+        return query, job_fts.c.rank
+
+    if dialect == 'postgresql':
+        document = func.to_tsvector(PG_TS_CONFIG, literal_column(PG_DOCUMENT_SQL))
+        ts_query = func.to_tsquery(PG_TS_CONFIG, ' & '.join(f'{token}:*' for token in tokens))
+        query = query.filter(document.op('@@')(ts_query))
+        # ts_rank is higher for better matches, negate it so lower is better on every backend
+        return query, -func.ts_rank(document, ts_query)
+
+    query = query.filter(
+        db.or_(
+            Job.title.ilike(f'%{term}%'),
+            Job.description.ilike(f'%{term}%'),
+            Job.company.ilike(f'%{term}%')
+        )
+    )
+    return query, None
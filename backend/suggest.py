@@ -0,0 +1,187 @@
+import os
+import time
+import heapq
+import logging
+import threading
+from bisect import bisect_left
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import func
+from facets import facets_maintained
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Job fields that can be completed
+SUGGEST_FIELDS = ('company', 'location')
+
+# Suggestions returned unless the request asks for fewer
+DEFAULT_SUGGESTIONS = 10
+MAX_SUGGESTIONS = 20
+
+# Prefixes matching at most this many values are ranked by scanning them, more
+# than that and the prefix keeps its ranked list, updated in place as counts change
+SCAN_LIMIT = 256
+
+# Writes by other processes aren't seen by this one's write listener, so the
+# counts are also reloaded once they are this old
+SUGGEST_REFRESH_SECONDS = int(os.environ.get('SUGGEST_REFRESH_SECONDS', 30))
+
+# Sorts right after every key that starts with a prefix
+PREFIX_END = '\uffff'
+
+def ranking(entry):
+    count, value = entry
+    return (-count, value.lower(), value)
+
+class PrefixIndex:
+    """Case-insensitive prefix index over the values of one field, ranked by job count.
+
+    Values are kept in a sorted array of lowercased keys, so the values under
+    a prefix are one contiguous range found with two binary searches. Short
+    prefixes match many values, so their top MAX_SUGGESTIONS are cached and
+    kept current by set_count instead of being ranked again on each lookup.
+    """
+
+    def __init__(self):
+        # 'lowercased value\0value', so values differing only in case stay separate,
+        # and the values in the same order
+        self.keys = []
+        self.values = []
+        self.counts = {}
+        # Prefix -> top (count, value) pairs, best first
+        self.top = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def key(value):
+        return f'{value.lower()}\0{value}'
+
+    def set_count(self, value, count):
+        """Set the number of jobs with value, removing it at zero"""
+        with self.lock:
+            old = self.counts.get(value, 0)
+            if count == old:
+                return
+            key = self.key(value)
+            if count <= 0:
+                index = bisect_left(self.keys, key)
+                del self.counts[value]
+                del self.keys[index]
+                del self.values[index]
+            else:
+                if not old:
+                    index = bisect_left(self.keys, key)
+                    self.keys.insert(index, key)
+                    self.values.insert(index, value)
+                self.counts[value] = count
+
+            lowered = value.lower()
+            for length in range(len(lowered) + 1):
+                prefix = lowered[:length]
+                top = self.top.get(prefix)
+                if top is None:
+                    continue
+                ranked = [entry for entry in top if entry[1] != value]
+                if count < old and len(ranked) < len(top):
+                    # A value in the list dropped, the one that replaces it may be anywhere under the prefix
+                    del self.top[prefix]
+                    continue
+                if count > 0:
+                    ranked.append((count, value))
+                    ranked.sort(key=ranking)
+                self.top[prefix] = ranked[:MAX_SUGGESTIONS]
+
+    def update(self, counts):
+        """Apply a full set of counts, touching only the values that changed"""
+        for value in [value for value in self.counts if value not in counts]:
+            self.set_count(value, 0)
+        for value, count in counts.items():
+            if self.counts.get(value) != count:
+                self.set_count(value, count)
+
+    def suggest(self, prefix, limit=DEFAULT_SUGGESTIONS):
+        """Return up to limit (value, count) pairs starting with prefix, most jobs first"""
+        prefix = prefix.lower()
+        with self.lock:
+            top = self.top.get(prefix)
+            if top is None:
+                start = bisect_left(self.keys, prefix)
+                end = bisect_left(self.keys, prefix + PREFIX_END, start)
+                entries = ((self.counts[value], value) for value in self.values[start:end])
+                top = heapq.nsmallest(MAX_SUGGESTIONS, entries, key=ranking)
+                if end - start > SCAN_LIMIT:
+                    self.top[prefix] = top
+        return [(value, count) for count, value in top[:limit]]
+
+    def __len__(self):
+        return len(self.counts)
+
+def load_value_counts(db, Job, JobFacetCount, field):
+    """Count active jobs per value of field, from the facet summary table when it is maintained"""
+    if facets_maintained(db):
+        column = getattr(JobFacetCount, field)
+        query = db.session.query(column, func.sum(JobFacetCount.job_count)).filter(column != '')
+    else:
+        column = getattr(Job, field)
+        query = db.session.query(column, func.count(Job.id)).filter(
+            Job.is_active.is_(True), column.isnot(None), column != ''
+        )
+    return {value: int(count) for value, count in query.group_by(column)}
+
+class SuggestIndex:
+    """Prefix indexes of the company and location values of active jobs.
+
+    Built with refresh, then reloaded on a background thread after every
+    committed job write in this process (see ResponseCache.add_write_listener)
+    and once the counts are SUGGEST_REFRESH_SECONDS old. Each reload only
+    changes the index entries whose counts moved, lookups never wait for one.
+    """
+
+    def __init__(self, app, db, Job, JobFacetCount, refresh_seconds=SUGGEST_REFRESH_SECONDS):
+        self.app = app
+        self.db = db
+        self.Job = Job
+        self.JobFacetCount = JobFacetCount
+        self.refresh_seconds = refresh_seconds
+        self.indexes = {field: PrefixIndex() for field in SUGGEST_FIELDS}
+        self.refreshed_at = None
+        self.refresh_pending = False
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='suggest-refresh')
+
+    def refresh(self):
+        """Reload the counts and apply the changes. The caller is responsible for the app context"""
+        started = time.perf_counter()
+        for field, index in self.indexes.items():
+            index.update(load_value_counts(self.db, self.Job, self.JobFacetCount, field))
+        self.db.session.rollback()
+        self.refreshed_at = time.monotonic()
+        logger.debug(f"Refreshed suggestions in {(time.perf_counter() - started) * 1000:.1f} ms")
+
+    def request_refresh(self):
+        """Queue a background refresh, unless one is already waiting to start"""
+        with self.lock:
+            if self.refresh_pending:
+                return
+            self.refresh_pending = True
+        self.executor.submit(self.run_refresh)
+
+    def run_refresh(self):
+        # Writes committed from here on queue another refresh
+        with self.lock:
+            self.refresh_pending = False
+        with self.app.app_context():
+            try:
+                self.refresh()
+            except Exception as e:
+                self.db.session.rollback()
+                logger.error(f"Error refreshing suggestions: {e}")
+
+    def suggest(self, field, prefix, limit=DEFAULT_SUGGESTIONS):
+        """Return up to limit (value, count) pairs of field starting with prefix"""
+        if self.refreshed_at is None:
+            # First lookup before startup built the index
+            self.refresh()
+        elif time.monotonic() - self.refreshed_at > self.refresh_seconds:
+            self.request_refresh()
+        return self.indexes[field].suggest(prefix, limit)
@@ -0,0 +1,88 @@
+import os
+import sys
+import tempfile
+import threading
+from http.server import ThreadingHTTPServer
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.join(BACKEND_DIR, 'benchmarks'))
+
+# The app binds its database when it is imported, so point it at a scratch file first
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='jobs-tests-'), 'jobs.db')}"
+
+
+@pytest.fixture
+def app():
+    """The Flask app inside an app context, with freshly created tables and triggers"""
+    from app import app, db
+    from sqlalchemy import text
+    from search import init_search, FTS_TABLE
+    from facets import init_facets
+    from changes import init_changes
+    from scraper import stored_jobs
+
+    # Jobs kept from a previous test's database
+    stored_jobs.reset()
+    with app.app_context():
+        db.drop_all()
+        # The full-text table isn't a model, drop_all leaves it behind
+        with db.engine.begin() as conn:
+            conn.execute(text(f"DROP TABLE IF EXISTS {FTS_TABLE}"))
+        db.create_all()
+        init_search(db)
+        init_facets(db)
+        init_changes(db)
+        yield app
+        db.session.rollback()
+
+
+@pytest.fixture
+def db(app):
+    from app import db
+    return db
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def serve():
+    """Start benchmarks/fixture_server.py servers on free local ports, returning their base URLs"""
+    from fixture_server import make_handler, PAGE_SIZE
+
+    servers = []
+
+    def start(mode='paged', total=PAGE_SIZE, revision=1, validators=True):
+        server = ThreadingHTTPServer(
+            ('127.0.0.1', 0), make_handler(mode, total, batches_per_button=3, delay=0.0,
+                                           revision=revision, validators=validators)
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f'http://127.0.0.1:{server.server_address[1]}'
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def unlimited_rate(monkeypatch):
+    """Let page loads from the fixture server through without the per-host rate limit"""
+    import scraper
+    import enrich
+
+    limiter = scraper.RateLimiter(1000, 1000)
+    monkeypatch.setattr(scraper, 'rate_limiter', limiter)
+    monkeypatch.setattr(enrich, 'rate_limiter', limiter)
+
+
+def detail_url(base_url, index, slug='python'):
+    """URL of a fixture job as its card links to it, tracking parameters included"""
+    return f'{base_url}/jobs/view/{slug}-{100000 + index}?refId={index:08x}'
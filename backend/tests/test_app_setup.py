@@ -0,0 +1,64 @@
+import sqlite3
+
+import pytest
+
+import facets
+import main
+import search
+from app import Job
+from test_migrations import flask_db, upgrade
+from conftest import BACKEND_DIR
+
+
+def test_serving_the_app_installs_the_triggers(tmp_path):
+    path = tmp_path / 'migrated.db'
+    upgrade(path, 'head')
+    # What any process serving the app does, flask run or a WSGI worker
+    result = flask_db(path, 'current')
+    assert result.returncode == 0, result.stderr
+
+    conn = sqlite3.connect(path)
+    try:
+        names = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")}
+    finally:
+        conn.close()
+    assert {search.FTS_TABLE, 'job_fts_au', 'job_facet_ai', 'job_change_ai'} <= names
+
+
+def test_a_process_that_did_not_install_them_still_uses_them(db, monkeypatch):
+    # As in a worker whose init lost a race with another process's
+    monkeypatch.setattr(search, '_search_dialect', None)
+    monkeypatch.setattr(facets, '_facet_dialect', None)
+
+    _, score = search.apply_search(db.session.query(Job), db, Job, 'python')
+    assert score is not None
+    assert facets.facets_maintained(db)
+
+
+class FakeLease:
+    def __init__(self, leader):
+        self.leader = leader
+
+    def heartbeat(self):
+        return self.leader
+
+
+class FakeWorker:
+    def __init__(self):
+        self.triggers = []
+
+    def submit(self, trigger):
+        self.triggers.append(trigger)
+        return {'id': len(self.triggers)}, True
+
+
+@pytest.mark.parametrize('leader, triggers', [(True, ['startup']), (False, [])])
+def test_only_the_lease_holder_scrapes_at_startup(monkeypatch, leader, triggers):
+    worker = FakeWorker()
+    monkeypatch.setattr(main, 'create_db', lambda: None)
+    monkeypatch.setattr(main, 'init_scheduler', lambda: FakeLease(leader))
+    monkeypatch.setattr(main, 'get_scrape_worker', lambda: worker)
+    monkeypatch.setattr(main.app, 'run', lambda **kwargs: None)
+
+    main.main()
+    assert worker.triggers == triggers
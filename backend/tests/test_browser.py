@@ -0,0 +1,72 @@
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+import browser
+from browser import BrowserPool
+
+
+@pytest.fixture
+def unresolved(monkeypatch):
+    """A process that hasn't looked for chromedriver yet, with no CHROMEDRIVER_PATH set"""
+    monkeypatch.setattr(browser, '_driver_path', None)
+    monkeypatch.setattr(browser, '_driver_path_resolved', False)
+    monkeypatch.setattr(browser, 'CHROMEDRIVER_PATH', None)
+    downloads = []
+
+    class ChromeDriverManager:
+        def install(self):
+            downloads.append(self)
+            raise ValueError("offline")
+
+    monkeypatch.setattr(browser, 'ChromeDriverManager', ChromeDriverManager)
+    return downloads
+
+
+def test_a_local_chromedriver_is_used_without_the_driver_manager(unresolved, monkeypatch):
+    monkeypatch.setattr(browser.shutil, 'which', lambda name: '/usr/local/bin/chromedriver')
+    assert browser.resolve_driver_path() == '/usr/local/bin/chromedriver'
+    assert unresolved == []
+
+
+def test_a_failed_resolution_is_not_retried(unresolved, monkeypatch):
+    monkeypatch.setattr(browser.shutil, 'which', lambda name: None)
+    assert browser.resolve_driver_path() is None
+    assert browser.resolve_driver_path() is None
+    assert len(unresolved) == 1
+
+
+class FakeDriver:
+    def __init__(self):
+        self.alive = True
+        self.closed = False
+
+    @property
+    def current_url(self):
+        if not self.alive:
+            raise WebDriverException("chrome not reachable")
+        return 'about:blank'
+
+    def execute_script(self, script):
+        return 0
+
+    def quit(self):
+        self.closed = True
+
+
+def test_idle_browsers_that_died_are_replaced():
+    started = []
+
+    def create_driver():
+        started.append(FakeDriver())
+        return started[-1]
+
+    pool = BrowserPool(create_driver, size=1)
+    first = pool.acquire()
+    pool.release(first)
+    # Chrome crashed between runs
+    first.alive = False
+
+    second = pool.acquire()
+    assert second is not first and second.alive
+    assert first.closed
+    assert pool.pages_loaded == {second: 0}
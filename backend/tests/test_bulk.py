@@ -0,0 +1,97 @@
+from app import Job
+
+
+def seed(client, *jobs):
+    results = client.post('/api/jobs/bulk', json={'create': list(jobs)}).get_json()['create']
+    return [result['id'] for result in results]
+
+
+def test_bulk_applies_every_list(client):
+    first, second = seed(
+        client,
+        {'title': 'Python Developer', 'company': 'Acme', 'url': 'https://example.com/1'},
+        {'title': 'Java Developer', 'company': 'Acme', 'url': 'https://example.com/2'},
+    )
+    response = client.post('/api/jobs/bulk', json={
+        'create': [{'title': 'Go Developer', 'company': 'Acme'}],
+        'update': [{'id': first, 'salary': '100k'}, {'id': 999, 'salary': '1'}],
+        'delete': [second, 999],
+    })
+    assert response.status_code == 200
+    results = response.get_json()
+    assert results['create'][0]['status'] == 'created'
+    assert [item['status'] for item in results['update']] == ['updated', 'not_found']
+    assert [item['status'] for item in results['delete']] == ['deleted', 'not_found']
+
+
+def test_create_conflict_only_skips_that_item(client):
+    seed(client, {'title': 'Python Developer', 'company': 'Acme', 'url': 'https://example.com/1'})
+    results = client.post('/api/jobs/bulk', json={'create': [
+        {'title': 'Sr. Python Developer', 'company': 'Other', 'url': 'https://example.com/1'},
+        {'title': 'python developer', 'company': 'Acme Ltd.'},
+        {'title': 'Java Developer', 'company': 'Acme'},
+    ]}).get_json()['create']
+    assert [item['status'] for item in results] == ['conflict', 'conflict', 'created']
+
+
+def test_update_onto_another_jobs_title_is_a_conflict_for_that_item_only(client, db):
+    first, second = seed(
+        client,
+        {'title': 'A', 'company': 'Acme', 'location': 'Lahore'},
+        {'title': 'B', 'company': 'Acme', 'location': 'Lahore'},
+    )
+    response = client.post('/api/jobs/bulk', json={
+        'create': [{'title': 'C', 'company': 'Acme'}],
+        'update': [{'id': second, 'title': 'A'}, {'id': first, 'salary': '100k'}],
+        'delete': [],
+    })
+    assert response.status_code == 200
+    results = response.get_json()
+    assert results['create'][0]['status'] == 'created'
+    assert [item['status'] for item in results['update']] == ['conflict', 'updated']
+    assert db.session.get(Job, second).title == 'B'
+    assert db.session.get(Job, first).salary == '100k'
+
+
+def test_update_onto_another_jobs_url_is_a_conflict(client):
+    first, second = seed(
+        client,
+        {'title': 'A', 'company': 'Acme', 'url': 'https://example.com/a'},
+        {'title': 'B', 'company': 'Acme', 'url': 'https://example.com/b'},
+    )
+    results = client.post('/api/jobs/bulk', json={'update': [
+        {'id': second, 'url': 'https://example.com/a'},
+        {'id': first, 'url': 'https://example.com/a'},
+    ]}).get_json()['update']
+    assert [item['status'] for item in results] == ['conflict', 'updated']
+
+
+def test_updates_claiming_the_same_key_or_a_created_one_conflict(client):
+    first, second = seed(client, {'title': 'A', 'company': 'Acme'}, {'title': 'B', 'company': 'Acme'})
+    results = client.post('/api/jobs/bulk', json={
+        'create': [{'title': 'New', 'company': 'Acme', 'url': 'https://example.com/new'}],
+        'update': [
+            {'id': first, 'title': 'Shared'},
+            {'id': second, 'title': 'Shared'},
+            {'id': second, 'url': 'https://example.com/new'},
+        ],
+    }).get_json()
+    assert [item['status'] for item in results['update']] == ['updated', 'conflict', 'conflict']
+
+
+def test_items_with_wrongly_typed_fields_are_errors_of_their_own(client):
+    (job_id,) = seed(client, {'title': 'Python Developer', 'company': 'Acme'})
+    response = client.post('/api/jobs/bulk', json={
+        'create': [
+            {'title': 5, 'company': 'Acme'},
+            {'title': 'Go Developer', 'company': 'Acme', 'location': ['Lahore']},
+            {'title': 'Java Developer', 'company': 'Acme', 'is_active': 'yes'},
+            {'title': 'Rust Developer', 'company': 'Acme'},
+        ],
+        'update': [{'id': job_id, 'company': {'name': 'Acme'}}, {'id': job_id, 'salary': '100k'}],
+    })
+    assert response.status_code == 200
+    results = response.get_json()
+    assert [item['status'] for item in results['create']] == ['error', 'error', 'error', 'created']
+    assert results['create'][0]['error'] == 'title must be a string'
+    assert [item['status'] for item in results['update']] == ['error', 'updated']
@@ -0,0 +1,33 @@
+import gzip
+
+import pytest
+
+from app import Job
+
+
+@pytest.fixture
+def jobs(db):
+    # Enough jobs that the listing is large enough to be gzipped
+    for index in range(30):
+        db.session.add(Job(title=f'Python Developer {index}', company='Acme', location='Lahore',
+                           url=f'https://example.com/jobs/view/{index}'))
+    db.session.commit()
+
+
+def test_each_encoding_has_its_own_etag(client, jobs):
+    plain = client.get('/api/jobs')
+    gzipped = client.get('/api/jobs', headers={'Accept-Encoding': 'gzip'})
+    assert gzipped.headers['Content-Encoding'] == 'gzip'
+    assert gzip.decompress(gzipped.data) == plain.data
+    assert plain.headers['ETag'] != gzipped.headers['ETag']
+
+    for response, headers in ((plain, {}), (gzipped, {'Accept-Encoding': 'gzip'})):
+        revalidated = client.get('/api/jobs', headers={**headers, 'If-None-Match': response.headers['ETag']})
+        assert revalidated.status_code == 304
+        assert revalidated.headers['ETag'] == response.headers['ETag']
+
+    # A tag for the other encoding doesn't validate this one
+    assert client.get('/api/jobs', headers={'If-None-Match': gzipped.headers['ETag']}).data == plain.data
+    crossed = client.get('/api/jobs', headers={'Accept-Encoding': 'gzip', 'If-None-Match': plain.headers['ETag']})
+    assert crossed.status_code == 200
+    assert crossed.headers['ETag'] == gzipped.headers['ETag']
@@ -0,0 +1,84 @@
+import pytest
+
+from dedup import (
+    job_fingerprint, job_simhash, near_duplicate_key, title_overlap, SimHashIndex
+)
+
+
+def index_of(*jobs):
+    index = SimHashIndex()
+    for job_id, (title, company, location) in enumerate(jobs, start=1):
+        index.add(job_simhash(title, company, location), near_duplicate_key(title, company, location), job_id)
+    return index
+
+
+def find(index, title, company, location):
+    return index.find(job_simhash(title, company, location), near_duplicate_key(title, company, location))
+
+
+@pytest.mark.parametrize('first, second', [
+    ('Sr. Python Developer', 'Senior Python Developer'),
+    ('Software Engineer II', 'software engineer 2'),
+    ('Python Dev', 'Python Developer'),
+])
+def test_fingerprint_ignores_abbreviations_and_case(first, second):
+    assert job_fingerprint(first, 'Acme (Pvt.) Ltd.', 'Lahore, Punjab, Pakistan') == \
+        job_fingerprint(second, 'acme', 'Lahore')
+
+
+# Distinct roles at one company hash only a few bits apart
+@pytest.mark.parametrize('stored, scraped', [
+    ('Frontend Developer', 'Backend Developer'),
+    ('iOS Engineer', 'Android Developer'),
+    ('Java Developer', '.NET Developer'),
+    ('Developer 1', 'Developer 2'),
+    ('Senior Software Engineer', 'Software Engineer'),
+    ('Data Engineer', 'Data Scientist'),
+    ('Python Developer', 'Python Developer Intern'),
+])
+def test_distinct_roles_are_not_near_duplicates(stored, scraped):
+    index = index_of((stored, 'Acme', 'Lahore'))
+    assert find(index, scraped, 'Acme', 'Lahore') is None
+
+
+def test_distinct_role_pairs_at_one_company_are_never_matched():
+    roles = ['Frontend', 'Backend', 'Full Stack', 'iOS', 'Android', 'Java', '.NET', 'Python', 'React',
+             'Node.js', 'DevOps', 'QA', 'Data', 'Machine Learning', 'Embedded', 'Game']
+    kinds = ['Developer', 'Engineer', 'Intern']
+    titles = [f'{role} {kind}' for role in roles for kind in kinds]
+    index = SimHashIndex()
+    for title in titles:
+        key = near_duplicate_key(title, 'Acme', 'Lahore')
+        simhash = job_simhash(title, 'Acme', 'Lahore')
+        assert index.find(simhash, key) is None, title
+        index.add(simhash, key)
+
+
+def test_same_title_elsewhere_is_not_a_near_duplicate():
+    index = index_of(('Python Developer Remote', 'Acme', 'Lahore'))
+    assert find(index, 'Remote Python Developer', 'Acme', 'Karachi') is None
+    assert find(index, 'Remote Python Developer', 'Globex', 'Lahore') is None
+
+
+def test_reworded_title_is_a_near_duplicate():
+    index = index_of(('Software Engineer Backend', 'Acme', 'Lahore'))
+    match = find(index, 'Backend Software Engineer', 'Acme Ltd.', 'Lahore, Pakistan')
+    assert match is not None and match[0] == 1
+
+
+def test_title_overlap():
+    assert title_overlap('python developer', 'developer python') == 1.0
+    assert title_overlap('frontend developer', 'backend developer') == pytest.approx(1 / 3)
+    assert title_overlap('', 'developer') == 0.0
+
+
+def test_removed_jobs_are_no_longer_found():
+    index = index_of(('Software Engineer Backend', 'Acme', 'Lahore'), ('Python Developer', 'Acme', 'Lahore'))
+    index.add(job_simhash('Data Engineer', 'Acme', 'Lahore'), near_duplicate_key('Data Engineer', 'Acme', 'Lahore'))
+
+    index.remove(1)
+    index.remove(None)
+    assert find(index, 'Backend Software Engineer', 'Acme', 'Lahore') is None
+    assert find(index, 'Data Engineer', 'Acme', 'Lahore') is None
+    assert find(index, 'Python Developer', 'Acme', 'Lahore') == (2, 0)
+    assert len(index) == 1
@@ -0,0 +1,102 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+import enrich
+from app import Job, JobDetail
+from conftest import detail_url
+
+pytestmark = pytest.mark.usefixtures('unlimited_rate')
+
+
+@pytest.fixture(autouse=True)
+def local_postings(monkeypatch):
+    # The fixture server stands in for the job site
+    monkeypatch.setattr(enrich, 'POSTING_HOSTS', enrich.POSTING_HOSTS | {'127.0.0.1'})
+
+
+def scraped_job(index, url):
+    return Job(title=f'Job {index}', company='Acme', url=url, last_seen_at=datetime.utcnow())
+
+
+def test_detail_fetch_sends_validators_and_skips_unchanged_pages(serve):
+    base_url = serve()
+    first = enrich.fetch_detail(detail_url(base_url, 3), {})
+    assert first['status'] == 'changed'
+    assert first['etag'] == '"100003-1"'
+    assert 'revision 1' in first['fields']['description']
+
+    cached = {'etag': first['etag'], 'content_hash': first['content_hash']}
+    assert enrich.fetch_detail(detail_url(base_url, 3), cached) == {'status': 'not_modified'}
+
+    # The posting was edited, so the old ETag no longer matches
+    edited = enrich.fetch_detail(detail_url(serve(revision=2), 3), cached)
+    assert edited['status'] == 'changed'
+    assert edited['etag'] == '"100003-2"'
+    assert 'revision 2' in edited['fields']['description']
+
+
+def test_detail_fetch_without_validators_compares_content(serve):
+    base_url = serve(validators=False)
+    first = enrich.fetch_detail(detail_url(base_url, 3), {})
+    assert first['status'] == 'changed'
+    assert first['etag'] is None
+
+    # The page differs in its tracking token on every request, the content hash doesn't
+    second = enrich.fetch_detail(detail_url(base_url, 3), {'content_hash': first['content_hash']})
+    assert second['status'] == 'unchanged'
+    assert second['content_hash'] == first['content_hash']
+
+
+def test_enrich_jobs_rescrape_only_updates_edited_postings(db, serve, monkeypatch):
+    base_url = serve()
+    for index in range(4):
+        db.session.add(scraped_job(index, detail_url(base_url, index)))
+    db.session.commit()
+    # Every job is due again on the next run
+    monkeypatch.setattr(enrich, 'ENRICH_REFRESH', timedelta(0))
+
+    stats = enrich.enrich_jobs(db, Job, JobDetail, max_workers=2)
+    assert (stats['fetched'], stats['updated']) == (4, 4)
+    assert all('revision 1' in job.description for job in Job.query)
+
+    stats = enrich.enrich_jobs(db, Job, JobDetail, max_workers=2)
+    assert (stats['fetched'], stats['not_modified'], stats['updated']) == (4, 4, 0)
+
+    # Point two jobs at a server with edited postings
+    edited_url = serve(revision=2)
+    edited = Job.query.order_by(Job.id).limit(2).all()
+    for index, job in enumerate(edited):
+        job.url = detail_url(edited_url, index)
+    db.session.commit()
+
+    stats = enrich.enrich_jobs(db, Job, JobDetail, max_workers=2)
+    assert (stats['fetched'], stats['not_modified'], stats['updated']) == (4, 2, 2)
+    revisions = ['revision 2' in job.description for job in Job.query.order_by(Job.id)]
+    assert revisions == [True, True, False, False]
+
+
+def test_enrich_jobs_leaves_jobs_entered_by_hand_alone(db, serve, client):
+    base_url = serve()
+    # Posted through the API, with a link to a posting the enricher could fetch
+    client.post('/api/jobs', json={
+        'title': 'Job 0', 'company': 'Acme', 'description': 'Written by hand', 'url': detail_url(base_url, 0)
+    })
+    stats = enrich.enrich_jobs(db, Job, JobDetail)
+    assert stats['fetched'] == 0
+    assert Job.query.one().description == 'Written by hand'
+
+
+@pytest.mark.parametrize('url', [
+    'http://169.254.169.254/jobs/view/latest-1',
+    'https://www.linkedin.com.example.com/jobs/view/python-1',
+    'file:///etc/passwd',
+    'https://www.linkedin.com/company/acme',
+])
+def test_only_job_postings_on_the_scraped_site_are_fetched(url):
+    assert enrich.fetch_detail(url, {}) == {'status': 'failed', 'error': "Not a job posting on the scraped site"}
+
+
+def test_postings_on_site_subdomains_are_fetched():
+    assert enrich.is_posting_url('https://pk.linkedin.com/jobs/view/python-developer-1')
+    assert enrich.is_posting_url('https://www.linkedin.com/jobs/view/python-developer-1')
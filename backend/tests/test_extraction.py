@@ -0,0 +1,125 @@
+import lxml.html
+import pytest
+
+import scraper
+
+BASE_URL = 'https://www.linkedin.com/jobs/search?keywords=python&location=Lahore'
+
+
+def page(cards):
+    return f'<html><body><ul class="jobs-search__results-list">{cards}</ul></body></html>'
+
+
+def expected(title, company, location, url):
+    return {
+        'title': title,
+        'company': company,
+        'location': location,
+        'description': url,
+        'url': url,
+        'salary': 'N/A',
+        'is_active': True,
+    }
+
+
+# Card markup seen on the results page, and the job data both extractors should return for it
+CARDS = {
+    'basic': (
+        '<li><div class="base-search-card__info">'
+        '<a href="https://www.linkedin.com/jobs/view/python-developer-1?refId=a"></a>'
+        '<h3 class="base-search-card__title">Python Developer</h3>'
+        '<h4 class="base-search-card__subtitle">Acme</h4>'
+        '<span class="job-search-card__location">Lahore, Punjab, Pakistan</span>'
+        '</div></li>',
+        expected('Python Developer', 'Acme', 'Lahore, Punjab, Pakistan',
+                 'https://www.linkedin.com/jobs/view/python-developer-1?refId=a'),
+    ),
+    'screen reader title': (
+        '<li><div class="base-search-card__info">'
+        '<a href="https://www.linkedin.com/jobs/view/data-engineer-2"></a>'
+        '<h3 class="base-search-card__title">Data Engineer<span class="sr-only">Data Engineer</span></h3>'
+        '<h4 class="base-search-card__subtitle"><a href="https://www.linkedin.com/company/globex">Globex</a></h4>'
+        '<span class="job-search-card__location">Karachi</span>'
+        '</div></li>',
+        expected('Data Engineer', 'Globex', 'Karachi', 'https://www.linkedin.com/jobs/view/data-engineer-2'),
+    ),
+    'hidden location suffix': (
+        '<li><div class="base-search-card__info">'
+        '<a href="https://www.linkedin.com/jobs/view/qa-engineer-3"></a>'
+        '<h3 class="base-search-card__title">QA Engineer</h3>'
+        '<h4 class="base-search-card__subtitle">Initech</h4>'
+        '<span class="job-search-card__location">Islamabad'
+        '<span style="display: none">(Hybrid)</span><span hidden>Remote</span></span>'
+        '</div></li>',
+        expected('QA Engineer', 'Initech', 'Islamabad', 'https://www.linkedin.com/jobs/view/qa-engineer-3'),
+    ),
+    'title in parent': (
+        '<li><h3>Backend Developer</h3><h4>Hooli</h4>'
+        '<div class="base-search-card__info">'
+        '<a href="/jobs/view/backend-developer-4"></a>'
+        '<span class="job-search-card__location">Lahore</span>'
+        '</div></li>',
+        expected('Backend Developer', 'Hooli', 'Lahore', 'https://www.linkedin.com/jobs/view/backend-developer-4'),
+    ),
+    'whitespace': (
+        '<li><div class="base-search-card__info">'
+        '<a href="https://www.linkedin.com/jobs/view/devops-engineer-5"></a>'
+        '<h3 class="base-search-card__title">\n      DevOps\n      Engineer\n    </h3>'
+        '<h4 class="base-search-card__subtitle">  Umbrella   Corp </h4>'
+        '<span class="job-search-card__location"><span>Rawalpindi</span><br>Punjab</span>'
+        '</div></li>',
+        expected('DevOps Engineer', 'Umbrella Corp', 'Rawalpindi Punjab',
+                 'https://www.linkedin.com/jobs/view/devops-engineer-5'),
+    ),
+}
+
+
+def without_posted_date(job):
+    return {key: value for key, value in job.items() if key != 'posted_date'}
+
+
+def extract_html(html):
+    cards = scraper.find_job_cards_html(lxml.html.fromstring(html))
+    return [without_posted_date(scraper.extract_job_details_html(card, BASE_URL)) for card in cards]
+
+
+@pytest.mark.parametrize('name', CARDS)
+def test_html_extraction(name):
+    card, job = CARDS[name]
+    assert extract_html(page(card)) == [job]
+
+
+def test_element_text_skips_hidden_elements():
+    element = lxml.html.fromstring(
+        '<div>Visible <span class="visually-hidden">skip</span>text<!-- note --> '
+        '<b style="visibility:hidden">skip</b>here</div>'
+    )
+    assert scraper.element_text(element) == 'Visible text here'
+    assert scraper.element_text(lxml.html.fromstring('<span hidden>skip</span>')) == ''
+
+
+@pytest.fixture(scope='module')
+def driver():
+    driver = scraper.setup_driver()
+    if driver is None:
+        pytest.skip("Chrome is not available")
+    yield driver
+    driver.quit()
+
+
+def test_selenium_extraction_matches_html(driver, tmp_path):
+    html = page(''.join(card for card, _ in CARDS.values()))
+    path = tmp_path / 'results.html'
+    path.write_text(html, encoding='utf-8')
+    driver.get(path.as_uri())
+
+    # Relative links resolve against the page, so compare against the file's own URL
+    html_jobs = [
+        without_posted_date(scraper.extract_job_details_html(card, path.as_uri()))
+        for card in scraper.find_job_cards_html(lxml.html.fromstring(html))
+    ]
+    selenium_jobs = [
+        without_posted_date(scraper.extract_job_details_selenium(card))
+        for card in scraper.find_job_cards_selenium(driver)
+    ]
+    assert selenium_jobs == html_jobs
@@ -0,0 +1,61 @@
+import pytest
+
+import scraper
+from fixture_server import PAGE_SIZE
+from conftest import detail_url
+
+pytestmark = pytest.mark.usefixtures('unlimited_rate')
+
+
+@pytest.fixture(scope='module')
+def driver():
+    driver = scraper.setup_driver()
+    if driver is None:
+        pytest.skip("Chrome is not available")
+    yield driver
+    driver.quit()
+
+
+@pytest.fixture
+def harvest(driver, serve, monkeypatch):
+    """Scrape one term from a fresh fixture server with the given limits, the jobs at known already stored"""
+    def run(mode, total, max_pages=100, max_cards=10000, known=(), stop_at_known=True):
+        base_url = serve(mode, total)
+        monkeypatch.setattr(scraper, 'LINKEDIN_BASE_URL', base_url)
+        monkeypatch.setattr(scraper, 'SCRAPER_MAX_PAGES', max_pages)
+        monkeypatch.setattr(scraper, 'SCRAPER_MAX_CARDS', max_cards)
+        known_urls = {scraper.canonical_job_url(detail_url(base_url, index)) for index in known}
+        return scraper.scrape_search_term(
+            driver, 'python', 'Pakistan', known_urls=known_urls, stop_at_known=stop_at_known
+        )
+    return run
+
+
+@pytest.mark.parametrize('mode', ['scroll', 'paged'])
+def test_harvest_reads_every_result_once_and_stops_when_they_run_out(harvest, mode):
+    # Enough batches that the scroll list needs the "See more jobs" button pressed
+    total = PAGE_SIZE * 7
+    scan = harvest(mode, total, stop_at_known=False)
+    assert scan.card_count == total
+    assert len({job['url'] for job in scan.jobs}) == total
+    assert len(set(scan.seen_urls)) == total
+    # The first page, then one load per further batch or page
+    assert scan.pages_loaded == total // PAGE_SIZE
+
+
+@pytest.mark.parametrize('mode', ['scroll', 'paged'])
+def test_harvest_stops_at_the_load_limit(harvest, mode):
+    scan = harvest(mode, PAGE_SIZE * 7, max_pages=3, stop_at_known=False)
+    assert scan.card_count == PAGE_SIZE * 3
+    assert scan.pages_loaded == 3
+
+
+@pytest.mark.parametrize('mode', ['scroll', 'paged'])
+def test_harvest_stops_at_known_jobs(harvest, mode):
+    total = PAGE_SIZE * 4
+    # Jobs from the middle of the second batch down were stored by an earlier run
+    known_from = PAGE_SIZE + 10
+    scan = harvest(mode, total, known=range(known_from, total))
+    assert len(scan.jobs) == known_from
+    assert scan.known == scraper.KNOWN_CARDS_TO_STOP
+    assert scan.reached_known
@@ -0,0 +1,30 @@
+import pytest
+
+
+@pytest.mark.parametrize('data', [
+    {'title': 5, 'company': 'Acme'},
+    {'title': 'Python Developer', 'company': 'Acme', 'location': ['Lahore']},
+    {'title': 'Python Developer', 'company': 'Acme', 'is_active': 1},
+    ['Python Developer'],
+])
+def test_create_rejects_wrongly_typed_fields(client, data):
+    assert client.post('/api/jobs', json=data).status_code == 400
+
+
+@pytest.mark.parametrize('data', [
+    {'title': 5},
+    {'company': None},
+    {'location': {'city': 'Lahore'}},
+    {'is_active': 'false'},
+])
+def test_update_rejects_wrongly_typed_fields(client, data):
+    job_id = client.post('/api/jobs', json={'title': 'Python Developer', 'company': 'Acme'}).get_json()['id']
+    assert client.put(f'/api/jobs/{job_id}', json=data).status_code == 400
+    assert client.get(f'/api/jobs/{job_id}').get_json()['title'] == 'Python Developer'
+
+
+def test_update_accepts_a_partial_job(client):
+    job_id = client.post('/api/jobs', json={'title': 'Python Developer', 'company': 'Acme'}).get_json()['id']
+    response = client.put(f'/api/jobs/{job_id}', json={'location': None, 'is_active': False})
+    assert response.status_code == 200
+    assert response.get_json()['is_active'] is False
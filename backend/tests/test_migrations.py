@@ -0,0 +1,65 @@
+import os
+import sqlite3
+import subprocess
+import sys
+
+from conftest import BACKEND_DIR
+
+
+def flask_db(path, *args):
+    return subprocess.run(
+        [sys.executable, '-m', 'flask', '--app', 'app', 'db', *args],
+        cwd=BACKEND_DIR, env={**os.environ, 'DATABASE_URL': f'sqlite:///{path}'},
+        capture_output=True, text=True
+    )
+
+
+def upgrade(path, revision):
+    result = flask_db(path, 'upgrade', revision)
+    assert result.returncode == 0, result.stderr
+
+
+def test_migrations_build_every_model_table(tmp_path):
+    path = tmp_path / 'migrated.db'
+    upgrade(path, 'head')
+    result = flask_db(path, 'check')
+    assert result.returncode == 0, result.stderr
+
+
+def test_scraped_job_urls_are_made_canonical(tmp_path):
+    path = tmp_path / 'migrated.db'
+    upgrade(path, 'a7e4c2b9d518')
+    conn = sqlite3.connect(path)
+    try:
+        conn.executemany(
+            "INSERT INTO job (id, title, company, url, fingerprint, is_active) VALUES (?, ?, 'Acme', ?, ?, 1)",
+            [
+                (1, 'Python Developer', 'https://www.linkedin.com/jobs/view/python-1?refId=a', 'f1'),
+                # The same posting saved again from a later page load
+                (2, 'Python Engineer', 'https://www.linkedin.com/jobs/view/python-1?refId=b', 'f2'),
+                (3, 'Java Developer', 'https://www.linkedin.com/jobs/view/java-2', 'f3'),
+                (4, 'Go Developer', 'https://www.linkedin.com/jobs/view/java-2/?trackingId=c', 'f4'),
+                # Added by hand, its query string may matter
+                (5, 'Data Engineer', 'https://careers.example.com/apply?job=5', 'f5'),
+                # Saved first with tracking parameters, then again already canonical
+                (6, 'Rust Developer', 'https://www.linkedin.com/jobs/view/rust-3?refId=d', 'f6'),
+                (7, 'Rust Engineer', 'https://www.linkedin.com/jobs/view/rust-3', 'f7'),
+            ]
+        )
+        conn.executemany("INSERT INTO job_detail (job_id, etag) VALUES (?, 'x')", [(2,), (7,)])
+        conn.commit()
+    finally:
+        conn.close()
+
+    upgrade(path, 'head')
+    conn = sqlite3.connect(path)
+    try:
+        assert conn.execute("SELECT id, url FROM job ORDER BY id").fetchall() == [
+            (1, 'https://www.linkedin.com/jobs/view/python-1'),
+            (3, 'https://www.linkedin.com/jobs/view/java-2'),
+            (5, 'https://careers.example.com/apply?job=5'),
+            (6, 'https://www.linkedin.com/jobs/view/rust-3'),
+        ]
+        assert conn.execute("SELECT job_id FROM job_detail").fetchall() == []
+    finally:
+        conn.close()
@@ -0,0 +1,125 @@
+"""EXPLAIN QUERY PLAN checks that the listing queries are served by their indexes.
+
+A partial index is only used when the query's predicate matches its WHERE
+clause exactly, so these fail if the model, the migrations and the queries
+drift apart.
+"""
+import os
+import sqlite3
+import subprocess
+import sys
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app import Job, response_cache
+from conftest import BACKEND_DIR
+
+
+def capture_queries(db, client, url):
+    """Run a request and return the (sql, parameters) of its SELECTs on the job table"""
+    statements = []
+    # Background refreshes, like the suggestions', run their own queries meanwhile
+    thread = threading.get_ident()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if threading.get_ident() != thread:
+            return
+        if statement.lstrip().upper().startswith('SELECT') and 'FROM job' in statement:
+            statements.append((statement, parameters))
+
+    # A cached response wouldn't run the query
+    response_cache.bump()
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.get(url)
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    assert response.status_code == 200
+    assert statements
+    return statements
+
+
+def query_plan(conn, statement, parameters):
+    rows = conn.execute(f'EXPLAIN QUERY PLAN {statement}', parameters).fetchall()
+    return ' | '.join(row[-1] for row in rows)
+
+
+@pytest.fixture
+def jobs(db):
+    now = datetime.utcnow()
+    db.session.add_all(
+        Job(
+            title=f'Developer {i}', company=f'Company {i % 7}', location='Lahore',
+            url=f'https://example.com/jobs/view/{i}', posted_date=now - timedelta(hours=i),
+            is_active=i % 5 != 0
+        )
+        for i in range(200)
+    )
+    db.session.commit()
+
+
+def cursor_url(client, url):
+    next_cursor = client.get(url).get_json()['next_cursor']
+    return f'{url}&cursor={next_cursor}'
+
+
+LISTINGS = [
+    ('/api/jobs?limit=20', 'ix_job_active_posted_date_id'),
+    ('/api/jobs?limit=20&company=Company 3', 'ix_job_active_posted_date_id'),
+    ('/api/jobs?limit=20&location=Lahore', 'ix_job_active_posted_date_id'),
+    ('/api/jobs?limit=20&active=false', 'ix_job_posted_date_id'),
+    ('/api/jobs?limit=20&active=all', 'ix_job_posted_date_id'),
+]
+
+
+def listing_queries(db, client, with_cursor):
+    for url, index in LISTINGS:
+        if with_cursor:
+            url = cursor_url(client, url)
+        statement, parameters = capture_queries(db, client, url)[-1]
+        yield url, index, statement, parameters
+
+
+@pytest.mark.parametrize('with_cursor', [False, True], ids=['first_page', 'cursor_page'])
+def test_listings_read_the_posted_date_index_in_order(db, client, jobs, with_cursor):
+    conn = db.engine.raw_connection()
+    try:
+        for url, index, statement, parameters in listing_queries(db, client, with_cursor):
+            plan = query_plan(conn, statement, parameters)
+            assert f'USING INDEX {index}' in plan, f'{url}: {plan}'
+            # Sorting the matches would read every one of them before returning a page
+            assert 'TEMP B-TREE' not in plan, f'{url}: {plan}'
+    finally:
+        conn.close()
+
+
+def test_sweep_reads_the_last_seen_index(db):
+    conn = db.engine.raw_connection()
+    try:
+        plan = query_plan(
+            conn, 'SELECT id FROM job WHERE job.is_active IS 1 AND job.last_seen_at < ?', ('2026-01-01',)
+        )
+        assert 'USING INDEX ix_job_active_last_seen_at' in plan, plan
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize('revision', ['3f2a9c1d7b6e', 'head'])
+def test_migrated_database_uses_the_same_indexes(db, client, jobs, tmp_path, revision):
+    """A database built by the migrations, rather than create_all, serves the same queries from the indexes"""
+    path = tmp_path / 'migrated.db'
+    subprocess.run(
+        [sys.executable, '-m', 'flask', '--app', 'app', 'db', 'upgrade', revision],
+        cwd=BACKEND_DIR, env={**os.environ, 'DATABASE_URL': f'sqlite:///{path}'},
+        check=True, capture_output=True
+    )
+    conn = sqlite3.connect(path)
+    try:
+        for url, index, statement, parameters in listing_queries(db, client, with_cursor=True):
+            plan = query_plan(conn, statement, parameters)
+            assert f'USING INDEX {index}' in plan, f'{url}: {plan}'
+    finally:
+        conn.close()
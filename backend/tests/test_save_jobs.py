@@ -0,0 +1,119 @@
+from datetime import datetime, timedelta
+
+from app import Job, JobChange
+from dedup import load_simhash_index, near_duplicate_key, job_simhash
+from scraper import save_jobs, mark_jobs_seen, sweep_stale_jobs, StoredJobs, STALE_AFTER
+
+
+def card(title, company='Acme', location='Lahore', url=None):
+    return {
+        'title': title,
+        'company': company,
+        'location': location,
+        'description': url,
+        'url': url or 'N/A',
+        'salary': 'N/A',
+        'posted_date': datetime.utcnow(),
+        'is_active': True
+    }
+
+
+def test_save_jobs_skips_stored_and_repeated_jobs(db):
+    assert save_jobs(db, Job, [card('Python Developer', url='https://example.com/jobs/view/1')]) == (1, 0)
+    added, skipped = save_jobs(db, Job, [
+        card('Python Developer', url='https://example.com/jobs/view/1'),
+        card('Sr. Java Developer', url='https://example.com/jobs/view/2'),
+        card('Senior Java Developer', url='https://example.com/jobs/view/3'),
+    ])
+    assert (added, skipped) == (1, 2)
+
+
+def test_save_jobs_reports_the_stored_jobs_reposts_matched(db):
+    save_jobs(db, Job, [
+        card('Python Developer', url='https://example.com/jobs/view/1'),
+        card('Software Engineer Backend', url='https://example.com/jobs/view/2'),
+    ])
+    stored = {job.title: job.id for job in Job.query}
+    matched = set()
+    added, skipped = save_jobs(db, Job, [
+        # Same posting under a new URL, matched by fingerprint
+        card('python developer', location='Lahore, Pakistan', url='https://example.com/jobs/view/10'),
+        # Reworded, matched as a near duplicate
+        card('Backend Software Engineer', url='https://example.com/jobs/view/11'),
+        card('Frontend Developer', url='https://example.com/jobs/view/12'),
+    ], load_simhash_index(db, Job), matched)
+    assert (added, skipped) == (1, 2)
+    assert matched == {stored['Python Developer'], stored['Software Engineer Backend']}
+
+
+def test_matched_jobs_marked_seen_survive_the_sweep(db):
+    save_jobs(db, Job, [card('Python Developer', url='https://example.com/jobs/view/1')])
+    job = Job.query.one()
+    job.last_seen_at = datetime.utcnow() - STALE_AFTER - timedelta(days=1)
+    db.session.commit()
+
+    matched = set()
+    save_jobs(db, Job, [card('Python Developer', url='https://example.com/jobs/view/2')], matched_ids=matched)
+    mark_jobs_seen(db, Job, matched)
+
+    assert sweep_stale_jobs(db, Job) == 0
+    assert db.session.get(Job, job.id).is_active
+
+
+def test_save_jobs_stores_and_matches_the_canonical_url(db):
+    save_jobs(db, Job, [card('Python Developer', url='https://www.LinkedIn.com/jobs/view/python-1/?refId=a&trackingId=b')])
+    assert [job.url for job in Job.query] == ['https://www.linkedin.com/jobs/view/python-1']
+
+    # The same posting on a later page load, under other tracking parameters and another title
+    matched = set()
+    added, skipped = save_jobs(db, Job, [
+        card('Python Engineer', url='https://www.linkedin.com/jobs/view/python-1?refId=c&trackingId=d')
+    ], matched_ids=matched)
+    assert (added, skipped) == (0, 1)
+    assert matched == {Job.query.one().id}
+
+
+def test_seen_jobs_are_only_reactivated_if_the_sweep_turned_them_off(db, client):
+    save_jobs(db, Job, [
+        card('Python Developer', url='https://example.com/jobs/view/1'),
+        card('Java Developer', url='https://example.com/jobs/view/2'),
+    ])
+    swept, turned_off = Job.query.order_by(Job.id).all()
+    swept.last_seen_at = datetime.utcnow() - STALE_AFTER - timedelta(days=1)
+    db.session.commit()
+    assert sweep_stale_jobs(db, Job) == 1
+    assert client.put(f'/api/jobs/{turned_off.id}', json={'is_active': False}).status_code == 200
+
+    mark_jobs_seen(db, Job, {swept.id, turned_off.id})
+    db.session.expire_all()
+    assert db.session.get(Job, swept.id).is_active
+    assert not db.session.get(Job, turned_off.id).is_active
+    assert db.session.get(Job, turned_off.id).last_seen_at > datetime.utcnow() - timedelta(minutes=1)
+
+
+def test_stored_jobs_catch_up_from_the_change_log(db):
+    save_jobs(db, Job, [
+        card('Python Developer', url='https://example.com/jobs/view/1'),
+        card('Java Developer', url='https://example.com/jobs/view/2'),
+    ])
+    stored = StoredJobs()
+    assert stored.sync(db, Job, JobChange)
+    python, java = Job.query.order_by(Job.id)
+
+    # A run saves a job, then others are edited and deleted between runs
+    save_jobs(db, Job, [card('Software Engineer Backend', url='https://example.com/jobs/view/3')], stored.near_duplicates)
+    python.url = 'https://example.com/jobs/view/4'
+    db.session.delete(java)
+    db.session.commit()
+
+    assert not stored.sync(db, Job, JobChange)
+    backend = Job.query.filter_by(title='Software Engineer Backend').one()
+    assert stored.known_urls == {
+        'https://example.com/jobs/view/3': backend.id,
+        'https://example.com/jobs/view/4': python.id,
+    }
+    # Indexed once, under its id, and the deleted job is gone
+    reworded = card('Backend Software Engineer')
+    key = near_duplicate_key(reworded['title'], 'Acme', 'Lahore')
+    assert stored.near_duplicates.find(job_simhash(reworded['title'], 'Acme', 'Lahore'), key)[0] == backend.id
+    assert len(stored.near_duplicates) == 2
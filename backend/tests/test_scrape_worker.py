@@ -0,0 +1,98 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+import app as app_module
+import scraper
+import scrape_worker
+from app import Job, ScrapeRun
+from scrape_worker import ScrapeWorker, STALE_RUN_AGE
+
+
+def test_concurrent_callers_share_one_scrape_worker(monkeypatch):
+    created = []
+
+    class SlowWorker:
+        def __init__(self, *args):
+            # Long enough for every caller to find no worker yet without the lock
+            time.sleep(0.05)
+            created.append(self)
+
+    monkeypatch.setattr(app_module, 'ScrapeWorker', SlowWorker)
+    monkeypatch.setattr(app_module, 'scrape_worker', None)
+
+    workers = []
+    threads = [threading.Thread(target=lambda: workers.append(app_module.get_scrape_worker())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(worker is created[0] for worker in workers)
+
+
+def add_run(db, status, **values):
+    run = ScrapeRun(trigger='manual', status=status, **values)
+    db.session.add(run)
+    db.session.commit()
+    return run.id
+
+
+def test_long_runs_with_a_heartbeat_are_not_expired(app, db):
+    long_ago = datetime.utcnow() - 3 * STALE_RUN_AGE
+    alive = add_run(db, 'running', queued_at=long_ago, started_at=long_ago, heartbeat_at=datetime.utcnow())
+    abandoned = add_run(db, 'running', queued_at=long_ago, started_at=long_ago, heartbeat_at=long_ago)
+    never_started = add_run(db, 'queued', queued_at=long_ago)
+
+    ScrapeWorker(app, db, Job, ScrapeRun).expire_stale_runs()
+    db.session.expire_all()
+    assert db.session.get(ScrapeRun, alive).status == 'running'
+    assert db.session.get(ScrapeRun, abandoned).status == 'failed'
+    assert db.session.get(ScrapeRun, never_started).status == 'failed'
+
+
+def test_an_expired_run_stays_failed_when_its_worker_finishes(app, db, monkeypatch):
+    worker = ScrapeWorker(app, db, Job, ScrapeRun)
+    run_id = add_run(db, 'queued')
+
+    def scrape_and_save(*args, **kwargs):
+        # Another process finds the heartbeat too old while this scrape is still going
+        with app.app_context():
+            ScrapeRun.query.filter_by(id=run_id).update({'heartbeat_at': datetime.utcnow() - 2 * STALE_RUN_AGE})
+            db.session.commit()
+            worker.expire_stale_runs()
+        kwargs['on_progress'](1, 1)
+        return {'jobs_scraped': 5, 'jobs_added': 5}
+
+    monkeypatch.setattr(scraper, 'scrape_and_save', scrape_and_save)
+    worker.execute(run_id)
+
+    db.session.expire_all()
+    run = db.session.get(ScrapeRun, run_id)
+    assert (run.status, run.error, run.jobs_added, run.terms_done) == ('failed', 'Abandoned by a worker that stopped', 0, 0)
+
+    # Nor is an expired queued run started late
+    queued = add_run(db, 'failed')
+    worker.execute(queued)
+    db.session.expire_all()
+    assert db.session.get(ScrapeRun, queued).started_at is None
+
+
+def test_running_scrapes_refresh_their_heartbeat(app, db, monkeypatch):
+    worker = ScrapeWorker(app, db, Job, ScrapeRun)
+    run_id = add_run(db, 'queued')
+    monkeypatch.setattr(scrape_worker, 'RUN_HEARTBEAT_INTERVAL', timedelta(seconds=0.01))
+
+    def scrape_and_save(*args, **kwargs):
+        with app.app_context():
+            started = db.session.get(ScrapeRun, run_id).heartbeat_at
+        time.sleep(0.1)
+        with app.app_context():
+            assert db.session.get(ScrapeRun, run_id).heartbeat_at > started
+        return {}
+
+    monkeypatch.setattr(scraper, 'scrape_and_save', scrape_and_save)
+    worker.execute(run_id)
+    db.session.expire_all()
+    assert db.session.get(ScrapeRun, run_id).status == 'succeeded'
@@ -0,0 +1,26 @@
+from sqlalchemy import text
+
+from app import Job
+
+
+def search(client, term):
+    return [job['title'] for job in client.get('/api/jobs', query_string={'search': term}).get_json()['jobs']]
+
+
+def test_index_follows_edits_to_the_searched_columns(client):
+    job_id = client.post('/api/jobs', json={'title': 'Python Developer', 'company': 'Acme'}).get_json()['id']
+    assert search(client, 'pyth') == ['Python Developer']
+
+    client.put(f'/api/jobs/{job_id}', json={'title': 'Golang Developer'})
+    assert search(client, 'python') == []
+    assert search(client, 'golang') == ['Golang Developer']
+
+
+def test_scrape_bookkeeping_updates_leave_the_index_alone(db):
+    db.session.add(Job(title='Python Developer', company='Acme', description='Long description ' * 50))
+    db.session.commit()
+    with db.engine.begin() as conn:
+        before = conn.execute(text("SELECT total_changes()")).scalar()
+        conn.execute(text("UPDATE job SET last_seen_at = CURRENT_TIMESTAMP"))
+        # Only the job row itself, no trigger rewrote the full-text row
+        assert conn.execute(text("SELECT total_changes()")).scalar() - before == 1
@@ -1,5 +1,44 @@
-import React, { useState } from 'react';
-import api, { Job, JobQuery } from '../../services/api';
+import React, { useEffect, useState } from 'react';
+import api, { FacetCount, JobFacets, JobQuery, SuggestField } from '../../services/api';
+
+// Facet values shown under each filter
+const FACET_LIMIT = 8;
+
+// Completions offered while typing a company or location
+const SUGGESTION_LIMIT = 8;
+
+// Keep the lookups for fast typing down to one after the last keystroke
+const SUGGEST_DELAY_MS = 150;
+
+// Fetch completions for a prefix, dropping responses to prefixes typed over since
+const useSuggestions = (field: SuggestField, prefix: string): FacetCount[] => {
+    const [suggestions, setSuggestions] = useState<FacetCount[]>([]);
+
+    useEffect(() => {
+        if (!prefix) {
+            setSuggestions([]);
+            return;
+        }
+
+        let cancelled = false;
+        const timer = setTimeout(async () => {
+            try {
+                const result = await api.getSuggestions(field, prefix, SUGGESTION_LIMIT);
+                if (!cancelled) setSuggestions(result.suggestions);
+            } catch (err) {
+                // Completions are only a convenience, typing still works without them
+                if (!cancelled) setSuggestions([]);
+            }
+        }, SUGGEST_DELAY_MS);
+
+        return () => {
+            cancelled = true;
+            clearTimeout(timer);
+        };
+    }, [field, prefix]);
+
+    return suggestions;
+};
 
 interface JobFilterProps {
     onFilterChange: (filters: JobQuery) => void;
@@ -9,25 +48,86 @@ const JobFilter: React.FC<JobFilterProps> = ({ onFilterChange }) => {
     const [search, setSearch] = useState('');
     const [company, setCompany] = useState('');
     const [location, setLocation] = useState('');
+    const [appliedFilters, setAppliedFilters] = useState<JobQuery>({});
+    const [facets, setFacets] = useState<JobFacets | null>(null);
+    const companySuggestions = useSuggestions('company', company);
+    const locationSuggestions = useSuggestions('location', location);
 
-    const handleSubmit = (e: React.FormEvent) => {
-        e.preventDefault();
+    useEffect(() => {
+        const fetchFacets = async () => {
+            try {
+                setFacets(await api.getFacets({ ...appliedFilters, limit: FACET_LIMIT }));
+            } catch (err) {
+                // Counts are only a hint, the filters still work without them
+                setFacets(null);
+            }
+        };
+
+        fetchFacets();
+    }, [appliedFilters]);
 
+    const applyFilters = (filters: JobQuery) => {
+        setAppliedFilters(filters);
+        onFilterChange(filters);
+    };
+
+    const currentFilters = (overrides: JobQuery = {}): JobQuery => {
         const filters: JobQuery = {};
         if (search) filters.search = search;
         if (company) filters.company = company;
         if (location) filters.location = location;
+        return { ...filters, ...overrides };
+    };
 
-        onFilterChange(filters);
+    const handleSubmit = (e: React.FormEvent) => {
+        e.preventDefault();
+        applyFilters(currentFilters());
     };
 
     const handleReset = () => {
         setSearch('');
         setCompany('');
         setLocation('');
-        onFilterChange({});
+        applyFilters({});
+    };
+
+    const handleCompanyClick = (value: string) => {
+        setCompany(value);
+        applyFilters(currentFilters({ company: value }));
+    };
+
+    const handleLocationClick = (value: string) => {
+        setLocation(value);
+        applyFilters(currentFilters({ location: value }));
     };
 
+    const renderSuggestions = (id: string, suggestions: FacetCount[]) => (
+        <datalist id={id}>
+            {suggestions.map((suggestion) => (
+                <option key={suggestion.value} value={suggestion.value}>
+                    {suggestion.count} jobs
+                </option>
+            ))}
+        </datalist>
+    );
+
+    const renderFacet = (counts: FacetCount[] | undefined, onClick: (value: string) => void) => (
+        counts && counts.length > 0 && (
+            <div className="mt-2">
+                {counts.map((facet) => (
+                    <button
+                        key={facet.value}
+                        type="button"
+                        className="btn btn-sm btn-outline-secondary me-1 mb-1"
+                        onClick={() => onClick(facet.value)}
+                    >
+                        {facet.value} <span className="badge bg-secondary">{facet.count}</span>
+                    </button>
+                ))}
+            </div>
+        )
+    );
+
     return (
         <div className="filter-panel mb-4">
             <div className="filter-heading">
@@ -52,9 +152,12 @@ const JobFilter: React.FC<JobFilterProps> = ({ onFilterChange }) => {
                             type="text"
                             className="form-control"
                             placeholder="Filter by company..."
+                            list="company-suggestions"
                             value={company}
                             onChange={(e) => setCompany(e.target.value)}
                         />
+                        {renderSuggestions('company-suggestions', companySuggestions)}
+                        {renderFacet(facets?.company, handleCompanyClick)}
                     </div>
 
                     <div className="col-md-6 mb-3">
@@ -62,9 +165,12 @@ const JobFilter: React.FC<JobFilterProps> = ({ onFilterChange }) => {
                             type="text"
                             className="form-control"
                             placeholder="Filter by location..."
+                            list="location-suggestions"
                             value={location}
                             onChange={(e) => setLocation(e.target.value)}
                         />
+                        {renderSuggestions('location-suggestions', locationSuggestions)}
+                        {renderFacet(facets?.location, handleLocationClick)}
                     </div>
                 </div>
 
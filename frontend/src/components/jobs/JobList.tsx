@@ -1,21 +1,53 @@
 import React, { useState, useEffect } from 'react';
 import { Link } from 'react-router-dom';
-import api, { Job, JobQuery } from '../../services/api';
+import api, { Job, JobChanges, JobQuery } from '../../services/api';
 import JobFilter from './JobFilter';
 
+// Apply a batch from the change feed to the listed jobs. Only an unfiltered
+// list takes in new jobs, a filtered one can't tell whether they match
+const applyChanges = (jobs: Job[], changes: JobChanges, filtered: boolean): Job[] => {
+    const changed = new Map(changes.jobs.map(job => [job.id, job]));
+    const deleted = new Set(changes.deleted);
+    const listed = new Set(jobs.map(job => job.id));
+
+    const updated = jobs
+        .filter(job => !deleted.has(job.id))
+        .map(job => changed.get(job.id) || job)
+        .filter(job => job.is_active);
+    if (filtered) return updated;
+
+    // Jobs at least as new as the top of the list belong above it, older ones
+    // would be out of order and turn up when paging anyway
+    const newest = jobs.length > 0 ? jobs[0].posted_date : '';
+    const added = changes.jobs
+        .filter(job => job.is_active && !listed.has(job.id) && job.posted_date >= newest)
+        .sort((a, b) => b.posted_date.localeCompare(a.posted_date));
+    return [...added, ...updated];
+};
+
 
 const JobList: React.FC = () => {
     const [jobs, setJobs] = useState<Job[]>([]);
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string | null>(null);
     const [filters, setFilters] = useState<JobQuery>({});
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [loadingMore, setLoadingMore] = useState(false);
+    // Change feed position taken just before the list was loaded
+    const [changeCursor, setChangeCursor] = useState<number | null>(null);
+    const [reloadCount, setReloadCount] = useState(0);
 
     useEffect(() => {
         const fetchJobs = async () => {
             try {
                 setLoading(true);
-                const data = await api.getJobs(filters);
-                setJobs(data);
+                setChangeCursor(null);
+                // Anything written while the list loads is replayed by the feed
+                const { cursor } = await api.getChanges();
+                const page = await api.getJobs(filters);
+                setJobs(page.jobs);
+                setNextCursor(page.next_cursor);
+                setChangeCursor(cursor);
                 setError(null);
             } catch (err) {
                 setError('Failed to fetch jobs. Please try again later.');
@@ -26,7 +58,34 @@ const JobList: React.FC = () => {
         };
 
         fetchJobs();
-    }, [filters]);
+    }, [filters, reloadCount]);
+
+    // Keep the list current from the change feed instead of reloading it
+    useEffect(() => {
+        if (changeCursor === null) return;
+
+        const filtered = Object.values(filters).some(Boolean);
+        return api.subscribeToChanges(
+            changeCursor,
+            (changes) => setJobs(prevJobs => applyChanges(prevJobs, changes, filtered)),
+            () => setReloadCount(count => count + 1)
+        );
+    }, [changeCursor, filters]);
+
+    const handleLoadMore = async () => {
+        if (!nextCursor) return;
+        try {
+            setLoadingMore(true);
+            const page = await api.getJobs({ ...filters, cursor: nextCursor });
+            setJobs(prevJobs => [...prevJobs, ...page.jobs]);
+            setNextCursor(page.next_cursor);
+        } catch (err) {
+            setError('Failed to load more jobs. Please try again.');
+            console.error('Error loading more jobs:', err);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
 
     const handleFilterChange = (newFilters: JobQuery) => {
         setFilters(newFilters);
@@ -119,6 +178,18 @@ const JobList: React.FC = () => {
                 </div>
             )}
 
+            {!loading && nextCursor && (
+                <div className="text-center mt-2">
+                    <button
+                        onClick={handleLoadMore}
+                        className="btn btn-outline-primary"
+                        disabled={loadingMore}
+                    >
+                        {loadingMore ? 'Loading...' : 'Load More Jobs'}
+                    </button>
+                </div>
+            )}
+
             <div className="text-center mt-4">
                 <Link to="/add-job" className="btn btn-primary">
                     <i className="fas fa-plus-circle me-2"></i> Add New Job
@@ -1,5 +1,5 @@
 import React, { useState, useEffect, useCallback } from 'react';
-import api, { JobQuery } from '../../services/api';
+import api, { Job, JobQuery, JOB_LIST_FIELDS } from '../../services/api';
 import { Link } from 'react-router-dom';
 import axios from 'axios';
 
@@ -19,6 +19,51 @@ type JobListing = {
     postedDate?: Date; // Add postedDate for sorting
 };
 
+// Transform an API job into the listing shape rendered on the home page
+const transformJob = (job: Job): JobListing => {
+    // Extract city and country from location
+    const locationParts = job.location.split(',').map(part => part.trim());
+    const city = locationParts[0];
+    const country = locationParts.length > 1 ? locationParts[locationParts.length - 1] : '';
+
+    // Calculate posted ago from posted_date
+    const postedDate = new Date(job.posted_date);
+    const now = new Date();
+    const diffTime = Math.abs(now.getTime() - postedDate.getTime());
+    const diffDays = Math.floor(diffTime / (1000 * 60 * 60 * 24));
+
+    let postedAgo = '';
+    if (diffDays === 0) {
+        const diffHours = Math.floor(diffTime / (1000 * 60 * 60));
+        postedAgo = `${diffHours}h ago`;
+    } else {
+        postedAgo = `${diffDays}d ago`;
+    }
+
+    // Detect if job is new (posted within last 2 days)
+    const isNew = diffDays < 2;
+
+    // Create tags from location and company
+    const tags = [country, city].filter(Boolean);
+
+    return {
+        id: job.id,
+        title: job.title,
+        company: job.company,
+        location: job.location,
+        country: country,
+        city: city,
+        type: job.salary || 'Not specified',
+        tags: tags,
+        experienceLevel: 'Analyst (Experienced)',
+        category: job.description.includes('Fellow') ? 'Actuary (Fellow)' :
+            job.description.includes('Associate') ? 'Actuary (Associate)' : 'Analyst',
+        isNew: isNew,
+        postedAgo: postedAgo,
+        postedDate: postedDate
+    };
+};
+
 type SortOption = 'newest' | 'oldest' | 'company-az' | 'company-za' | 'salary-high-low' | 'salary-low-high';
 
 const Home: React.FC = () => {
@@ -37,58 +82,22 @@ const Home: React.FC = () => {
         locations: []
     });
     const [refreshCounter, setRefreshCounter] = useState(0);
+    const [nextCursor, setNextCursor] = useState<string | null>(null);
+    const [lastQuery, setLastQuery] = useState<JobQuery>({});
+    const [isLoadingMore, setIsLoadingMore] = useState<boolean>(false);
 
     // Function to fetch all jobs without any filters
     const fetchAllJobs = async () => {
         try {
             setIsLoading(true);
-            const response = await api.getJobs();
+            const page = await api.getJobs();
+            const response = page.jobs;
+            setNextCursor(page.next_cursor);
+            setLastQuery({});
             console.log('Fetched all jobs:', response.length);
 
             // Transform API job data
-            const transformedJobs: JobListing[] = response.map(job => {
-                // Extract city and country from location
-                const locationParts = job.location.split(',').map(part => part.trim());
-                const city = locationParts[0];
-                const country = locationParts.length > 1 ? locationParts[locationParts.length - 1] : '';
-
-                // Calculate posted ago from posted_date
-                const postedDate = new Date(job.posted_date);
-                const now = new Date();
-                const diffTime = Math.abs(now.getTime() - postedDate.getTime());
-                const diffDays = Math.floor(diffTime / (1000 * 60 * 60 * 24));
-
-                let postedAgo = '';
-                if (diffDays === 0) {
-                    const diffHours = Math.floor(diffTime / (1000 * 60 * 60));
-                    postedAgo = `${diffHours}h ago`;
-                } else {
-                    postedAgo = `${diffDays}d ago`;
-                }
-
-                // Detect if job is new (posted within last 2 days)
-                const isNew = diffDays < 2;
-
-                // Create tags from location and company
-                const tags = [country, city].filter(Boolean);
-
-                return {
-                    id: job.id,
-                    title: job.title,
-                    company: job.company,
-                    location: job.location,
-                    country: country,
-                    city: city,
-                    type: job.salary || 'Not specified',
-                    tags: tags,
-                    experienceLevel: 'Analyst (Experienced)',
-                    category: job.description.includes('Fellow') ? 'Actuary (Fellow)' :
-                        job.description.includes('Associate') ? 'Actuary (Associate)' : 'Analyst',
-                    isNew: isNew,
-                    postedAgo: postedAgo,
-                    postedDate: postedDate
-                };
-            });
+            const transformedJobs: JobListing[] = response.map(transformJob);
 
             setJobListings(transformedJobs);
 
@@ -137,11 +146,13 @@ const Home: React.FC = () => {
                 setIsLoading(true);
 
                 // Use a completely fresh API call with no parameters
-                const response = await axios.get("http://localhost:5000/api/jobs");
-                console.log('Initial load: API returned', response.data.length, 'jobs');
+                const response = await axios.get("http://localhost:5000/api/jobs", { params: { fields: JOB_LIST_FIELDS } });
+                setNextCursor(response.data.next_cursor);
+                setLastQuery({});
+                console.log('Initial load: API returned', response.data.jobs.length, 'jobs');
 
                 // Transform and set job listings
-                const transformedJobs = response.data.map((job: any) => {
+                const transformedJobs = response.data.jobs.map((job: any) => {
                     // Basic job transformation code
                     const locationParts = job.location.split(',').map((part: string) => part.trim());
                     const city = locationParts[0];
@@ -284,53 +295,14 @@ const Home: React.FC = () => {
                 console.log('Searching with query params:', queryParams);
 
                 // Fetch jobs from API
-                const response = await api.getJobs(queryParams);
+                const page = await api.getJobs(queryParams);
+                const response = page.jobs;
+                setNextCursor(page.next_cursor);
+                setLastQuery(queryParams);
                 console.log('Found', response.length, 'jobs');
 
                 // Transform API job data to match our JobListing type
-                const transformedJobs: JobListing[] = response.map(job => {
-                    // Extract city and country from location
-                    const locationParts = job.location.split(',').map(part => part.trim());
-                    const city = locationParts[0];
-                    const country = locationParts.length > 1 ? locationParts[locationParts.length - 1] : '';
-
-                    // Calculate posted ago from posted_date
-                    const postedDate = new Date(job.posted_date);
-                    const now = new Date();
-                    const diffTime = Math.abs(now.getTime() - postedDate.getTime());
-                    const diffDays = Math.floor(diffTime / (1000 * 60 * 60 * 24));
-
-                    let postedAgo = '';
-                    if (diffDays === 0) {
-                        const diffHours = Math.floor(diffTime / (1000 * 60 * 60));
-                        postedAgo = `${diffHours}h ago`;
-                    } else {
-                        postedAgo = `${diffDays}d ago`;
-                    }
-
-                    // Detect if job is new (posted within last 2 days)
-                    const isNew = diffDays < 2;
-
-                    // Create tags from location and company
-                    const tags = [country, city].filter(Boolean);
-
-                    return {
-                        id: job.id,
-                        title: job.title,
-                        company: job.company,
-                        location: job.location,
-                        country: country,
-                        city: city,
-                        type: job.salary || 'Not specified',
-                        tags: tags,
-                        experienceLevel: 'Analyst (Experienced)',
-                        category: job.description.includes('Fellow') ? 'Actuary (Fellow)' :
-                            job.description.includes('Associate') ? 'Actuary (Associate)' : 'Analyst',
-                        isNew: isNew,
-                        postedAgo: postedAgo,
-                        postedDate: postedDate
-                    };
-                });
+                const transformedJobs: JobListing[] = response.map(transformJob);
 
                 setJobListings(transformedJobs);
 
@@ -432,11 +404,13 @@ const Home: React.FC = () => {
                     setIsLoading(true);
 
                     // Use a completely fresh API call with no parameters
-                    const response = await axios.get("http://localhost:5000/api/jobs");
-                    console.log('API returned', response.data.length, 'jobs with no filters');
+                    const response = await axios.get("http://localhost:5000/api/jobs", { params: { fields: JOB_LIST_FIELDS } });
+                    setNextCursor(response.data.next_cursor);
+                    setLastQuery({});
+                    console.log('API returned', response.data.jobs.length, 'jobs with no filters');
 
                     // Transform and set job listings
-                    const transformedJobs = response.data.map((job: any) => {
+                    const transformedJobs = response.data.jobs.map((job: any) => {
                         // Basic job transformation code
                         const locationParts = job.location.split(',').map((part: string) => part.trim());
                         const city = locationParts[0];
@@ -520,6 +494,22 @@ const Home: React.FC = () => {
         console.log(`Filtering by location: "${location}"`);
     };
 
+    // Fetch the next page for the current filters and append it to the listings
+    const handleLoadMore = async () => {
+        if (!nextCursor) return;
+        try {
+            setIsLoadingMore(true);
+            const page = await api.getJobs({ ...lastQuery, cursor: nextCursor });
+            setJobListings(prevJobs => [...prevJobs, ...page.jobs.map(transformJob)]);
+            setNextCursor(page.next_cursor);
+        } catch (err) {
+            console.error('Failed to load more jobs:', err);
+            setError('Failed to load more job listings. Please try again later.');
+        } finally {
+            setIsLoadingMore(false);
+        }
+    };
+
     const handleSortChange = (option: SortOption) => {
         setSortOrder(option);
     };
@@ -559,11 +549,13 @@ const Home: React.FC = () => {
                                                 setIsLoading(true);
 
                                                 // Use a completely fresh API call with no parameters
-                                                const response = await axios.get("http://localhost:5000/api/jobs");
-                                                console.log('API returned', response.data.length, 'jobs with no filters');
+                                                const response = await axios.get("http://localhost:5000/api/jobs", { params: { fields: JOB_LIST_FIELDS } });
+                                                setNextCursor(response.data.next_cursor);
+                                                setLastQuery({});
+                                                console.log('API returned', response.data.jobs.length, 'jobs with no filters');
 
                                                 // Transform and set job listings
-                                                const transformedJobs = response.data.map((job: any) => {
+                                                const transformedJobs = response.data.jobs.map((job: any) => {
                                                     // Basic job transformation code
                                                     const locationParts = job.location.split(',').map((part: string) => part.trim());
                                                     const city = locationParts[0];
@@ -981,6 +973,19 @@ const Home: React.FC = () => {
                                                     </div>
                                                 </div>
                                             ))}
+
+                                            {nextCursor && (
+                                                <div className="text-center">
+                                                    <button
+                                                        className="btn btn-outline-success"
+                                                        type="button"
+                                                        onClick={handleLoadMore}
+                                                        disabled={isLoadingMore}
+                                                    >
+                                                        {isLoadingMore ? 'Loading...' : 'Load more jobs'}
+                                                    </button>
+                                                </div>
+                                            )}
                                         </>
                                     )}
                                 </div>
@@ -21,6 +21,51 @@ export interface JobQuery {
   company?: string;
   location?: string;
   search?: string;
+  limit?: number;
+  cursor?: string;
+  fields?: string;
+}
+
+// List responses leave out description unless it is asked for; the UI shows it
+export const JOB_LIST_FIELDS =
+  "id,title,company,location,description,url,salary,posted_date,is_active";
+
+// A page of jobs returned by the keyset-paginated list endpoint
+export interface JobPage {
+  jobs: Job[];
+  next_cursor: string | null;
+}
+
+// One value of a facet and the number of matching jobs that have it
+export interface FacetCount {
+  value: string;
+  count: number;
+}
+
+// Job counts by company and location for the current filters
+export interface JobFacets {
+  total: number;
+  company: FacetCount[];
+  location: FacetCount[];
+}
+
+// Jobs written after a change feed cursor: their current rows in the order
+// they changed, the ids of deleted ones, and the cursor to continue from
+export interface JobChanges {
+  jobs: Job[];
+  deleted: number[];
+  cursor: number;
+  has_more: boolean;
+}
+
+// Fields the typeahead endpoint can complete
+export type SuggestField = "company" | "location";
+
+// Completions of a company or location prefix, most jobs first
+export interface Suggestions {
+  field: SuggestField;
+  prefix: string;
+  suggestions: FacetCount[];
 }
 
 // Create axios instance with base URL
@@ -33,10 +78,13 @@ const apiClient = axios.create({
 
 // API functions
 const api = {
-  // Get all jobs with optional filtering
-  getJobs: async (query?: JobQuery): Promise<Job[]> => {
+  // Get a page of jobs with optional filtering; pass next_cursor back as
+  // query.cursor to load the following page
+  getJobs: async (query?: JobQuery): Promise<JobPage> => {
     try {
-      const response = await apiClient.get("/jobs", { params: query });
+      const response = await apiClient.get("/jobs", {
+        params: { fields: JOB_LIST_FIELDS, ...query },
+      });
       return response.data;
     } catch (error) {
       console.error("Error fetching jobs:", error);
@@ -44,6 +92,71 @@ const api = {
     }
   },
 
+  // Get job counts by company and location under the given filters
+  getFacets: async (query?: JobQuery): Promise<JobFacets> => {
+    try {
+      const response = await apiClient.get("/jobs/facets", { params: query });
+      return response.data;
+    } catch (error) {
+      console.error("Error fetching job facets:", error);
+      throw error;
+    }
+  },
+
+  // Complete a company or location prefix
+  getSuggestions: async (
+    field: SuggestField,
+    prefix: string,
+    limit?: number
+  ): Promise<Suggestions> => {
+    try {
+      const response = await apiClient.get("/suggest", {
+        params: { field, prefix, limit },
+      });
+      return response.data;
+    } catch (error) {
+      console.error(`Error fetching ${field} suggestions:`, error);
+      throw error;
+    }
+  },
+
+  // Get the jobs changed after a cursor, waiting up to timeout seconds for
+  // one; without since, returns the current cursor to follow changes from
+  getChanges: async (since?: number, timeout?: number): Promise<JobChanges> => {
+    try {
+      const response = await apiClient.get("/jobs/changes", {
+        params: { since, timeout, fields: JOB_LIST_FIELDS },
+        // Leave room for the server to wait the whole timeout
+        timeout: timeout ? (timeout + 10) * 1000 : undefined,
+      });
+      return response.data;
+    } catch (error) {
+      console.error("Error fetching job changes:", error);
+      throw error;
+    }
+  },
+
+  // Follow job changes after a cursor over Server-Sent Events. onReset is
+  // called when the cursor has expired and the list has to be loaded again.
+  // Returns a function that closes the stream
+  subscribeToChanges: (
+    since: number,
+    onChanges: (changes: JobChanges) => void,
+    onReset: () => void
+  ): (() => void) => {
+    const params = new URLSearchParams({
+      since: String(since),
+      fields: JOB_LIST_FIELDS,
+    });
+    // EventSource reconnects on its own, resuming from the last event id
+    const source = new EventSource(`${API_URL}/jobs/changes/stream?${params}`);
+    source.addEventListener("changes", (event) => {
+      onChanges(JSON.parse((event as MessageEvent).data));
+    });
+    source.addEventListener("reset", onReset);
+    return () => source.close();
+  },
+
   // Get a specific job by ID
   getJob: async (id: number): Promise<Job> => {
     try {